@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     Role, User, Brand, Model, EngineType, VehicleType,
     Vehicle, PhysicalVehicle, ReservationStatus, Reservation, PhysicalVehicleReservation,
-    Notification
+    Notification, OutboxEvent
 )
 
 @admin.register(Role)
@@ -28,6 +28,14 @@ class NotificationAdmin(admin.ModelAdmin):
     ordering = ("-created_at",)
     readonly_fields = ("created_at",)
 
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "topic", "created_at", "published_at", "attempts")
+    list_filter = ("kind", "topic", "published_at")
+    search_fields = ("topic", "dedup_id")
+    ordering = ("-id",)
+    readonly_fields = ("dedup_id", "created_at")
+
 @admin.register(Brand)
 class BrandAdmin(admin.ModelAdmin):
     list_display = ("id", "brand_name")
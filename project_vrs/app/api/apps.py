@@ -7,3 +7,4 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         from . import signals
+        from .utils import task_stats  # Celery task_prerun/postrun collectors
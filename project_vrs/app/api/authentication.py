@@ -0,0 +1,120 @@
+# api/authentication.py
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .utils.revocation import is_revoked
+
+
+class RoleClaim:
+    """
+    Stands in for the ``Role`` row behind ``user.role_id`` so permission classes
+    (``request.user.role_id.role_name``) work without the lazy FK query.
+    """
+
+    def __init__(self, role_name: str):
+        self.role_name = role_name
+
+    def __str__(self):
+        return self.role_name
+
+
+class ClaimsUser(TokenUser):
+    """
+    Authenticated principal built only from a validated access token.
+    CustomTokenObtainPairSerializer puts ``role`` and ``username`` into the token,
+    so identity and role checks need no database query.
+
+    Anything the token does not carry (email, first_name, ...) is read from the
+    full ``User`` row, which is loaded on first access and then cached.
+    The role is the one the token was issued with. A role change revokes the
+    user's tokens issued before it (api/utils/revocation.py), and a refresh
+    re-reads the role from the DB (CurrentClaimsTokenRefreshSerializer).
+    """
+
+    def __str__(self) -> str:
+        return self.username or f"user {self.id}"
+
+    @property
+    def id(self) -> int:
+        # simplejwt stores the user id claim as a string
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @property
+    def pk(self) -> int:
+        return self.id
+
+    @property
+    def role_name(self) -> str:
+        return (self.token.get("role") or "").lower()
+
+    @cached_property
+    def role_id(self) -> RoleClaim:
+        return RoleClaim(self.token.get("role") or "")
+
+    @cached_property
+    def db_user(self):
+        """
+        The real User row (one query, only when something needs it).
+        A token that outlived its user is an authentication failure (401).
+        """
+        from .models import User
+
+        try:
+            return User.objects.get(pk=self.id)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.db_user, attr)
+
+
+def get_db_user(user):
+    """
+    Return a model instance for ``request.user`` (e.g. to save or assign it to a
+    FK); a no-op for users that already are ``User`` rows.
+    """
+    return user.db_user if isinstance(user, ClaimsUser) else user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the signed claims instead of loading the user
+    (and its role) on every request. Blocked/deactivated and deleted users are
+    refused via the revoked-user map (api/utils/revocation.py), as are tokens
+    issued before the user's role changed.
+    """
+
+    def get_user(self, validated_token) -> ClaimsUser:
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = ClaimsUser(validated_token)
+        if is_revoked(user.id, validated_token.get("iat")):
+            raise AuthenticationFailed(
+                _("User is inactive or blocked"), code="user_inactive"
+            )
+        return user
+
+
+def principal_from_token(raw_token) -> ClaimsUser:
+    """
+    Validate a raw JWT (signature + expiry, CPU only) and wrap its claims.
+
+    :param raw_token: The encoded access token.
+    :type raw_token: str | bytes
+    :raises rest_framework_simplejwt.exceptions.InvalidToken: If the token is not valid.
+    :return: The principal.
+    :rtype: ClaimsUser
+    """
+    validated = JWTAuthentication().get_validated_token(raw_token)
+    if api_settings.USER_ID_CLAIM not in validated:
+        raise InvalidToken("Token contained no recognizable user identification")
+    return ClaimsUser(validated)
@@ -1,10 +1,57 @@
 # api/consumers.py
+import asyncio
 import json
 import logging
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+
+from .utils.replay import get_replay_buffer
 
 logger = logging.getLogger(__name__)
 
+# role-group messages are buffered for this long and sent as one frame (0 = off)
+COALESCE_WINDOW = int(getattr(settings, "NOTIFICATION_COALESCE_WINDOW_MS", 250)) / 1000
+# availability events are collected this long before the affected searches are recounted
+AVAILABILITY_DEBOUNCE = int(getattr(settings, "AVAILABILITY_DEBOUNCE_MS", 300)) / 1000
+MAX_AVAILABILITY_SUBSCRIPTIONS = int(getattr(settings, "AVAILABILITY_MAX_SUBSCRIPTIONS", 10))
+
+
+def summarize_batch(messages: list[dict]) -> dict:
+    """
+    Collapse buffered role-group messages into one frame, e.g.
+    {"action": "batch", "message": "12 created, 3 cancelled",
+     "counts": {"created": 12, "cancelled": 3},
+     "reservation_ids": {"created": [...], "cancelled": [...]}, ...}
+    """
+    counts, ids = {}, {}
+    for msg in messages:
+        action = msg.get("action") or "info"
+        counts[action] = counts.get(action, 0) + 1
+        if msg.get("reservation_id") is not None:
+            ids.setdefault(action, []).append(msg["reservation_id"])
+
+    return {
+        "action": "batch",
+        "message": ", ".join(f"{n} {action}" for action, n in counts.items()),
+        "counts": counts,
+        "reservation_ids": ids,
+        "event_ids": [m["event_id"] for m in messages if m.get("event_id")],
+        "seq": max((m["seq"] for m in messages if m.get("seq")), default=None),
+    }
+
+
+def _since_from_scope(scope) -> int | None:
+    """The ``?since=<seq>`` a reconnecting client passes, if any."""
+    q = parse_qs(scope.get("query_string", b"").decode())
+    try:
+        return int((q.get("since") or [None])[0])
+    except (TypeError, ValueError):
+        return None
+
+
 class NotificationConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         user = self.scope["user"]
@@ -12,19 +59,57 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             await self.close()
             return
 
-        # user group
-        await self.channel_layer.group_add(f"user_{user.id}", self.channel_name)
+        self._pending = []
+        self._flush_task = None
+        self._replayed_seq = 0
 
-        # role groups
+        # user group + role groups
+        groups = [f"user_{user.id}"]
         role_name = (self.scope.get("user_role") or "").lower()
         if role_name == "manager":
-            await self.channel_layer.group_add("managers", self.channel_name)
+            groups.append("managers")
         elif role_name == "admin":
-            await self.channel_layer.group_add("admins", self.channel_name)
+            groups.append("admins")
+        for group in groups:
+            await self.channel_layer.group_add(group, self.channel_name)
 
         await self.accept()
 
+        since = _since_from_scope(self.scope)
+        if since is not None:
+            await self._replay(groups, since)
+
+    async def _replay(self, groups, since: int):
+        """
+        Send what the client missed since ``since`` as one frame:
+        {"action": "replay", "messages": [...], "seq": <last>, "complete": bool}.
+        complete=False means the gap is larger than the ring buffer and the
+        client should refetch over REST. Live messages with seq <= the replayed
+        ones (queued while we were replaying) are dropped in notify().
+        """
+        try:
+            messages, complete = await get_replay_buffer().afetch(groups, since)
+        except Exception:
+            logger.exception("WS replay failed")
+            messages, complete = [], False
+        self._replayed_seq = messages[-1]["seq"] if messages else since
+        frame = {
+            "action": "replay",
+            "messages": messages,
+            "seq": self._replayed_seq,
+            "complete": complete,
+        }
+        await self.send(text_data=json.dumps(frame, default=str))
+
+    def _already_replayed(self, event) -> bool:
+        seq = (event.get("message") or {}).get("seq")
+        return bool(seq) and seq <= self._replayed_seq
+
     async def disconnect(self, code):
+        flush_task = getattr(self, "_flush_task", None)
+        if flush_task:
+            flush_task.cancel()
+
         user = self.scope.get("user")
         if getattr(user, "is_authenticated", False):
             await self.channel_layer.group_discard(f"user_{user.id}", self.channel_name)
@@ -36,7 +121,145 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     # <- this is what Channels calls when you group_send with {"type": "notify", ...}
     async def notify(self, event):
+        if self._already_replayed(event):
+            return
         try:
             await self.send(text_data=json.dumps(event.get("message"), default=str))
         except Exception:
             logger.exception("Failed to send WS message")
+
+    # role groups send {"type": "notify_coalesced", ...}: buffer, one frame per window
+    async def notify_coalesced(self, event):
+        if self._already_replayed(event):
+            return
+        if COALESCE_WINDOW <= 0:
+            await self.notify(event)
+            return
+        self._pending.append(event.get("message") or {})
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(COALESCE_WINDOW)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+        if not batch:
+            return
+        message = batch[0] if len(batch) == 1 else summarize_batch(batch)
+        await self.notify({"message": message})
+
+
+class AvailabilityConsumer(AsyncWebsocketConsumer):
+    """
+    Live availability for public searches (ws/availability/, no login needed).
+
+    Client -> server:
+        {"action": "subscribe", "id": "s1", "start": ISO, "end": ISO,
+         "location_id"?: int, <public list filters>?}
+        {"action": "unsubscribe", "id": "s1"}
+    Server -> client:
+        {"action": "snapshot", "id": "s1", "counts": {vehicle_id: available_count}}
+        {"action": "delta", "id": "s1", "changes": {vehicle_id: available_count}}
+        {"action": "error", "id": "s1", "detail": "..."}
+
+    Each subscription joins the ``avail_<location>_<day>`` groups of its window,
+    so reservation events only reach searches for the same location and days.
+    Events are debounced per connection and every affected search is recounted
+    with one query; only changed counts are sent.
+    """
+
+    async def connect(self):
+        self._subs = {}
+        self._group_refs = {}
+        self._dirty = set()
+        self._flush_task = None
+        await self.accept()
+
+    async def disconnect(self, code):
+        if self._flush_task:
+            self._flush_task.cancel()
+        for group in list(self._group_refs):
+            await self.channel_layer.group_discard(group, self.channel_name)
+        self._group_refs.clear()
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = json.loads(text_data or "")
+        except ValueError:
+            await self._send({"action": "error", "detail": "Invalid JSON."})
+            return
+        if not isinstance(data, dict):
+            await self._send({"action": "error", "detail": "Expected an object."})
+            return
+
+        action = data.get("action")
+        if action == "subscribe":
+            await self._subscribe(data)
+        elif action == "unsubscribe":
+            await self._unsubscribe(str(data.get("id")))
+        else:
+            await self._send({"action": "error", "id": data.get("id"), "detail": "Unknown action."})
+
+    async def _subscribe(self, data: dict):
+        from .utils.availability import Subscription
+
+        if str(data.get("id")) not in self._subs and len(self._subs) >= MAX_AVAILABILITY_SUBSCRIPTIONS:
+            await self._send({"action": "error", "id": data.get("id"), "detail": "Too many subscriptions."})
+            return
+        try:
+            sub = Subscription.from_message(data)
+        except ValueError as e:
+            await self._send({"action": "error", "id": data.get("id"), "detail": str(e)})
+            return
+
+        await self._unsubscribe(sub.id)
+        for group in sub.groups:
+            if not self._group_refs.get(group):
+                await self.channel_layer.group_add(group, self.channel_name)
+            self._group_refs[group] = self._group_refs.get(group, 0) + 1
+        self._subs[sub.id] = sub
+
+        await database_sync_to_async(sub.recount)()
+        await self._send({"action": "snapshot", "id": sub.id, "counts": sub.counts})
+
+    async def _unsubscribe(self, sub_id: str):
+        sub = self._subs.pop(sub_id, None)
+        if sub is None:
+            return
+        self._dirty.discard(sub_id)
+        for group in sub.groups:
+            self._group_refs[group] -= 1
+            if not self._group_refs[group]:
+                del self._group_refs[group]
+                await self.channel_layer.group_discard(group, self.channel_name)
+
+    # group_send {"type": "availability_changed", "message": {location_id, start, end, vehicle_ids}}
+    async def availability_changed(self, event):
+        message = event.get("message") or {}
+        for sub_id, sub in self._subs.items():
+            if sub.matches(message):
+                self._dirty.add(sub_id)
+        if self._dirty and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._recount_after_window())
+
+    async def _recount_after_window(self):
+        await asyncio.sleep(AVAILABILITY_DEBOUNCE)
+        dirty, self._dirty = self._dirty, set()
+        self._flush_task = None
+        for sub_id in dirty:
+            sub = self._subs.get(sub_id)
+            if sub is None:
+                continue
+            try:
+                changes = await database_sync_to_async(sub.recount)()
+            except Exception:
+                logger.exception("Availability recount failed")
+                continue
+            if changes:
+                await self._send({"action": "delta", "id": sub_id, "changes": changes})
+
+    async def _send(self, payload: dict):
+        try:
+            await self.send(text_data=json.dumps(payload, default=str))
+        except Exception:
+            logger.exception("Failed to send WS message")
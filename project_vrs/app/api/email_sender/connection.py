@@ -0,0 +1,79 @@
+import smtplib
+import threading
+import time
+from logging import getLogger
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = getLogger(__name__)
+
+# Reopen the connection after this many idle seconds (most relays drop idle
+# sessions after ~60s) or after this many messages
+MAX_IDLE = float(getattr(settings, "EMAIL_CONNECTION_MAX_IDLE", 30))
+MAX_MESSAGES = int(getattr(settings, "EMAIL_CONNECTION_MAX_MESSAGES", 100))
+
+# one connection per worker process (per thread for threaded pools)
+_local = threading.local()
+
+
+def _close(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        logger.debug("Error closing mail connection", exc_info=True)
+
+
+def get_pooled_connection():
+    """
+    Return this worker's open mail connection, opening a new one when there is
+    none, it has been idle for more than MAX_IDLE or it sent MAX_MESSAGES.
+    """
+    conn = getattr(_local, "conn", None)
+    now = time.monotonic()
+    if conn is not None and (
+        now - _local.last_used > MAX_IDLE or _local.sent >= MAX_MESSAGES
+    ):
+        _close(conn)
+        conn = None
+    if conn is None:
+        conn = get_connection(fail_silently=False)
+        conn.open()
+        _local.conn, _local.sent = conn, 0
+    _local.last_used = now
+    return conn
+
+
+def reset_pooled_connection() -> None:
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _close(conn)
+    _local.conn = None
+
+
+def send_pooled(message) -> int:
+    """
+    Send one EmailMessage over the worker's pooled connection. If the server
+    dropped the session in the meantime, reconnect once and retry.
+
+    :return: Number of messages sent (0 or 1).
+    :rtype: int
+    """
+    try:
+        sent = get_pooled_connection().send_messages([message])
+    except smtplib.SMTPServerDisconnected:
+        reset_pooled_connection()
+        sent = get_pooled_connection().send_messages([message])
+    except Exception:
+        # unknown state: don't reuse this session
+        reset_pooled_connection()
+        raise
+    _local.sent += sent or 0
+    _local.last_used = time.monotonic()
+    return sent or 0
+
+
+@worker_process_shutdown.connect
+def _close_on_shutdown(**kwargs):
+    reset_pooled_connection()
@@ -0,0 +1,139 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db.models import Prefetch
+from django.template.loader import get_template
+from django.utils import formats, timezone
+
+from ..models import PhysicalVehicleReservation, Reservation, ReservationStatus
+
+STATUS_CHANGED_TASK = "api.email_sender.tasks.send_reservation_status_changed_email"
+
+EMAIL_TEMPLATES = {
+    "created": (
+        "email/reservation_created_subject.txt",
+        "email/reservation_created.txt",
+        "email/reservation_created.html",
+    ),
+    "status": (
+        "email/reservation_status_subject.txt",
+        "email/reservation_status.txt",
+        "email/reservation_status.html",
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def compiled_template(name: str):
+    """
+    Load and compile a template once per worker process; later renders skip the
+    loader lookup entirely.
+    """
+    return get_template(name)
+
+
+def render_email(kind: str, ctx: dict) -> EmailMultiAlternatives:
+    """
+    Render the subject/txt/html templates of ``kind`` ("created" | "status")
+    from a flat snapshot dict (see reservation_snapshots()).
+    """
+    subject_tpl, txt_tpl, html_tpl = EMAIL_TEMPLATES[kind]
+    message = EmailMultiAlternatives(
+        compiled_template(subject_tpl).render(ctx).strip(),
+        compiled_template(txt_tpl).render(ctx),
+        settings.DEFAULT_FROM_EMAIL,
+        [ctx["user_email"]],
+    )
+    message.attach_alternative(compiled_template(html_tpl).render(ctx), "text/html")
+    return message
+
+
+def _datetime(value) -> str:
+    return formats.date_format(timezone.localtime(value), "DATETIME_FORMAT") if value else ""
+
+
+def _vehicle_label(unit) -> str:
+    vehicle = unit.vehicle
+    return f"{vehicle.model.brand.brand_name} {vehicle.model.model_name} ({unit.car_plate_number})"
+
+
+def reservation_snapshots(reservation_ids) -> dict[int, dict]:
+    """
+    Flat, JSON-serializable template contexts for many reservations, in two
+    queries (reservations with their user/status/locations, then their units).
+
+    :return: {reservation_id: snapshot}
+    :rtype: dict[int, dict]
+    """
+    reservations = (
+        Reservation.objects.filter(id__in=set(reservation_ids))
+        .select_related("user", "status", "pickup_location", "dropoff_location")
+        .prefetch_related(
+            Prefetch(
+                "physicalvehiclereservation_set",
+                queryset=PhysicalVehicleReservation.objects.select_related(
+                    "physical_vehicle__vehicle__model__brand"
+                ).order_by("id"),
+            )
+        )
+    )
+    return {
+        r.id: {
+            "reservation_id": r.id,
+            "status": r.status.status,
+            "user_email": r.user.email,
+            "user_name": r.user.first_name or r.user.username,
+            "pickup_location": r.pickup_location.location_name,
+            "dropoff_location": r.dropoff_location.location_name,
+            "start_date": _datetime(r.start_date),
+            "end_date": _datetime(r.end_date),
+            "total_price": str(r.total_price),
+            "created_year": r.created_at.year,
+            "updated_year": r.updated_at.year,
+            "vehicles": [
+                _vehicle_label(pvr.physical_vehicle)
+                for pvr in r.physicalvehiclereservation_set.all()
+            ],
+        }
+        for r in reservations
+    }
+
+
+def status_labels(status_ids) -> dict[int, str]:
+    ids = {sid for sid in status_ids if sid}
+    if not ids:
+        return {}
+    return dict(ReservationStatus.objects.filter(id__in=ids).values_list("id", "status"))
+
+
+def status_snapshot(snapshot: dict, old_status_id, new_status_id, labels: dict) -> dict:
+    return {
+        **snapshot,
+        "old_status": labels.get(old_status_id, "—") if old_status_id else "—",
+        "new_status": labels.get(new_status_id, snapshot["status"]),
+    }
+
+
+def attach_snapshots(calls: list[tuple[str, list, dict]]) -> list[tuple[str, list, dict]]:
+    """
+    Outbox relay hook (OUTBOX_TASK_ENRICHERS): add ``snapshot=`` to every email
+    task call of a relay batch, built with one batched set of queries, so the
+    worker renders without touching the database. Calls whose reservation is
+    gone are left as they are (the task logs and skips them).
+    """
+    reservation_ids = [args[0] for _, args, _ in calls if args]
+    snapshots = reservation_snapshots(reservation_ids)
+    labels = status_labels(
+        sid for name, args, _ in calls if name == STATUS_CHANGED_TASK for sid in args[1:3]
+    )
+
+    enriched = []
+    for name, args, kwargs in calls:
+        snapshot = snapshots.get(args[0]) if args else None
+        if snapshot is not None and name == STATUS_CHANGED_TASK:
+            snapshot = status_snapshot(snapshot, args[1], args[2], labels)
+        if snapshot is not None:
+            kwargs = {**kwargs, "snapshot": snapshot}
+        enriched.append((name, args, kwargs))
+    return enriched
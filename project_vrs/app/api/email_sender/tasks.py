@@ -1,93 +1,154 @@
 from logging import getLogger
+from backend.celery import PRIORITY_HIGH, QUEUE_NOTIFICATIONS
 from celery import shared_task
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from django.conf import settings
-from django.db.models import Prefetch
-from ..models import Reservation, PhysicalVehicleReservation, ReservationStatus
+from .connection import send_pooled
+from .rendering import (
+    render_email,
+    reservation_snapshots,
+    status_labels,
+    status_snapshot,
+)
 
 logger = getLogger(__name__)
 
 
-@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
-def send_reservation_created_email(self, reservation_id: int) -> None:
+def build_reservation_created_email(reservation_id: int, snapshot: dict | None = None):
     """
-    Send a 'reservation created' email.
+    Build the 'reservation created' email (None if the reservation is gone).
+
+    :param snapshot: Flat context prepared by the outbox relay; loaded from the
+        DB only when missing (e.g. a re-queued task).
     """
-    try:
-        reservation = Reservation.objects.select_related("user").get(pk=reservation_id)
-    except Reservation.DoesNotExist:
+    if snapshot is None:
+        snapshot = reservation_snapshots([reservation_id]).get(reservation_id)
+    if snapshot is None:
         logger.warning("Email skipped: reservation %s not found.", reservation_id)
-        return
-
-    ctx = {
-        "reservation": reservation,
-        "user": reservation.user,
-        "vehicles": [
-            pvr.physical_vehicle
-            for pvr in reservation.physicalvehiclereservation_set.all()
-        ],
-    }
-
-    subject = render_to_string("email/reservation_created_subject.txt", ctx).strip()
-    body_txt = render_to_string("email/reservation_created.txt", ctx)
-    body_html = render_to_string("email/reservation_created.html", ctx)
-
-    send_mail(
-        subject,
-        body_txt,
-        settings.DEFAULT_FROM_EMAIL,
-        [reservation.user.email],
-        html_message=body_html,
-        fail_silently=False,
-    )
+        return None
+    return render_email("created", snapshot)
+
+
+def build_reservation_status_changed_email(
+    reservation_id: int,
+    old_status_id: int | None,
+    new_status_id: int,
+    snapshot: dict | None = None,
+):
+    """
+    Build the 'status changed' email (None if the reservation is gone).
+    """
+    if snapshot is None:
+        snapshot = reservation_snapshots([reservation_id]).get(reservation_id)
+        if snapshot is not None:
+            snapshot = status_snapshot(
+                snapshot,
+                old_status_id,
+                new_status_id,
+                status_labels([old_status_id, new_status_id]),
+            )
+    if snapshot is None:
+        logger.warning("Email skipped: reservation %s not found.", reservation_id)
+        return None
+    return render_email("status", snapshot)
+
+
+@shared_task(
+    bind=True,
+    queue=QUEUE_NOTIFICATIONS,
+    priority=PRIORITY_HIGH,
+    ignore_result=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_reservation_created_email(self, reservation_id: int, snapshot: dict | None = None) -> None:
+    """
+    Send a 'reservation created' email over the worker's pooled SMTP connection.
+    """
+    message = build_reservation_created_email(reservation_id, snapshot)
+    if message is not None:
+        send_pooled(message)
 
 
-@shared_task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=5)
+@shared_task(
+    bind=True,
+    queue=QUEUE_NOTIFICATIONS,
+    priority=PRIORITY_HIGH,
+    ignore_result=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5,
+)
 def send_reservation_status_changed_email(
-    self, reservation_id: int, old_status_id: int | None, new_status_id: int
+    self,
+    reservation_id: int,
+    old_status_id: int | None,
+    new_status_id: int,
+    snapshot: dict | None = None,
 ) -> None:
     """
     Sends an email whenever a reservation's status changes.
     """
-    reservation = (
-        Reservation.objects.select_related("user", "status")
-        .prefetch_related(
-            Prefetch(
-                "physicalvehiclereservation_set",
-                queryset=PhysicalVehicleReservation.objects.select_related(
-                    "physical_vehicle"
-                ),
-            )
-        )
-        .get(pk=reservation_id)
+    message = build_reservation_status_changed_email(
+        reservation_id, old_status_id, new_status_id, snapshot
     )
+    if message is not None:
+        send_pooled(message)
 
-    old_label = (
-        ReservationStatus.objects.get(pk=old_status_id).status if old_status_id else "—"
-    )
-    new_label = reservation.status.status
-
-    ctx = {
-        "reservation": reservation,
-        "user": reservation.user,
-        "old_status": old_label,
-        "new_status": new_label,
-        "vehicles": [
-            pvr.physical_vehicle
-            for pvr in reservation.physicalvehiclereservation_set.all()
-        ],
-    }
-
-    subject = render_to_string("email/reservation_status_subject.txt", ctx).strip()
-    body_txt = render_to_string("email/reservation_status.txt", ctx)
-    body_html = render_to_string("email/reservation_status.html", ctx)
-
-    send_mail(
-        subject,
-        body_txt,
-        settings.DEFAULT_FROM_EMAIL,
-        [reservation.user.email],
-        html_message=body_html,
-        fail_silently=False,
-    )
+
+EMAIL_TASKS = {
+    send_reservation_created_email.name: (
+        send_reservation_created_email,
+        build_reservation_created_email,
+    ),
+    send_reservation_status_changed_email.name: (
+        send_reservation_status_changed_email,
+        build_reservation_status_changed_email,
+    ),
+}
+
+
+@shared_task(
+    bind=True, queue=QUEUE_NOTIFICATIONS, priority=PRIORITY_HIGH, ignore_result=True
+)
+def send_email_batch(self, items: list[dict]) -> dict:
+    """
+    Send many queued emails over one SMTP connection.
+
+    The outbox relay groups the email task events of a batch into one call;
+    each item is ``{"task": <email task name>, "args": [...], "kwargs": {...}}``.
+    Messages are built first, then sent back to back over the pooled
+    connection. An item that fails (to build or to send) is re-queued as its
+    own task, which keeps the per-email retry policy.
+
+    :return: {"sent": n, "requeued": n, "skipped": n}
+    :rtype: dict
+    """
+    report = {"sent": 0, "requeued": 0, "skipped": 0}
+    messages = []
+    for item in items:
+        task, build = EMAIL_TASKS.get(item.get("task"), (None, None))
+        if task is None:
+            logger.warning("Email batch: unknown task %s", item.get("task"))
+            report["skipped"] += 1
+            continue
+        args, kwargs = item.get("args") or [], item.get("kwargs") or {}
+        try:
+            message = build(*args, **kwargs)
+        except Exception:
+            logger.exception("Email batch: building %s%s failed", task.name, tuple(args))
+            task.apply_async(args, kwargs, countdown=5)
+            report["requeued"] += 1
+            continue
+        if message is None:
+            report["skipped"] += 1
+            continue
+        messages.append((task, args, kwargs, message))
+
+    for task, args, kwargs, message in messages:
+        try:
+            report["sent"] += send_pooled(message)
+        except Exception:
+            logger.exception("Email batch: sending %s%s failed", task.name, tuple(args))
+            task.apply_async(args, kwargs, countdown=5)
+            report["requeued"] += 1
+    return report
@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from api.email_sender.rendering import (
+    EMAIL_TEMPLATES,
+    compiled_template,
+    render_email,
+    reservation_snapshots,
+)
+from api.models import Reservation
+
+SAMPLE_SNAPSHOT = {
+    "reservation_id": 1234,
+    "status": "pending",
+    "user_email": "user@example.com",
+    "user_name": "Alex",
+    "pickup_location": "Sofia",
+    "dropoff_location": "Plovdiv",
+    "start_date": "Oct. 20, 2026, 10 a.m.",
+    "end_date": "Oct. 23, 2026, 10 a.m.",
+    "total_price": "240.00",
+    "created_year": 2026,
+    "updated_year": 2026,
+    "vehicles": ["Toyota Corolla (CA1234AB)", "Skoda Octavia (CB9876XY)"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark for reservation email rendering (emails/s in this "
+        "process): ORM context + render_to_string vs flat snapshot + "
+        "precompiled templates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--renders", type=int, default=2000)
+        parser.add_argument(
+            "--reservation-id",
+            type=int,
+            help="Also time the per-task ORM snapshot on this reservation "
+            "(defaults to the newest one, if any).",
+        )
+
+    def handle(self, *args, **opts):
+        n = opts["renders"]
+        snapshot = SAMPLE_SNAPSHOT
+        templates = EMAIL_TEMPLATES["created"]
+
+        def loader_render():
+            for name in templates:
+                render_to_string(name, snapshot)
+
+        def compiled_render():
+            for name in templates:
+                compiled_template(name).render(snapshot)
+
+        compiled_render()  # compile outside the timing
+        self._time("render_to_string x3, flat snapshot", n, loader_render)
+        self._time("precompiled templates, flat snapshot", n, compiled_render)
+
+        reservation_id = opts["reservation_id"] or (
+            Reservation.objects.order_by("-id").values_list("id", flat=True).first()
+        )
+        if reservation_id:
+
+            def orm_render():
+                render_email("created", reservation_snapshots([reservation_id])[reservation_id])
+
+            # the pre-change path: one email task = DB context + render
+            self._time(
+                f"ORM snapshot per email (reservation {reservation_id})",
+                max(1, n // 10),
+                orm_render,
+            )
+
+    def _time(self, label: str, n: int, fn):
+        started = time.perf_counter()
+        for _ in range(n):
+            fn()
+        seconds = time.perf_counter() - started
+        self.stdout.write(
+            f"{label:<48} {n} emails in {seconds:.3f}s = {n / seconds:,.0f} emails/s"
+        )
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+
+
+class SMTPStub:
+    """
+    Minimal asyncio SMTP server (EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT)
+    that accepts and discards everything. ``connect_delay`` is added before the
+    greeting to stand in for TCP + TLS handshake cost of a real relay.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, connect_delay=0.0):
+        self.host, self.port, self.connect_delay = host, port, connect_delay
+        self.connections = 0
+        self.messages = 0
+        self._loop = None
+        self._server = None
+        self._ready = threading.Event()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        writer.write(b"220 stub ESMTP\r\n")
+        in_data = False
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if in_data:
+                if line in (b".\r\n", b".\n"):
+                    in_data = False
+                    self.messages += 1
+                    writer.write(b"250 OK queued\r\n")
+                continue
+            cmd = line[:4].upper()
+            if cmd == b"EHLO":
+                writer.write(b"250-stub\r\n250 8BITMIME\r\n")
+            elif cmd == b"DATA":
+                in_data = True
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif cmd == b"QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:  # HELO, MAIL, RCPT, RSET, NOOP
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    def start(self):
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            self._ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self):
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def _message(i: int) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        f"Reservation #{i} created",
+        "Your reservation was created.\n" * 20,
+        "no-reply@localhost",
+        [f"user{i}@example.com"],
+    )
+    message.attach_alternative("<p>Your reservation was created.</p>" * 20, "text/html")
+    return message
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare reservation email throughput against a local SMTP stub: a new "
+        "connection per email (send_mail) vs the pooled worker connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=200)
+        parser.add_argument(
+            "--connect-delay-ms",
+            type=float,
+            default=20,
+            help="Delay before the SMTP greeting, standing in for TCP/TLS setup.",
+        )
+
+    def handle(self, *args, **opts):
+        from api.email_sender import connection as pool
+
+        stub = SMTPStub(connect_delay=opts["connect_delay_ms"] / 1000).start()
+        smtp = {
+            "backend": "django.core.mail.backends.smtp.EmailBackend",
+            "host": stub.host,
+            "port": stub.port,
+            "use_tls": False,
+            "use_ssl": False,
+            "username": "",
+            "password": "",
+            "timeout": 10,
+        }
+        n = opts["messages"]
+        messages = [_message(i) for i in range(n)]
+
+        try:
+            # 1) a new connection per email, what send_mail() does
+            started = time.perf_counter()
+            for message in messages:
+                get_connection(**smtp).send_messages([message])
+            per_email = self._row("connection per email", n, started, stub)
+
+            # 2) the worker's pooled connection (send_pooled)
+            stub.connections = stub.messages = 0
+            original = pool.get_connection
+            pool.get_connection = lambda **kw: original(**{**smtp, **kw})
+            pool.reset_pooled_connection()
+            started = time.perf_counter()
+            try:
+                for message in messages:
+                    pool.send_pooled(message)
+            finally:
+                pool.reset_pooled_connection()
+                pool.get_connection = original
+            pooled = self._row("pooled connection", n, started, stub)
+        finally:
+            stub.stop()
+
+        self.stdout.write(
+            f"speedup: {pooled['rate'] / per_email['rate']:.1f}x "
+            f"(connect delay {opts['connect_delay_ms']} ms)"
+        )
+
+    def _row(self, label, n, started, stub) -> dict:
+        seconds = time.perf_counter() - started
+        row = {"rate": n / seconds if seconds else float("inf")}
+        self.stdout.write(
+            f"{label:<22} {n} messages in {seconds:.3f}s = {row['rate']:.0f} msg/s "
+            f"({stub.connections} connections, {stub.messages} accepted)"
+        )
+        return row
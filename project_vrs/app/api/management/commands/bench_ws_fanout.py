@@ -0,0 +1,359 @@
+import asyncio
+import json
+import math
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# synthetic principals live far above real user ids
+BASE_USER_ID = 10_000_000
+# reservation_id of the benchmark's events; the relay only takes these
+EVENT_PREFIX = "bench-"
+
+
+def percentile(values, pct: float):
+    """Nearest-rank percentile of a list of numbers (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def mint_token(user_id: int, role: str) -> str:
+    """
+    An access token with the claims CustomTokenObtainPairSerializer issues;
+    the WS auth trusts the claims, so no User row is needed.
+    """
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    token = AccessToken()
+    token[api_settings.USER_ID_CLAIM] = str(user_id)
+    token["role"] = role
+    token["username"] = f"bench{user_id}"
+    return str(token)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark WebSocket fan-out: open N authenticated clients against the "
+        "ASGI application in-process, fire reservation events through "
+        "broadcast_notifications() and the outbox relay (relay_batch: seq "
+        "stamping, replay ring, group sends) and report connect latency, "
+        "delivery latency percentiles and memory per connection. Delivery "
+        "latency runs from the broadcast call to the client frame; the wait for "
+        "the Celery relay task is modelled by --relay-interval. The benchmark "
+        "users, notifications and outbox rows are written in one transaction "
+        "that is rolled back at the end. It writes to the configured database, "
+        "so it refuses to run unless DEBUG is on or --i-know-this-is-not-prod "
+        "is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200, help="Clients with role 'user'.")
+        parser.add_argument("--managers", type=int, default=50, help="Clients with role 'manager'.")
+        parser.add_argument("--events", type=int, default=100, help="Reservation events to fire.")
+        parser.add_argument("--rate", type=float, default=0, help="Events per second (0 = as fast as possible).")
+        parser.add_argument("--concurrency", type=int, default=50, help="Clients connecting at the same time.")
+        parser.add_argument(
+            "--relay-interval",
+            type=float,
+            default=0,
+            help="Milliseconds between outbox relay passes (0 = relay continuously; "
+            "production runs every OUTBOX_RELAY_INTERVAL seconds).",
+        )
+        parser.add_argument(
+            "--layer",
+            choices=["memory", "redis"],
+            default="memory",
+            help="In-memory channel layer and replay buffer, or the configured "
+            "(Redis) CHANNEL_LAYERS and WS_REPLAY_REDIS_URL.",
+        )
+        parser.add_argument(
+            "--revocation-check",
+            action="store_true",
+            help="Keep the revoked-user check on connect (needs the cache to be reachable).",
+        )
+        parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for deliveries.")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+        parser.add_argument(
+            "--i-know-this-is-not-prod",
+            action="store_true",
+            dest="not_prod",
+            help="Run with DEBUG off. The benchmark writes (and rolls back) rows "
+            "in the configured database; never point it at a live system.",
+        )
+
+    def handle(self, *args, **opts):
+        from channels.layers import channel_layers
+
+        if not settings.DEBUG and not opts["not_prod"]:
+            raise CommandError(
+                "DEBUG is off: this may be a live database. Pass "
+                "--i-know-this-is-not-prod to run the benchmark anyway."
+            )
+
+        if opts["layer"] == "memory":
+            settings.CHANNEL_LAYERS = {
+                "default": {
+                    "BACKEND": "channels.layers.InMemoryChannelLayer",
+                    "CONFIG": {"capacity": max(100, opts["events"] * 2)},
+                }
+            }
+            channel_layers.backends.clear()
+            from api.utils import replay
+
+            settings.WS_REPLAY_REDIS_URL = ""
+            replay._buffer = None
+        settings.WS_REVOCATION_CHECK = opts["revocation_check"]
+
+        report = asyncio.run(self._run(opts))
+        if opts["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._print(report)
+
+    async def _run(self, opts) -> dict:
+        from asgiref.sync import sync_to_async
+
+        clients = [(BASE_USER_ID + i, "user") for i in range(opts["users"])]
+        clients += [
+            (BASE_USER_ID + opts["users"] + i, "manager") for i in range(opts["managers"])
+        ]
+        tokens = {uid: mint_token(uid, role) for uid, role in clients}
+
+        # All DB work runs on one thread (one connection) inside a transaction
+        # that is rolled back at the end. Plain sync_to_async on purpose:
+        # database_sync_to_async would close the connection mid-transaction.
+        db = sync_to_async(lambda fn, *a: fn(*a), thread_sensitive=True)
+        if opts["revocation_check"]:
+            from api.utils.revocation import revoked_user_ids
+
+            await db(revoked_user_ids)  # warm it: no DB hit during the run
+        first_event_id = await db(_begin, clients)
+        try:
+            return await self._bench(opts, clients, tokens, db, first_event_id)
+        finally:
+            await db(_rollback)
+
+    async def _bench(self, opts, clients, tokens, db, first_event_id) -> dict:
+        from channels.testing import WebsocketCommunicator
+
+        from api.models import OutboxEvent
+        from api.outbox.tasks import BATCH_SIZE, relay_batch
+        from backend.asgi import application
+
+        # only the benchmark's own rows; real pending events are left alone
+        own_events = OutboxEvent.objects.filter(
+            id__gt=first_event_id,
+            payload__message__reservation_id__startswith=EVENT_PREFIX,
+        )
+
+        # --- connect ------------------------------------------------------
+        connect_ms, comms, failed = [], {}, 0
+        semaphore = asyncio.Semaphore(opts["concurrency"])
+
+        async def open_client(uid):
+            nonlocal failed
+            async with semaphore:
+                comm = WebsocketCommunicator(
+                    application, f"/ws/notifications/?token={tokens[uid]}"
+                )
+                started = time.perf_counter()
+                connected, _ = await comm.connect(timeout=10)
+                if not connected:
+                    failed += 1
+                    return
+                connect_ms.append((time.perf_counter() - started) * 1000)
+                comms[uid] = comm
+
+        tracemalloc.start()
+        mem_before = tracemalloc.take_snapshot()
+        await asyncio.gather(*(open_client(uid) for uid, _ in clients))
+        mem_after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        mem_delta = sum(s.size_diff for s in mem_after.compare_to(mem_before, "filename"))
+
+        # --- fire events --------------------------------------------------
+        # every event goes to one user (persisted, immediate) and to all
+        # managers (coalesced per window), like a reservation being created;
+        # clients match frames by reservation_id (EVENT_PREFIX + n)
+        user_ids = [uid for uid, role in clients if role == "user" and uid in comms]
+        manager_ids = [uid for uid, role in clients if role == "manager" and uid in comms]
+        sent_at, expected = {}, {uid: set() for uid in comms}
+        for i in range(opts["events"]):
+            if user_ids:
+                expected[user_ids[i % len(user_ids)]].add(f"{EVENT_PREFIX}{i}")
+            for uid in manager_ids:
+                expected[uid].add(f"{EVENT_PREFIX}{i}")
+
+        delivery_ms, frames = [], 0
+        deadline = time.perf_counter() + opts["timeout"]
+
+        async def read_client(uid):
+            nonlocal frames
+            comm, pending = comms[uid], set(expected[uid])
+            while pending and time.perf_counter() < deadline:
+                try:
+                    raw = await comm.receive_from(timeout=max(0.01, deadline - time.perf_counter()))
+                except asyncio.TimeoutError:
+                    break
+                received = time.perf_counter()
+                frames += 1
+                message = json.loads(raw)
+                if message.get("action") == "batch":
+                    ids = [rid for rids in message["reservation_ids"].values() for rid in rids]
+                else:
+                    ids = [message.get("reservation_id")]
+                for event in ids:
+                    if event in pending:
+                        pending.discard(event)
+                        delivery_ms.append((received - sent_at[event]) * 1000)
+            return len(expected[uid]) - len(pending)
+
+        broadcast_ms, relay_ms, relayed = [], [], 0
+        firing = True
+
+        async def relay_loop():
+            nonlocal relayed
+            pause = opts["relay_interval"] / 1000
+            while True:
+                started = time.perf_counter()
+                taken = await db(relay_batch, BATCH_SIZE, own_events)
+                if taken:
+                    relay_ms.append((time.perf_counter() - started) * 1000)
+                    relayed += taken
+                elif not firing:
+                    return
+                await asyncio.sleep(pause)
+
+        readers = [asyncio.create_task(read_client(uid)) for uid in comms]
+        relay = asyncio.create_task(relay_loop())
+        interval = 1 / opts["rate"] if opts["rate"] else 0
+        fire_started = time.perf_counter()
+        for i in range(opts["events"]):
+            event = f"{EVENT_PREFIX}{i}"
+            message = {
+                "action": "created",
+                "message": f"Benchmark reservation {i}",
+                "reservation_id": event,
+            }
+            sent_at[event] = time.perf_counter()
+            if user_ids:
+                await db(_broadcast, message, [user_ids[i % len(user_ids)]], [])
+            if manager_ids:
+                await db(_broadcast, message, [], ["managers"])
+            broadcast_ms.append((time.perf_counter() - sent_at[event]) * 1000)
+            await asyncio.sleep(interval)  # also lets the relay and clients run
+        fire_seconds = time.perf_counter() - fire_started
+        firing = False
+        await relay
+
+        delivered = sum(await asyncio.gather(*readers))
+        for comm in comms.values():
+            await comm.disconnect()
+
+        expected_total = sum(len(ids) for ids in expected.values())
+        return {
+            "clients": {"users": opts["users"], "managers": opts["managers"], "connected": len(comms), "failed": failed},
+            "connect_ms": _summary(connect_ms),
+            "events": opts["events"],
+            "fire_seconds": round(fire_seconds, 3),
+            "frames": frames,
+            "delivered": delivered,
+            "expected": expected_total,
+            "delivery_ms": _summary(delivery_ms),
+            "broadcast_ms": _summary(broadcast_ms),
+            "relay": {"passes": len(relay_ms), "events": relayed, "pass_ms": _summary(relay_ms)},
+            "relay_interval_ms": opts["relay_interval"],
+            "memory_per_connection_kib": round(mem_delta / max(1, len(comms)) / 1024, 1),
+            "layer": opts["layer"],
+            "coalesce_window_ms": getattr(settings, "NOTIFICATION_COALESCE_WINDOW_MS", 250),
+        }
+
+    def _print(self, report: dict):
+        c = report["clients"]
+        self.stdout.write(
+            f"clients: {c['connected']} connected ({c['users']} users, {c['managers']} managers), "
+            f"{c['failed']} failed; layer={report['layer']}, "
+            f"coalesce window={report['coalesce_window_ms']} ms"
+        )
+        self.stdout.write(f"connect latency (ms):  {_fmt(report['connect_ms'])}")
+        self.stdout.write(
+            f"events: {report['events']} fired in {report['fire_seconds']}s, "
+            f"{report['delivered']}/{report['expected']} delivered in {report['frames']} frames"
+        )
+        self.stdout.write(f"delivery latency (ms): {_fmt(report['delivery_ms'])}")
+        self.stdout.write(f"broadcast call (ms):   {_fmt(report['broadcast_ms'])}")
+        relay = report["relay"]
+        self.stdout.write(
+            f"relay: {relay['events']} outbox events in {relay['passes']} passes "
+            f"(interval {report['relay_interval_ms']} ms), pass ms: {_fmt(relay['pass_ms'])}"
+        )
+        self.stdout.write(f"memory per connection: {report['memory_per_connection_kib']} KiB")
+
+
+def _begin(clients) -> int:
+    """
+    Open the benchmark transaction and create the principals as User rows
+    (notifications and unread counters reference them).
+
+    :return: The highest outbox id before the run; the bench's rows come after.
+    """
+    from django.db import transaction
+    from django.db.models import Max
+    from api.models import OutboxEvent, Role, User
+
+    transaction.set_autocommit(False)
+    first_event_id = OutboxEvent.objects.aggregate(top=Max("id"))["top"] or 0
+    roles = {
+        name: Role.objects.get_or_create(role_name=name)[0] for name in {r for _, r in clients}
+    }
+    User.objects.bulk_create(
+        [
+            User(
+                id=uid,
+                username=f"bench{uid}",
+                email=f"bench{uid}@bench.invalid",
+                date_of_birth="2000-01-01",
+                role_id=roles[role],
+                password="!",
+            )
+            for uid, role in clients
+        ]
+    )
+    return first_event_id
+
+
+def _broadcast(message, user_ids, roles):
+    from api.utils.broadcast import broadcast_notifications
+
+    broadcast_notifications(dict(message), user_ids=user_ids, roles=roles)
+
+
+def _rollback():
+    from django.db import transaction
+
+    transaction.rollback()
+    transaction.set_autocommit(True)
+
+
+def _summary(values) -> dict:
+    return {
+        "n": len(values),
+        "p50": _round(percentile(values, 50)),
+        "p95": _round(percentile(values, 95)),
+        "p99": _round(percentile(values, 99)),
+        "max": _round(max(values) if values else None),
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def _fmt(summary: dict) -> str:
+    return " ".join(f"{key}={value}" for key, value in summary.items())
@@ -0,0 +1,103 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import QueryDict
+
+from api.models import PhysicalVehicle, Vehicle
+from api.views.vehicle_view import PhysicalVehicleFilter, VehicleFilter
+
+# Index names in EXPLAIN output: SQLite ("USING [COVERING] INDEX x") and
+# PostgreSQL ("Index [Only] Scan using x", "Bitmap Index Scan on x")
+INDEX_RE = re.compile(
+    r"(?:USING (?:COVERING )?INDEX|Index (?:Only )?Scan using|Bitmap Index Scan on) (\w+)"
+)
+
+# (filterset, base queryset, query string, index the plan must use): one line
+# per filter combination the catalog screens send. The expected index is one
+# added for the catalog (migration 0012); None means any index will do (FK
+# and unique indexes, whose names differ per backend).
+COMBINATIONS = [
+    (VehicleFilter, Vehicle.objects.all(), "brand_id=1", None),
+    (VehicleFilter, Vehicle.objects.all(), "brand_id=1&vehicle_type_id=1", "vehicle_brand_type_price_idx"),
+    (VehicleFilter, Vehicle.objects.all(), "brand_id=1&vehicle_type_id=1&price_per_day__gte=20&price_per_day__lte=80", "vehicle_brand_type_price_idx"),
+    (VehicleFilter, Vehicle.objects.all(), "brand_id__in=1,2", None),
+    (VehicleFilter, Vehicle.objects.all(), "vehicle_type_id=1&price_per_day__lte=80", "vehicle_type_price_idx"),
+    (VehicleFilter, Vehicle.objects.all(), "engine_type_id=1&price_per_day__gte=20", "vehicle_engine_price_idx"),
+    (VehicleFilter, Vehicle.objects.all(), "price_per_day__gte=20&price_per_day__lte=80&amount_seats__gte=4", "vehicle_price_seats_idx"),
+    (VehicleFilter, Vehicle.objects.all(), "model_id=1", None),
+    (VehicleFilter, Vehicle.objects.all(), "model__brand__brand_name=BMW", "brand_name_idx"),
+    (VehicleFilter, Vehicle.objects.all(), "vehicle_type__vehicle_type=SUV", "vehicletype_name_idx"),
+    (VehicleFilter, Vehicle.objects.all(), "model__model_name=X3", "model_name_idx"),
+    (PhysicalVehicleFilter, PhysicalVehicle.objects.all(), "location_id=1", None),
+    (PhysicalVehicleFilter, PhysicalVehicle.objects.all(), "location_id=1&vehicle_id=1", "physvehicle_loc_vehicle_idx"),
+    (PhysicalVehicleFilter, PhysicalVehicle.objects.all(), "brand_id=1", None),
+    (PhysicalVehicleFilter, PhysicalVehicle.objects.all(), "car_plate_number=PB1234KT", None),
+    (PhysicalVehicleFilter, PhysicalVehicle.objects.all(), "vehicle__model__brand__brand_name=BMW", "brand_name_idx"),
+]
+
+
+def plan_indexes(filterset, queryset, query) -> tuple[list[str], str]:
+    """
+    EXPLAIN the filtered queryset.
+
+    :return: (index names the plan uses, in plan order; the plan text)
+    """
+    plan = filterset(QueryDict(query), queryset=queryset).qs.explain()
+    return list(dict.fromkeys(INDEX_RE.findall(plan))), plan
+
+
+def disable_seqscan() -> None:
+    """
+    PostgreSQL: SET enable_seqscan = off, so a usable index shows up in the
+    plan even when the table is too small for the planner to pick it.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SET enable_seqscan = off")
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every catalog filter combination (VehicleFilter, "
+        "PhysicalVehicleFilter) and report which indexes the plan uses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-seqscan",
+            action="store_true",
+            help="PostgreSQL: SET enable_seqscan = off, to show an index is usable "
+            "even when the table is too small for the planner to pick it.",
+        )
+        parser.add_argument("--verbose-plan", action="store_true", help="Print full plans.")
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Fail if a combination does not use its index (api.tests runs the same check).",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["no_seqscan"]:
+            if connection.vendor != "postgresql":
+                raise CommandError("--no-seqscan needs PostgreSQL")
+            disable_seqscan()
+
+        missing = []
+        for filterset, queryset, query, expected in COMBINATIONS:
+            indexes, plan = plan_indexes(filterset, queryset, query)
+            label = f"{queryset.model.__name__:<16} {query}"
+            if indexes and (expected is None or expected in indexes):
+                self.stdout.write(f"OK    {label}\n      -> {', '.join(indexes)}")
+            else:
+                missing.append(label)
+                wanted = f" (expected {expected})" if expected else ""
+                self.stdout.write(self.style.WARNING(f"SCAN  {label}{wanted}"))
+            if opts["verbose_plan"]:
+                self.stdout.write("      " + plan.replace("\n", "\n      "))
+
+        self.stdout.write(
+            f"{len(COMBINATIONS) - len(missing)}/{len(COMBINATIONS)} combinations use "
+            "their index"
+        )
+        if missing and opts["strict"]:
+            raise CommandError("Expected index not used for:\n  " + "\n  ".join(missing))
@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.utils.fleet_import import CHUNK_SIZE, FleetImportError, import_fleet, parse_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import physical vehicles from a CSV (car_plate_number,vehicle_id,"
+        "location_id) or JSON file. Nothing is written unless every row is valid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON file.")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=["csv", "json"],
+            help="Defaults to the file extension.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Validate only.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **opts):
+        path = Path(opts["path"])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+        file_format = opts["file_format"] or ("json" if path.suffix.lower() == ".json" else "csv")
+        try:
+            rows = parse_rows(path.read_bytes(), file_format)
+        except FleetImportError as e:
+            raise CommandError(str(e)) from e
+
+        report = import_fleet(rows, dry_run=opts["dry_run"], chunk_size=opts["chunk_size"])
+        if opts["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            for err in report["errors"]:
+                msgs = "; ".join(f"{f}: {' '.join(m)}" for f, m in err["errors"].items())
+                self.stdout.write(f"row {err['row']}: {msgs}")
+            self.stdout.write(
+                f"{report['total']} rows, {report['valid']} valid, {report['created']} created"
+                + (" (dry run)" if report["dry_run"] else "")
+            )
+        if report["errors"]:
+            raise CommandError(f"{len(report['errors'])} invalid rows, nothing imported")
@@ -1,26 +1,28 @@
 # api/middleware/token_auth.py
 from urllib.parse import parse_qs
 from channels.auth import AuthMiddlewareStack   # safe at import time
-from channels.db import database_sync_to_async  # safe at import time
 
-@database_sync_to_async
-def _resolve_user_and_role(token):
+
+async def _resolve_user_and_role(token):
+    """
+    Build the principal straight from the validated JWT claims: no DB query and
+    no thread-pool hop per connection. Blocked/deactivated users and tokens that
+    predate a role change are rejected via the revocation map, which is cached
+    in-process for a short TTL.
+    """
     # Import Django/DRF *inside* the function (after apps are ready)
+    from django.conf import settings
     from django.contrib.auth.models import AnonymousUser
-    from rest_framework_simplejwt.authentication import JWTAuthentication
-    from api.models import User  # OK here; apps are ready once this runs
+    from api.authentication import principal_from_token
+    from api.utils.revocation import ais_revoked
 
     try:
-        auth = JWTAuthentication()
-        validated = auth.get_validated_token(token)
-        user = auth.get_user(validated)
-
-        # Your FK is named 'role_id'; fetch role_name without extra queries
-        u = User.objects.select_related("role_id").only("id", "role_id__role_name").get(pk=user.id)
-        role_obj = getattr(u, "role", None) or getattr(u, "role_id", None)
-        role_name = (getattr(role_obj, "role_name", "") or "").lower()
-
-        return user, role_name
+        user = principal_from_token(token)
+        if getattr(settings, "WS_REVOCATION_CHECK", True) and await ais_revoked(
+            user.id, user.token.get("iat")
+        ):
+            return AnonymousUser(), ""
+        return user, user.role_name
     except Exception:
         return AnonymousUser(), ""
 
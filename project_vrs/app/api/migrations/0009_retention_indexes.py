@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_notification_counter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loginevent',
+            index=models.Index(fields=['timestamp'], name='loginevent_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-created_at'], name='notif_recipient_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at'], name='notif_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outboxevent',
+            index=models.Index(condition=models.Q(('published_at__isnull', False)), fields=['published_at'], name='outbox_published_idx'),
+        ),
+    ]
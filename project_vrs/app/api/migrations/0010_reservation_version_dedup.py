@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_retention_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='DedupClaim',
+            fields=[
+                ('key', models.UUIDField(primary_key=True, serialize=False)),
+                ('scope', models.CharField(max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='dedupclaim_created_idx')],
+            },
+        ),
+    ]
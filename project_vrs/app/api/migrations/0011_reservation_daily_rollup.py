@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_reservation_version_dedup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('bookings', models.PositiveIntegerField(default=0)),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['updated_at'], name='reservation_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='reservationdailyrollup',
+            name='location',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.location'),
+        ),
+        migrations.AddField(
+            model_name='reservationdailyrollup',
+            name='status',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.reservationstatus'),
+        ),
+        migrations.AddField(
+            model_name='reservationdailyrollup',
+            name='vehicle_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.vehicletype'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationdailyrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'location', 'vehicle_type', 'status'), name='rollup_day_dims_uniq'),
+        ),
+    ]
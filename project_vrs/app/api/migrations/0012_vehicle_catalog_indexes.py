@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def sync_vehicle_brand(apps, schema_editor):
+    """
+    Vehicle.brand must equal Vehicle.model.brand from now on; fix rows that drifted.
+    """
+    Vehicle = apps.get_model("api", "Vehicle")
+    Model = apps.get_model("api", "Model")
+    model_brand = Model.objects.filter(pk=OuterRef("model_id")).values("brand_id")[:1]
+    drifted = Vehicle.objects.exclude(brand_id=Subquery(model_brand))
+    drifted.update(brand_id=Subquery(model_brand))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_reservation_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_vehicle_brand, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='brand',
+            index=models.Index(fields=['brand_name'], name='brand_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enginetype',
+            index=models.Index(fields=['engine_type'], name='enginetype_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='model',
+            index=models.Index(fields=['brand', 'model_name'], name='model_brand_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='model',
+            index=models.Index(fields=['model_name'], name='model_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='physicalvehicle',
+            index=models.Index(fields=['location', 'vehicle'], name='physvehicle_loc_vehicle_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['brand', 'vehicle_type', 'price_per_day'], name='vehicle_brand_type_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['vehicle_type', 'price_per_day'], name='vehicle_type_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['engine_type', 'price_per_day'], name='vehicle_engine_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['price_per_day', 'amount_seats'], name='vehicle_price_seats_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicletype',
+            index=models.Index(fields=['vehicle_type'], name='vehicletype_name_idx'),
+        ),
+    ]
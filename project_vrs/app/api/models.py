@@ -1,3 +1,4 @@
+import uuid
 from datetime import timedelta
 from django.utils import timezone
 from django.db import models
@@ -9,7 +10,7 @@ from django.contrib.auth.models import (
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
-from django.db import models
+from .utils.field_tracker import TrackedFieldsMixin, TrackedQuerySet
 
 
 class Role(models.Model):
@@ -29,7 +30,7 @@ class Role(models.Model):
         return self.role_name
 
 
-class UserManager(BaseUserManager):
+class UserManager(BaseUserManager.from_queryset(TrackedQuerySet)):
     """
     Custom manager for the User model, extending Django's BaseUserManager.
 
@@ -111,7 +112,7 @@ class UserManager(BaseUserManager):
         )
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(TrackedFieldsMixin, AbstractBaseUser, PermissionsMixin):
     """
     Custom user model that replaces Django's default User.
 
@@ -126,6 +127,10 @@ class User(AbstractBaseUser, PermissionsMixin):
     :type PermissionsMixin: class
     """
 
+    ## changes feed the token revocation map (api/utils/revocation.py); a role
+    ## change revokes the tokens that carry the old role claim
+    TRACKED_FIELDS = ("is_active", "is_blocked", "role_id_id")
+
     username = models.CharField(
         max_length=150, unique=True, validators=[UnicodeUsernameValidator()]
     )
@@ -159,8 +164,42 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # NotificationViewSet: filter by recipient, newest first
+            models.Index(
+                fields=["recipient", "-created_at"], name="notif_recipient_created_idx"
+            ),
+            # retention purge walks the oldest rows first
+            models.Index(fields=["created_at"], name="notif_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.recipient}"
+
+
+class NotificationCounter(models.Model):
+    """
+    Denormalized number of unread notifications per user, kept in sync with
+    Notification.is_read by broadcast_notifications() and mark_notifications_read()
+    (api/utils/unread.py) so the unread badge is a single PK lookup.
+
+    :param models: The Django models module.
+    :type models: module
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notification_counter",
+    )
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+
 class LoginEvent(models.Model):
     EVENT_TYPES = [
         ("LOGIN_SUCCESS", "Login Success"),
@@ -175,6 +214,11 @@ class LoginEvent(models.Model):
     user_agent = models.TextField(null=True, blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["timestamp"], name="loginevent_timestamp_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.event_type} @ {self.timestamp}"
 
@@ -189,22 +233,37 @@ class Brand(models.Model):
 
     brand_name = models.CharField(max_length=30)
 
+    class Meta:
+        indexes = [models.Index(fields=["brand_name"], name="brand_name_idx")]
+
     def __str__(self):
         return self.brand_name
 
 
-class Model(models.Model):
+class Model(TrackedFieldsMixin):
     """
     Represents the brand of the vehicle.
     For example Golf 5 for VW or Avensis for Toyota.
+    A brand change is copied to Vehicle.brand of its vehicles (api/signals.py).
 
     :param models: The Django models module.
     :type models: module
     """
 
+    TRACKED_FIELDS = ("brand_id",)
+
     model_name = models.CharField(max_length=50)
     brand = models.ForeignKey(Brand, on_delete=models.CASCADE)
 
+    objects = TrackedQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # ModelViewSet filters and the (brand, model_name) uniqueness check
+            models.Index(fields=["brand", "model_name"], name="model_brand_name_idx"),
+            models.Index(fields=["model_name"], name="model_name_idx"),
+        ]
+
     def __str__(self):
         return self.model_name
 
@@ -220,6 +279,9 @@ class EngineType(models.Model):
 
     engine_type = models.CharField(max_length=40)
 
+    class Meta:
+        indexes = [models.Index(fields=["engine_type"], name="enginetype_name_idx")]
+
     def __str__(self):
         return self.engine_type
 
@@ -234,27 +296,80 @@ class VehicleType(models.Model):
 
     vehicle_type = models.CharField(max_length=40)
 
+    class Meta:
+        indexes = [models.Index(fields=["vehicle_type"], name="vehicletype_name_idx")]
+
     def __str__(self):
         return self.vehicle_type
 
 
-class Vehicle(models.Model):
+class Vehicle(TrackedFieldsMixin):
     amount_seats = models.PositiveSmallIntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(9)]
     )
     """
     Represents a vehicle as a conceptual model.
+    ``brand`` is a denormalized copy of ``model.brand`` so brand filters need
+    no join through Model; save() sets it from the model, and model changes
+    made with update() are synced by a signal (api/signals.py).
 
     :param models: The Django models module.
     :type models: module
     """
 
+    TRACKED_FIELDS = ("model_id",)
+
     price_per_day = models.DecimalField(max_digits=10, decimal_places=2)
     vehicle_type = models.ForeignKey(VehicleType, on_delete=models.CASCADE)
     engine_type = models.ForeignKey(EngineType, on_delete=models.CASCADE)
     model = models.ForeignKey(Model, on_delete=models.CASCADE)
     brand = models.ForeignKey(Brand, on_delete=models.CASCADE)
 
+    objects = TrackedQuerySet.as_manager()
+
+    class Meta:
+        # Match the catalog filtersets (VehicleViewSet, public search): an id
+        # column first, then the price range
+        indexes = [
+            models.Index(
+                fields=["brand", "vehicle_type", "price_per_day"],
+                name="vehicle_brand_type_price_idx",
+            ),
+            models.Index(
+                fields=["vehicle_type", "price_per_day"], name="vehicle_type_price_idx"
+            ),
+            models.Index(
+                fields=["engine_type", "price_per_day"], name="vehicle_engine_price_idx"
+            ),
+            models.Index(
+                fields=["price_per_day", "amount_seats"], name="vehicle_price_seats_idx"
+            ),
+        ]
+
+    def sync_brand(self) -> bool:
+        """
+        Copy the brand from the model (no query if the model is loaded).
+        Returns True if the brand changed. Also used by bulk writes, which
+        bypass save().
+        """
+        if self.model_id is None:
+            return False
+        if self._meta.get_field("model").is_cached(self) and self.model.pk == self.model_id:
+            brand_id = self.model.brand_id
+        else:
+            brand_id = Model.objects.values_list("brand_id", flat=True).get(pk=self.model_id)
+        if brand_id == self.brand_id:
+            return False
+        self.brand_id = brand_id
+        return True
+
+    def save(self, *args, **kwargs):
+        if self.sync_brand():
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "brand" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "brand"]
+        super().save(*args, **kwargs)
+
 
 class Location(models.Model):
     """
@@ -282,6 +397,12 @@ class PhysicalVehicle(models.Model):
     vehicle = models.ForeignKey(Vehicle, on_delete=models.PROTECT)
     location = models.ForeignKey(Location, on_delete=models.PROTECT)
 
+    class Meta:
+        indexes = [
+            # availability: units of one location, joined to their vehicle
+            models.Index(fields=["location", "vehicle"], name="physvehicle_loc_vehicle_idx"),
+        ]
+
 
 class ReservationStatus(models.Model):
     """
@@ -294,14 +415,28 @@ class ReservationStatus(models.Model):
     status = models.CharField(max_length=30)
 
 
-class Reservation(models.Model):
+class ReservationQuerySet(TrackedQuerySet):
+    def update(self, **kwargs):
+        # batch status changes bump the version too, and updated_at (which
+        # update() doesn't touch) for the KPI rollup watermark
+        if ("status" in kwargs or "status_id" in kwargs) and "version" not in kwargs:
+            kwargs["version"] = models.F("version") + 1
+            kwargs.setdefault("updated_at", timezone.now())
+        return super().update(**kwargs)
+
+
+class Reservation(TrackedFieldsMixin):
     """
     Represents a reservation made by a user.
+    Status changes are tracked in memory (see TrackedFieldsMixin) and bump
+    ``version``, which identifies each transition for notification dedup.
 
     :param models: The Django models module.
     :type models: module
     """
 
+    TRACKED_FIELDS = ("status_id", "version")
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     status = models.ForeignKey(ReservationStatus, on_delete=models.CASCADE)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -317,6 +452,28 @@ class Reservation(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     hold_expires_at = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=0)
+
+    objects = ReservationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # KPI rollups pick up rows changed since their watermark
+            models.Index(fields=["updated_at"], name="reservation_updated_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        attnames = (
+            None
+            if update_fields is None
+            else {self._meta.get_field(name).attname for name in update_fields}
+        )
+        if not self._state.adding and "status_id" in self.tracked_changes(attnames):
+            self.version += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = [*update_fields, "version", "updated_at"]
+        super().save(*args, **kwargs)
 
     def set_hold(self, minutes: int = 15):
         """
@@ -336,3 +493,111 @@ class PhysicalVehicleReservation(models.Model):
 
     physical_vehicle = models.ForeignKey(PhysicalVehicle, on_delete=models.CASCADE)
     reservation = models.ForeignKey(Reservation, on_delete=models.CASCADE)
+
+
+class OutboxEvent(models.Model):
+    """
+    An event waiting to leave the system, written in the same transaction as
+    the change that caused it. The relay task (api/outbox/tasks.py) drains
+    unpublished rows in batches and publishes them to Celery or the channel layer.
+
+    :param models: The Django models module.
+    :type models: module
+    """
+
+    KIND_TASK = "task"
+    KIND_PUSH = "push"
+    KINDS = [
+        (KIND_TASK, "Celery task"),
+        (KIND_PUSH, "WebSocket push"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KINDS)
+    ## task name for KIND_TASK, handler type ("notify") for KIND_PUSH
+    topic = models.CharField(max_length=200)
+    payload = models.JSONField(default=dict)
+    ## travels with the event (Celery task_id / WS event_id) so consumers can dedup
+    dedup_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="outbox_unpublished_idx",
+                condition=models.Q(published_at__isnull=True),
+            ),
+            # retention purge of delivered events
+            models.Index(
+                fields=["published_at"],
+                name="outbox_published_idx",
+                condition=models.Q(published_at__isnull=False),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.topic} #{self.pk}"
+
+
+class DedupClaim(models.Model):
+    """
+    One row per side effect that must happen at most once (e.g. the email for a
+    given reservation transition). The key is deterministic, so a second
+    producer's insert hits the primary key and is suppressed.
+    See api/outbox/dedup.py.
+    """
+
+    key = models.UUIDField(primary_key=True)
+    scope = models.CharField(max_length=50)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["created_at"], name="dedupclaim_created_idx")]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key}"
+
+
+class ReservationDailyRollup(models.Model):
+    """
+    Reservations booked per day x pickup location x vehicle type x status,
+    maintained by api/reporting/rollups.py. A reservation counts once, under
+    the vehicle type most of its units have, so every column sums correctly
+    across any slice.
+    """
+
+    day = models.DateField()
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name="+")
+    vehicle_type = models.ForeignKey(
+        VehicleType, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    status = models.ForeignKey(ReservationStatus, on_delete=models.CASCADE, related_name="+")
+    bookings = models.PositiveIntegerField(default=0)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "location", "vehicle_type", "status"],
+                name="rollup_day_dims_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.day} loc={self.location_id} type={self.vehicle_type_id}: {self.bookings}"
+
+
+class RollupWatermark(models.Model):
+    """
+    How far an incremental rollup has processed its source rows (by updated_at).
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.watermark}"
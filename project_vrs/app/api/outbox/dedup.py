@@ -0,0 +1,94 @@
+# api/outbox/dedup.py
+import uuid
+from logging import getLogger
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from api.models import DedupClaim
+
+logger = getLogger(__name__)
+
+# Fixed namespace: the same transition always maps to the same key
+NAMESPACE = uuid.UUID("6f2b8c1e-5d0a-4a57-9a51-2f0c3d7e9b14")
+SUPPRESSED_KEY = "dedup:suppressed:{}"
+SCOPES = ("status_email", "status_push")
+
+
+def transition_key(reservation_id, from_status_id, to_status_id, version) -> uuid.UUID:
+    """
+    Deterministic id of one reservation status transition.
+
+    Every status change bumps ``version``, so the key tells apart two real
+    transitions (active -> cancelled, reactivated, cancelled again). What it
+    suppresses is the same transition reported twice: a re-sent signal, or
+    two writers that changed the status from the same loaded version (a stale
+    ``save()`` racing a batch ``update()`` both write version + 1). A second
+    change made after the first one was committed is a new transition.
+    """
+    return uuid.uuid5(
+        NAMESPACE, f"reservation:{reservation_id}:{from_status_id}:{to_status_id}:{version}"
+    )
+
+
+def claim_once(key: uuid.UUID, scope: str) -> bool:
+    """
+    Claim the side effect ``scope`` (e.g. "status_email") for ``key``, inside the
+    caller's transaction. Returns False, and counts a suppressed duplicate, if
+    it was already claimed; a concurrent claimer waits on the primary key until
+    the first transaction ends.
+    """
+    try:
+        with transaction.atomic():
+            DedupClaim.objects.create(key=uuid.uuid5(key, scope), scope=scope)
+    except IntegrityError:
+        logger.info("Suppressed duplicate %s for %s", scope, key)
+        _count_suppressed(scope)
+        return False
+    return True
+
+
+def claim_many(keys, scope: str) -> set[uuid.UUID]:
+    """
+    Batch variant of claim_once(): one SELECT and one INSERT for all ``keys``.
+    Returns the keys claimed now; the others are counted as suppressed. If a
+    concurrent claimer inserted one of them meanwhile, falls back to
+    claim_once() per key.
+    """
+    keys = list(dict.fromkeys(keys))
+    if len(keys) <= 1:
+        return {key for key in keys if claim_once(key, scope)}
+    claim_ids = {uuid.uuid5(key, scope): key for key in keys}
+    try:
+        with transaction.atomic():
+            taken = set(
+                DedupClaim.objects.filter(key__in=list(claim_ids)).values_list(
+                    "key", flat=True
+                )
+            )
+            DedupClaim.objects.bulk_create(
+                [DedupClaim(key=cid, scope=scope) for cid in claim_ids if cid not in taken]
+            )
+    except IntegrityError:
+        return {key for key in keys if claim_once(key, scope)}
+    if taken:
+        logger.info("Suppressed %d duplicate %s", len(taken), scope)
+        _count_suppressed(scope, len(taken))
+    return {key for cid, key in claim_ids.items() if cid not in taken}
+
+
+def _count_suppressed(scope: str, n: int = 1) -> None:
+    cache_key = SUPPRESSED_KEY.format(scope)
+    cache.add(cache_key, 0, None)
+    try:
+        cache.incr(cache_key, n)
+    except ValueError:
+        cache.set(cache_key, n, None)
+
+
+def suppressed_counts() -> dict[str, int]:
+    """
+    {scope: duplicates suppressed} since the counters were last reset.
+    """
+    values = cache.get_many([SUPPRESSED_KEY.format(scope) for scope in SCOPES])
+    return {scope: values.get(SUPPRESSED_KEY.format(scope), 0) for scope in SCOPES}
@@ -0,0 +1,89 @@
+# api/outbox/events.py
+from api.models import OutboxEvent
+
+
+def enqueue_task(task, *args, **kwargs) -> OutboxEvent:
+    """
+    Record a Celery task call in the outbox instead of calling ``task.delay()``.
+    The row is part of the caller's transaction: if it rolls back, the task is
+    never published. The relay publishes it with ``task_id = dedup_id``.
+
+    :param task: The Celery task (or its registered name).
+    :type task: celery.Task | str
+    :return: The outbox row.
+    :rtype: OutboxEvent
+    """
+    name = task if isinstance(task, str) else task.name
+    return OutboxEvent.objects.create(
+        kind=OutboxEvent.KIND_TASK,
+        topic=name,
+        payload={"args": list(args), "kwargs": kwargs},
+    )
+
+
+def enqueue_tasks(task, calls) -> list[OutboxEvent]:
+    """
+    Bulk variant of enqueue_task(): one INSERT for many calls of ``task``.
+
+    :param task: The Celery task (or its registered name).
+    :type task: celery.Task | str
+    :param calls: The positional arguments of each call.
+    :type calls: Iterable[tuple]
+    :return: The outbox rows.
+    :rtype: list[OutboxEvent]
+    """
+    name = task if isinstance(task, str) else task.name
+    return OutboxEvent.objects.bulk_create(
+        [
+            OutboxEvent(
+                kind=OutboxEvent.KIND_TASK,
+                topic=name,
+                payload={"args": list(args), "kwargs": {}},
+            )
+            for args in calls
+        ]
+    )
+
+
+def enqueue_push(groups: list[str], message: dict, *, handler: str = "notify") -> OutboxEvent:
+    """
+    Record a channel-layer group send in the outbox.
+    The relay delivers ``{"type": handler, "message": message}`` to every group,
+    with ``message["event_id"]`` set to the row's dedup id.
+
+    :param groups: Channel-layer group names, e.g. ["user_5", "managers"].
+    :type groups: list[str]
+    :param message: JSON-serializable message body.
+    :type message: dict
+    :param handler: Consumer handler type, defaults to "notify".
+    :type handler: str
+    :return: The outbox row.
+    :rtype: OutboxEvent
+    """
+    return OutboxEvent.objects.create(
+        kind=OutboxEvent.KIND_PUSH,
+        topic=handler,
+        payload={"groups": list(groups), "message": message},
+    )
+
+
+def enqueue_pushes(pushes) -> list[OutboxEvent]:
+    """
+    Bulk variant of enqueue_push(): one INSERT for many ``(groups, message)``
+    or ``(groups, message, handler)`` entries.
+
+    :param pushes: The pushes to record.
+    :type pushes: Iterable[tuple]
+    :return: The outbox rows.
+    :rtype: list[OutboxEvent]
+    """
+    events = []
+    for groups, message, *rest in pushes:
+        events.append(
+            OutboxEvent(
+                kind=OutboxEvent.KIND_PUSH,
+                topic=rest[0] if rest else "notify",
+                payload={"groups": list(groups), "message": message},
+            )
+        )
+    return OutboxEvent.objects.bulk_create(events)
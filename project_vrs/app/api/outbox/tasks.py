@@ -0,0 +1,208 @@
+import asyncio
+from logging import getLogger
+
+from asgiref.sync import async_to_sync
+from backend.celery import PRIORITY_HIGH, QUEUE_CRITICAL
+from celery import current_app, shared_task
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..models import OutboxEvent
+from ..utils.replay import get_replay_buffer
+
+logger = getLogger(__name__)
+
+BATCH_SIZE = int(getattr(settings, "OUTBOX_BATCH_SIZE", 200))
+MAX_BATCHES_PER_RUN = int(getattr(settings, "OUTBOX_MAX_BATCHES_PER_RUN", 10))
+MAX_ATTEMPTS = int(getattr(settings, "OUTBOX_MAX_ATTEMPTS", 10))
+# task name -> batch task: events of these tasks taken in the same relay batch
+# are published as one call of the batch task with all their args
+TASK_BATCHES = dict(getattr(settings, "OUTBOX_TASK_BATCHES", {}))
+# task name -> "module.function" that adds pre-fetched data to a batch of its calls
+TASK_ENRICHERS = dict(getattr(settings, "OUTBOX_TASK_ENRICHERS", {}))
+# only notification pushes are kept for reconnect replay (api/utils/replay.py)
+REPLAY_HANDLERS = {"notify", "notify_coalesced"}
+
+
+async def _push_all(channel_layer, sends):
+    """
+    Run every group send concurrently; return one exception (or None) per send.
+    """
+    return await asyncio.gather(
+        *(channel_layer.group_send(group, event) for group, event in sends),
+        return_exceptions=True,
+    )
+
+
+def _publish_pushes(events: list[OutboxEvent]) -> dict:
+    """
+    Publish all push events of a batch inside a single event loop hop. Each
+    event gets the next replay ``seq`` and is kept in its groups' ring buffers.
+    Returns {event_pk: error_message} for events that failed.
+    """
+    channel_layer = get_channel_layer()
+    sends, owners, replay = [], [], []
+    if not events:
+        return {}
+    seqs = get_replay_buffer().next_seqs(len(events))
+    for ev, seq in zip(events, seqs):
+        message = dict(ev.payload.get("message") or {})
+        message["event_id"] = str(ev.dedup_id)
+        message["seq"] = seq
+        for group in ev.payload.get("groups") or []:
+            sends.append((group, {"type": ev.topic, "message": message}))
+            owners.append(ev.pk)
+            if ev.topic in REPLAY_HANDLERS:
+                replay.append((group, seq, message))
+
+    errors = {}
+    if not sends:
+        return errors
+    # buffer before sending: a client reconnecting in between finds the message
+    # either live or in the replay, never in neither
+    try:
+        if replay:
+            get_replay_buffer().record(replay)
+    except Exception:
+        logger.exception("Failed to record WS replay buffer")
+    results = async_to_sync(_push_all)(channel_layer, sends)
+    for pk, result in zip(owners, results):
+        if isinstance(result, Exception):
+            errors[pk] = repr(result)
+    return errors
+
+
+def _task_calls(events: list[OutboxEvent]) -> dict:
+    """
+    {event_pk: (args, kwargs)} for the task events of a batch. Tasks listed in
+    OUTBOX_TASK_ENRICHERS get their calls passed, all at once per enricher, so
+    it can add data (e.g. a pre-fetched snapshot) with batched queries.
+    If an enricher fails the raw calls are used.
+    """
+    calls = {
+        ev.pk: (list(ev.payload.get("args") or []), dict(ev.payload.get("kwargs") or {}))
+        for ev in events
+    }
+    by_enricher = {}
+    for ev in events:
+        if ev.topic in TASK_ENRICHERS:
+            by_enricher.setdefault(TASK_ENRICHERS[ev.topic], []).append(ev)
+    for path, grouped in by_enricher.items():
+        try:
+            enriched = import_string(path)([(ev.topic, *calls[ev.pk]) for ev in grouped])
+        except Exception:
+            logger.exception("Outbox enricher %s failed", path)
+            continue
+        for ev, (_, args, kwargs) in zip(grouped, enriched):
+            calls[ev.pk] = (args, kwargs)
+    return calls
+
+
+def _send_tasks(batch_task: str, events: list[OutboxEvent], calls: dict) -> dict:
+    """
+    Publish task events: one by one, or as a single ``batch_task`` call with
+    ``[{"task", "args", "kwargs"}, ...]`` when several share a batch task.
+    Returns {event_pk: error_message} for events that failed.
+    """
+    if len(events) == 1:
+        name = events[0].topic
+        args, kwargs = calls[events[0].pk]
+    else:
+        name = batch_task
+        args = [
+            [
+                {"task": ev.topic, "args": calls[ev.pk][0], "kwargs": calls[ev.pk][1]}
+                for ev in events
+            ]
+        ]
+        kwargs = {}
+    # send_task() only sees task_routes, so route by the queue (and priority)
+    # declared on the task
+    task = current_app.tasks.get(name)
+    options = {
+        key: value
+        for key in ("queue", "priority")
+        if (value := getattr(task, key, None)) is not None
+    }
+    try:
+        current_app.send_task(
+            name, args=args, kwargs=kwargs, task_id=str(events[0].dedup_id), **options
+        )
+    except Exception as exc:
+        return {ev.pk: repr(exc) for ev in events}
+    return {}
+
+
+def relay_batch(batch_size: int = BATCH_SIZE, queryset=None) -> int:
+    """
+    Publish one batch of unpublished outbox events.
+
+    Rows are locked with SKIP LOCKED so several relays can run side by side.
+    Delivery is at-least-once: if marking a row fails after it was published it
+    is sent again later with the same dedup id.
+
+    :param batch_size: Maximum number of events to take.
+    :type batch_size: int
+    :param queryset: The outbox rows to pick from (default: all of them).
+    :type queryset: QuerySet[OutboxEvent] | None
+    :return: Number of events taken from the outbox.
+    :rtype: int
+    """
+    queryset = OutboxEvent.objects.all() if queryset is None else queryset
+    with transaction.atomic():
+        events = list(
+            queryset.select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True, attempts__lt=MAX_ATTEMPTS)
+            .order_by("id")[:batch_size]
+        )
+        if not events:
+            return 0
+
+        errors = {}
+        batches = {}
+        task_events = [ev for ev in events if ev.kind == OutboxEvent.KIND_TASK]
+        calls = _task_calls(task_events)
+        for ev in task_events:
+            if ev.topic in TASK_BATCHES:
+                batches.setdefault(TASK_BATCHES[ev.topic], []).append(ev)
+                continue
+            errors.update(_send_tasks(ev.topic, [ev], calls))
+        for batch_task, grouped in batches.items():
+            errors.update(_send_tasks(batch_task, grouped, calls))
+
+        pushes = [ev for ev in events if ev.kind == OutboxEvent.KIND_PUSH]
+        try:
+            errors.update(_publish_pushes(pushes))
+        except Exception as exc:
+            errors.update({ev.pk: repr(exc) for ev in pushes})
+
+        published = [ev.pk for ev in events if ev.pk not in errors]
+        if published:
+            OutboxEvent.objects.filter(pk__in=published).update(
+                published_at=timezone.now(), attempts=F("attempts") + 1
+            )
+        for pk, error in errors.items():
+            logger.warning("Outbox event %s failed to publish: %s", pk, error)
+            OutboxEvent.objects.filter(pk=pk).update(
+                attempts=F("attempts") + 1, last_error=error[:2000]
+            )
+
+    return len(events)
+
+
+@shared_task(bind=True, queue=QUEUE_CRITICAL, priority=PRIORITY_HIGH, ignore_result=True)
+def relay_outbox(self) -> int:
+    """
+    Drain the outbox in batches (run periodically by celery beat).
+    """
+    total = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        taken = relay_batch()
+        total += taken
+        if taken < BATCH_SIZE:
+            break
+    return total
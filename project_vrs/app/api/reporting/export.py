@@ -0,0 +1,115 @@
+# api/reporting/export.py
+import csv
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Reservation
+
+CHUNK_SIZE = int(getattr(settings, "EXPORT_CHUNK_SIZE", 2000))
+# lines joined into one write to the client
+LINES_PER_WRITE = 500
+
+_LINE = "physicalvehiclereservation__"
+# (column, values() lookup): one flat row per line item; a reservation
+# without items gives one row with empty item columns
+EXPORT_COLUMNS = (
+    ("reservation_id", "id"),
+    ("created_at", "created_at"),
+    ("status", "status__status"),
+    ("user_id", "user_id"),
+    ("user_email", "user__email"),
+    ("start_date", "start_date"),
+    ("end_date", "end_date"),
+    ("pickup_location", "pickup_location__location_name"),
+    ("dropoff_location", "dropoff_location__location_name"),
+    ("total_price", "total_price"),
+    ("physical_vehicle_id", f"{_LINE}physical_vehicle_id"),
+    ("car_plate_number", f"{_LINE}physical_vehicle__car_plate_number"),
+    ("vehicle_id", f"{_LINE}physical_vehicle__vehicle_id"),
+    ("brand", f"{_LINE}physical_vehicle__vehicle__model__brand__brand_name"),
+    ("model", f"{_LINE}physical_vehicle__vehicle__model__model_name"),
+    ("price_per_day", f"{_LINE}physical_vehicle__vehicle__price_per_day"),
+)
+COLUMNS = [column for column, _ in EXPORT_COLUMNS]
+
+
+def export_queryset(date_from=None, date_to=None, date_field="created_at", statuses=()):
+    """
+    Flat rows (tuples in COLUMNS order) of the reservations whose
+    ``date_field`` falls in [date_from, date_to] (local dates, inclusive) and
+    whose status is one of ``statuses`` (case-insensitive; all if empty).
+    """
+    qs = Reservation.objects.all()
+    if date_from:
+        qs = qs.filter(
+            **{f"{date_field}__gte": timezone.make_aware(datetime.combine(date_from, time.min))}
+        )
+    if date_to:
+        end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        qs = qs.filter(**{f"{date_field}__lt": end})
+    if statuses:
+        match = Q()
+        for name in statuses:
+            match |= Q(status__status__iexact=name)
+        qs = qs.filter(match)
+    return qs.order_by("id", f"{_LINE}id").values_list(
+        *(lookup for _, lookup in EXPORT_COLUMNS)
+    )
+
+
+def _cell(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class _Echo:
+    """
+    File-like object for csv.writer that hands back the written line.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(queryset, chunk_size: int = CHUNK_SIZE):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield writer.writerow(["" if v is None else _cell(v) for v in row])
+
+
+def jsonl_lines(queryset, chunk_size: int = CHUNK_SIZE):
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield json.dumps({c: _cell(v) for c, v in zip(COLUMNS, row)}) + "\n"
+
+
+def batched(lines, size: int = LINES_PER_WRITE):
+    """
+    Join lines into larger writes (sync iterator, for WSGI).
+    """
+    lines = iter(lines)
+    while chunk := list(islice(lines, size)):
+        yield "".join(chunk)
+
+
+async def abatched(lines, size: int = LINES_PER_WRITE):
+    """
+    Async version of batched() for ASGI: Django buffers a sync iterator
+    completely before streaming it there. Each batch is read in the thread
+    that owns the request's DB connection, so the server-side cursor stays
+    on one connection.
+    """
+    lines = iter(lines)
+    read = sync_to_async(lambda: list(islice(lines, size)), thread_sensitive=True)
+    while chunk := await read():
+        yield "".join(chunk)
@@ -0,0 +1,87 @@
+# api/reporting/kpis.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from ..constants import ACTIVE_STATUSES, FINAL_STATUSES
+from ..models import Reservation
+
+User = get_user_model()
+
+CACHE_KEY = "admin:kpis"
+# Refreshed by celery beat every KPI_REFRESH_INTERVAL seconds; kept a little
+# longer so a late run never leaves the dashboard without a snapshot
+REFRESH_INTERVAL = float(getattr(settings, "KPI_REFRESH_INTERVAL", 60))
+CACHE_TTL = int(REFRESH_INTERVAL * 3)
+
+
+def compute_kpis(now=None) -> dict:
+    """
+    User and reservation KPIs in two queries: one conditional aggregate over
+    users and one GROUP BY status over reservations (totals, active/final and
+    revenue are summed from the per-status rows).
+
+    :param now: Reference time (defaults to now).
+    :type now: datetime | None
+    :return: Payload for AdminKPISerializer, with ``computed_at``.
+    :rtype: dict
+    """
+    now = now or timezone.now()
+    start_7d = now - timedelta(days=7)
+    start_30d = now - timedelta(days=30)
+
+    users = User.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        blocked=Count("id", filter=Q(is_blocked=True)),
+        new_7d=Count("id", filter=Q(created_at__gte=start_7d)),
+        new_30d=Count("id", filter=Q(created_at__gte=start_30d)),
+    )
+
+    # consider revenue as total_price for new reservations in last 30d
+    rows = Reservation.objects.values("status__status").annotate(
+        c=Count("id"),
+        revenue=Sum("total_price", filter=Q(created_at__gte=start_30d)),
+    ).order_by()
+    by_status, total, active, final, revenue = {}, 0, 0, 0, 0
+    for row in rows:
+        name, n = row["status__status"], row["c"]
+        by_status[name] = n
+        total += n
+        active += n if name in ACTIVE_STATUSES else 0
+        final += n if name in FINAL_STATUSES else 0
+        revenue += row["revenue"] or 0
+
+    return {
+        "computed_at": now,
+        "users": users,
+        "reservations": {
+            "total": total,
+            "active": active,
+            "final": final,
+            "by_status": by_status,
+            "revenue_last_30d": str(revenue),
+        },
+    }
+
+
+def refresh_kpis() -> dict:
+    """
+    Compute the KPIs and store them as the cached snapshot.
+    """
+    snapshot = compute_kpis()
+    cache.set(CACHE_KEY, snapshot, CACHE_TTL)
+    return snapshot
+
+
+def get_kpis(fresh: bool = False) -> dict:
+    """
+    The cached KPI snapshot; computed (and cached) now if missing or if
+    ``fresh`` is set.
+    """
+    snapshot = None if fresh else cache.get(CACHE_KEY)
+    return snapshot or refresh_kpis()
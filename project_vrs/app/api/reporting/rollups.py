@@ -0,0 +1,248 @@
+# api/reporting/rollups.py
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from ..constants import CANCELLED
+from ..models import (
+    PhysicalVehicleReservation,
+    Reservation,
+    ReservationDailyRollup,
+    RollupWatermark,
+)
+
+WATERMARK = "reservation_daily"
+# Rows changed in the last LAG seconds are left for the next run, so a
+# transaction that commits a little after its updated_at is not skipped
+LAG = timedelta(seconds=float(getattr(settings, "ROLLUP_LAG_SECONDS", 60)))
+# Booking days rebuilt per transaction; bounds memory and watermark lock time
+BATCH_DAYS = int(getattr(settings, "ROLLUP_BATCH_DAYS", 31))
+CHUNK_SIZE = 2000
+
+BUCKETS = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+
+
+def _day_ranges(days, prefix: str = "") -> Q:
+    """
+    OR of half-open [local midnight, next midnight) ranges on created_at, with
+    consecutive days merged, so the reservations of ``days`` come from an
+    index range scan.
+    """
+    q = Q()
+    days = sorted(days)
+    i = 0
+    while i < len(days):
+        j = i
+        while j + 1 < len(days) and days[j + 1] == days[j] + timedelta(days=1):
+            j += 1
+        start = timezone.make_aware(datetime.combine(days[i], time.min))
+        end = timezone.make_aware(datetime.combine(days[j] + timedelta(days=1), time.min))
+        q |= Q(**{f"{prefix}created_at__gte": start, f"{prefix}created_at__lt": end})
+        i = j + 1
+    return q
+
+
+def recompute_days(days) -> int:
+    """
+    Rebuild the rollup rows of the given booking days from their reservations
+    (two queries: reservations, and their units' vehicle types, both streamed).
+    Memory grows with the number of days, so callers pass bounded batches.
+
+    :param days: Local dates to rebuild.
+    :type days: Iterable[date]
+    :return: Number of rollup rows written.
+    :rtype: int
+    """
+    days = set(days)
+    if not days:
+        return 0
+    types = defaultdict(Counter)
+    for res_id, type_id in (
+        PhysicalVehicleReservation.objects.filter(_day_ranges(days, "reservation__"))
+        .values_list("reservation_id", "physical_vehicle__vehicle__vehicle_type_id")
+        .iterator(chunk_size=CHUNK_SIZE)
+    ):
+        types[res_id][type_id] += 1
+    reservations = (
+        Reservation.objects.filter(_day_ranges(days))
+        .values_list("id", "created_at", "pickup_location_id", "status_id", "total_price")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+    buckets = defaultdict(lambda: [0, 0, Decimal("0")])
+    for res_id, created_at, location_id, status_id, total_price in reservations:
+        per_type = types.get(res_id)
+        # the type most units have; ties go to the lowest type id
+        type_id = (
+            min(per_type, key=lambda t: (-per_type[t], t)) if per_type else None
+        )
+        bucket = buckets[(timezone.localdate(created_at), location_id, type_id, status_id)]
+        bucket[0] += 1
+        bucket[1] += sum(per_type.values()) if per_type else 0
+        bucket[2] += total_price or 0
+
+    ReservationDailyRollup.objects.filter(day__in=days).delete()
+    ReservationDailyRollup.objects.bulk_create(
+        ReservationDailyRollup(
+            day=day,
+            location_id=location_id,
+            vehicle_type_id=type_id,
+            status_id=status_id,
+            bookings=bookings,
+            units=units,
+            revenue=revenue,
+        )
+        for (day, location_id, type_id, status_id), (bookings, units, revenue) in buckets.items()
+    )
+    return len(buckets)
+
+
+def _lock_watermark() -> RollupWatermark:
+    RollupWatermark.objects.get_or_create(name=WATERMARK)
+    return RollupWatermark.objects.select_for_update().get(name=WATERMARK)
+
+
+def rebuild_days(days) -> int:
+    """
+    Rebuild the given booking days, BATCH_DAYS at a time, each batch in its
+    own transaction holding the watermark row lock (so it serializes with
+    update_rollups()). Used for days the watermark can't see, e.g. those of
+    deleted reservations.
+
+    :param days: Local dates to rebuild.
+    :type days: Iterable[date]
+    :return: Number of rollup rows written.
+    :rtype: int
+    """
+    days = sorted(set(days))
+    rows = 0
+    for i in range(0, len(days), BATCH_DAYS):
+        with transaction.atomic():
+            _lock_watermark()
+            rows += recompute_days(days[i : i + BATCH_DAYS])
+    return rows
+
+
+def update_rollups(now=None, full: bool = False) -> dict:
+    """
+    Incremental run: find the booking days of reservations changed since the
+    watermark and rebuild just those days. The first run (or ``full``)
+    rebuilds every day.
+
+    Days are rebuilt BATCH_DAYS at a time, each batch in its own transaction
+    holding the watermark row lock (concurrent runs serialize per batch). The
+    watermark only moves once every batch is done, so an interrupted run is
+    redone by the next one.
+
+    A deleted reservation leaves no changed row behind; its day is rebuilt by
+    the recompute_kpi_rollup_days task the Reservation post_delete signal
+    queues (api/signals.py).
+
+    :return: {"days": rebuilt days, "rows": rollup rows written, "watermark": new watermark}
+    :rtype: dict
+    """
+    upto = (now or timezone.now()) - LAG
+    with transaction.atomic():
+        watermark = _lock_watermark().watermark
+
+    changed = Reservation.objects.filter(updated_at__lte=upto)
+    if watermark and not full:
+        changed = changed.filter(updated_at__gt=watermark)
+    days = sorted(
+        {
+            timezone.localdate(day)
+            for day in changed.datetimes(
+                "created_at", "day", tzinfo=timezone.get_current_timezone()
+            )
+        }
+    )
+    rows = rebuild_days(days)
+
+    with transaction.atomic():
+        state = _lock_watermark()
+        if full:
+            # days whose reservations are all gone
+            stale = sorted(
+                set(ReservationDailyRollup.objects.values_list("day", flat=True).distinct())
+                - set(days)
+            )
+            for i in range(0, len(stale), BATCH_DAYS):
+                ReservationDailyRollup.objects.filter(day__in=stale[i : i + BATCH_DAYS]).delete()
+        # a concurrent run may have moved it further already
+        if state.watermark is None or upto > state.watermark:
+            state.watermark = upto
+            state.save(update_fields=["watermark"])
+    return {"days": len(days), "rows": rows, "watermark": upto}
+
+
+def _period_starts(start, end, bucket: str):
+    if bucket == "week":
+        start = start - timedelta(days=start.weekday())
+    elif bucket == "month":
+        start = start.replace(day=1)
+    period = start
+    while period <= end:
+        yield period
+        if bucket == "day":
+            period += timedelta(days=1)
+        elif bucket == "week":
+            period += timedelta(days=7)
+        else:
+            period = (period.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def time_series(
+    start,
+    end,
+    bucket: str = "day",
+    location_id: int | None = None,
+    vehicle_type_id: int | None = None,
+    status: str | None = None,
+) -> list[dict]:
+    """
+    Bookings, units, revenue and cancellations per day/week/month between
+    ``start`` and ``end`` (booking dates, inclusive), read from the rollups
+    only. Periods without bookings are returned as zeros.
+
+    :param bucket: "day", "week" (starting Monday) or "month".
+    :type bucket: str
+    :return: [{"period", "bookings", "units", "revenue", "cancellations"}, ...]
+    :rtype: list[dict]
+    """
+    qs = ReservationDailyRollup.objects.filter(day__gte=start, day__lte=end)
+    if location_id:
+        qs = qs.filter(location_id=location_id)
+    if vehicle_type_id:
+        qs = qs.filter(vehicle_type_id=vehicle_type_id)
+    if status:
+        qs = qs.filter(status__status__iexact=status)
+
+    rows = (
+        qs.annotate(period=BUCKETS[bucket]("day"))
+        .values("period")
+        .annotate(
+            total_bookings=Sum("bookings"),
+            total_units=Sum("units"),
+            total_revenue=Sum("revenue"),
+            total_cancellations=Sum("bookings", filter=Q(status__status__iexact=CANCELLED)),
+        )
+        .order_by("period")
+    )
+    by_period = {row["period"]: row for row in rows}
+    empty = {}
+    return [
+        {
+            "period": period,
+            "bookings": by_period.get(period, empty).get("total_bookings") or 0,
+            "units": by_period.get(period, empty).get("total_units") or 0,
+            "revenue": by_period.get(period, empty).get("total_revenue") or Decimal("0"),
+            "cancellations": by_period.get(period, empty).get("total_cancellations") or 0,
+        }
+        for period in _period_starts(start, end, bucket)
+    ]
@@ -0,0 +1,54 @@
+from backend.celery import PRIORITY_HIGH, PRIORITY_LOW, QUEUE_REPORTS
+from datetime import date
+
+from celery import shared_task
+
+from .kpis import refresh_kpis
+from .rollups import rebuild_days, update_rollups
+from .utilization import store_report
+
+
+@shared_task(queue=QUEUE_REPORTS, ignore_result=True)
+def refresh_admin_kpis() -> None:
+    """
+    Recompute the admin KPI snapshot (celery beat, every KPI_REFRESH_INTERVAL).
+    """
+    refresh_kpis()
+
+
+@shared_task(queue=QUEUE_REPORTS, priority=PRIORITY_LOW, ignore_result=True)
+def update_kpi_rollups() -> dict:
+    """
+    Fold reservations changed since the last run into the daily rollups
+    (celery beat, every ROLLUP_INTERVAL).
+    """
+    return update_rollups()
+
+
+@shared_task(queue=QUEUE_REPORTS, priority=PRIORITY_LOW, ignore_result=True)
+def recompute_kpi_rollup_days(days: list[str]) -> int:
+    """
+    Rebuild the rollups of the given booking days (ISO dates), e.g. after
+    their reservations were deleted.
+    """
+    return rebuild_days(date.fromisoformat(day) for day in days)
+
+
+@shared_task(queue=QUEUE_REPORTS, priority=PRIORITY_LOW, ignore_result=True)
+def recompute_kpi_rollup_days_batch(items: list[dict]) -> int:
+    """
+    The recompute_kpi_rollup_days calls of one outbox relay batch
+    (OUTBOX_TASK_BATCHES), merged: every day is rebuilt once.
+    """
+    days = {day for item in items for day in item["args"][0]}
+    return rebuild_days(date.fromisoformat(day) for day in days)
+
+
+# someone is polling for the result
+@shared_task(queue=QUEUE_REPORTS, priority=PRIORITY_HIGH, ignore_result=True)
+def build_utilization_report(params: dict) -> None:
+    """
+    Build a fleet utilization report; the result goes to the cache, where
+    the report view picks it up.
+    """
+    store_report(params)
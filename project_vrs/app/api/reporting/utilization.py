@@ -0,0 +1,212 @@
+# api/reporting/utilization.py
+import hashlib
+import json
+from logging import getLogger
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import PhysicalVehicle, PhysicalVehicleReservation, ReservationStatus
+
+logger = getLogger(__name__)
+
+# Reservations that actually held the unit (case-insensitive status names)
+UTILIZED_STATUSES = ("pending", "pending_payment", "confirmed", "active", "completed")
+
+CACHE_KEY = "report:utilization:{}"
+PENDING_KEY = "report:utilization:{}:pending"
+CACHE_TTL = int(getattr(settings, "REPORT_CACHE_TTL", 600))
+# a crashed build frees the slot after this long
+PENDING_TTL = int(getattr(settings, "REPORT_PENDING_TTL", 300))
+STREAM_CHUNK = 2000
+
+
+def report_key(params: dict) -> str:
+    """
+    Stable cache key of one parameter set ({"start": iso, "end": iso,
+    "location_id": int | None}).
+    """
+    raw = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _sweep(intervals, start, end):
+    """
+    One pass over a unit's intervals (sorted by start): clip them to the
+    period, merge overlaps, and measure booked time and the idle gaps.
+
+    :return: (booked seconds, bookings, idle gaps, longest idle seconds)
+    :rtype: tuple[float, int, int, float]
+    """
+    booked = longest = 0.0
+    bookings = gaps = 0
+    cursor = start  # end of the booked time seen so far
+    for a, b in intervals:
+        bookings += 1
+        a, b = max(a, start), min(b, end)
+        if b <= cursor:
+            continue
+        if a > cursor:
+            gap = (a - cursor).total_seconds()
+            gaps += 1
+            longest = max(longest, gap)
+        else:
+            a = cursor
+        booked += (b - a).total_seconds()
+        cursor = b
+    if cursor < end:
+        gap = (end - cursor).total_seconds()
+        gaps += 1
+        longest = max(longest, gap)
+    return booked, bookings, gaps, longest
+
+
+def _stream_intervals(start, end, location_id=None):
+    """
+    Yield (unit id, [(start, end), ...]) for every unit with bookings that
+    overlap the period, from one query ordered by unit and start.
+    """
+    statuses = Q()
+    for name in UTILIZED_STATUSES:
+        statuses |= Q(status__iexact=name)
+    status_ids = list(ReservationStatus.objects.filter(statuses).values_list("id", flat=True))
+
+    qs = PhysicalVehicleReservation.objects.filter(
+        reservation__start_date__lt=end,
+        reservation__end_date__gt=start,
+        reservation__status_id__in=status_ids,
+    )
+    if location_id:
+        qs = qs.filter(physical_vehicle__location_id=location_id)
+    rows = qs.order_by("physical_vehicle_id", "reservation__start_date").values_list(
+        "physical_vehicle_id", "reservation__start_date", "reservation__end_date"
+    )
+
+    unit_id, intervals = None, []
+    for pv_id, a, b in rows.iterator(chunk_size=STREAM_CHUNK):
+        if pv_id != unit_id:
+            if unit_id is not None:
+                yield unit_id, intervals
+            unit_id, intervals = pv_id, []
+        intervals.append((a, b))
+    if unit_id is not None:
+        yield unit_id, intervals
+
+
+def _rollup(units, key: str, period_seconds: float) -> list[dict]:
+    groups = {}
+    for unit in units:
+        group = groups.setdefault(
+            unit[key], {key: unit[key], "units": 0, "booked_hours": 0.0, "bookings": 0}
+        )
+        group["units"] += 1
+        group["booked_hours"] += unit["booked_hours"]
+        group["bookings"] += unit["bookings"]
+    for group in groups.values():
+        capacity = group["units"] * period_seconds / 3600
+        group["utilization"] = round(group["booked_hours"] / capacity, 4) if capacity else 0.0
+        group["booked_hours"] = round(group["booked_hours"], 2)
+    return sorted(groups.values(), key=lambda g: -g["utilization"])
+
+
+def build_utilization(start, end, location_id=None) -> dict:
+    """
+    Utilization per unit, per vehicle and per location over [start, end):
+    share of hours booked, idle gaps and bookings (turnover). Two queries:
+    the fleet, and the booking intervals streamed in unit order.
+
+    :param start: Period start (aware datetime).
+    :param end: Period end (aware datetime).
+    :param location_id: Restrict to the units of one location.
+    :return: {"start", "end", "hours", "generated_at", "units", "vehicles", "locations"}
+    :rtype: dict
+    """
+    period_seconds = (end - start).total_seconds()
+    fleet = PhysicalVehicle.objects.all()
+    if location_id:
+        fleet = fleet.filter(location_id=location_id)
+    fleet = {
+        pv_id: (vehicle_id, loc_id, plate)
+        for pv_id, vehicle_id, loc_id, plate in fleet.values_list(
+            "id", "vehicle_id", "location_id", "car_plate_number"
+        )
+    }
+
+    swept = {
+        unit_id: _sweep(intervals, start, end)
+        for unit_id, intervals in _stream_intervals(start, end, location_id)
+    }
+    idle = (0.0, 0, 1, period_seconds)  # never booked: one gap, the whole period
+
+    units = []
+    for pv_id, (vehicle_id, loc_id, plate) in fleet.items():
+        booked, bookings, gaps, longest = swept.get(pv_id, idle)
+        units.append(
+            {
+                "physical_vehicle_id": pv_id,
+                "car_plate_number": plate,
+                "vehicle_id": vehicle_id,
+                "location_id": loc_id,
+                "booked_hours": booked / 3600,
+                "utilization": round(booked / period_seconds, 4) if period_seconds else 0.0,
+                "bookings": bookings,
+                "idle_gaps": gaps,
+                "longest_idle_hours": round(longest / 3600, 2),
+            }
+        )
+
+    report = {
+        "start": start,
+        "end": end,
+        "hours": round(period_seconds / 3600, 2),
+        "generated_at": timezone.now(),
+        "vehicles": _rollup(units, "vehicle_id", period_seconds),
+        "locations": _rollup(units, "location_id", period_seconds),
+    }
+    for unit in units:
+        unit["booked_hours"] = round(unit["booked_hours"], 2)
+    report["units"] = sorted(units, key=lambda u: -u["utilization"])
+    return report
+
+
+def cached_report(key: str):
+    return cache.get(CACHE_KEY.format(key))
+
+
+def request_report(params: dict, refresh: bool = False):
+    """
+    Return the cached report for ``params``, or queue its build and return
+    None. Only one build per parameter set is queued at a time.
+    """
+    key = report_key(params)
+    if not refresh:
+        report = cached_report(key)
+        if report is not None:
+            return report
+    if cache.add(PENDING_KEY.format(key), True, PENDING_TTL):
+        from .tasks import build_utilization_report
+
+        build_utilization_report.delay(params)
+    return None
+
+
+def store_report(params: dict) -> dict:
+    """
+    Build the report for ``params`` and cache it (run by the Celery task).
+    Dates travel as ISO strings, so the params survive the JSON serializer.
+    """
+    key = report_key(params)
+    try:
+        report = build_utilization(
+            parse_datetime(params["start"]),
+            parse_datetime(params["end"]),
+            params.get("location_id"),
+        )
+        cache.set(CACHE_KEY.format(key), report, CACHE_TTL)
+    finally:
+        cache.delete(PENDING_KEY.format(key))
+    logger.info("Utilization report %s: %d units", key, len(report["units"]))
+    return report
@@ -0,0 +1,150 @@
+import time
+from collections import Counter
+from datetime import timedelta
+from logging import getLogger
+
+from backend.celery import PRIORITY_LOW, QUEUE_REPORTS
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from ..models import DedupClaim, LoginEvent, Notification, NotificationCounter, OutboxEvent
+
+logger = getLogger(__name__)
+
+CHUNK_SIZE = int(getattr(settings, "RETENTION_CHUNK_SIZE", 1000))
+# stop after this long; whatever is left is picked up by the next run
+MAX_SECONDS = float(getattr(settings, "RETENTION_MAX_SECONDS", 300))
+# short pause between chunks so replicas and concurrent writers keep up
+CHUNK_PAUSE = float(getattr(settings, "RETENTION_CHUNK_PAUSE", 0.05))
+
+
+def _release_unread(rows) -> None:
+    """
+    Deleting unread notifications must lower the recipients' unread counters,
+    otherwise the badge would count rows that no longer exist.
+    """
+    per_user = Counter(recipient_id for _, recipient_id, is_read in rows if not is_read)
+    by_amount = {}
+    for uid, n in per_user.items():
+        by_amount.setdefault(n, []).append(uid)
+    for n, uids in by_amount.items():
+        NotificationCounter.objects.filter(user_id__in=uids).update(
+            unread=Greatest(F("unread") - n, 0)
+        )
+
+
+def _purge_notifications_chunk(cutoff, chunk_size: int) -> int:
+    with transaction.atomic():
+        rows = list(
+            Notification.objects.filter(created_at__lt=cutoff)
+            .order_by("created_at", "id")
+            .values_list("id", "recipient_id", "is_read")[:chunk_size]
+        )
+        if not rows:
+            return 0
+        Notification.objects.filter(id__in=[row[0] for row in rows]).delete()
+        _release_unread(rows)
+    return len(rows)
+
+
+def _purge_chunk(queryset, order_field: str, chunk_size: int) -> int:
+    # ids first, then delete by primary key: every chunk is a short transaction
+    # touching at most chunk_size rows, never a table-wide range lock
+    with transaction.atomic():
+        ids = list(
+            queryset.order_by(order_field, "pk").values_list("pk", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return 0
+        queryset.model.objects.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+def _drain(purge_chunk, deadline: float, chunk_size: int) -> dict:
+    started = time.monotonic()
+    purged = chunks = 0
+    n = chunk_size
+    while time.monotonic() < deadline:
+        n = purge_chunk(chunk_size)
+        purged += n
+        chunks += 1 if n else 0
+        if n < chunk_size:
+            break
+        time.sleep(CHUNK_PAUSE)
+    return {
+        "purged": purged,
+        "chunks": chunks,
+        "seconds": round(time.monotonic() - started, 3),
+        "done": n < chunk_size,
+    }
+
+
+def purge_expired(now=None, chunk_size: int = CHUNK_SIZE, max_seconds: float = MAX_SECONDS) -> dict:
+    """
+    Delete notifications, login events, published outbox events and dedup
+    claims older than their retention period, in bounded chunks.
+
+    :return: Per-table report, e.g.
+        {"notification": {"purged": 1200, "chunks": 2, "seconds": 0.4, "done": True}, ...}
+    :rtype: dict
+    """
+    now = now or timezone.now()
+    deadline = time.monotonic() + max_seconds
+
+    notification_cutoff = now - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    login_cutoff = now - timedelta(days=settings.LOGIN_EVENT_RETENTION_DAYS)
+    outbox_cutoff = now - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    dedup_cutoff = now - timedelta(days=settings.DEDUP_RETENTION_DAYS)
+
+    report = {
+        "notification": _drain(
+            lambda n: _purge_notifications_chunk(notification_cutoff, n),
+            deadline,
+            chunk_size,
+        ),
+        "login_event": _drain(
+            lambda n: _purge_chunk(
+                LoginEvent.objects.filter(timestamp__lt=login_cutoff), "timestamp", n
+            ),
+            deadline,
+            chunk_size,
+        ),
+        "outbox_event": _drain(
+            lambda n: _purge_chunk(
+                OutboxEvent.objects.filter(published_at__lt=outbox_cutoff),
+                "published_at",
+                n,
+            ),
+            deadline,
+            chunk_size,
+        ),
+        "dedup_claim": _drain(
+            lambda n: _purge_chunk(
+                DedupClaim.objects.filter(created_at__lt=dedup_cutoff), "created_at", n
+            ),
+            deadline,
+            chunk_size,
+        ),
+    }
+    for table, stats in report.items():
+        logger.info(
+            "Retention purge %s: %s rows in %s chunks, %ss%s",
+            table,
+            stats["purged"],
+            stats["chunks"],
+            stats["seconds"],
+            "" if stats["done"] else " (time budget reached, continuing next run)",
+        )
+    return report
+
+
+@shared_task(bind=True, queue=QUEUE_REPORTS, priority=PRIORITY_LOW, ignore_result=True)
+def purge_expired_rows(self) -> dict:
+    """
+    Nightly retention job (celery beat). Returns the per-table report.
+    """
+    return purge_expired()
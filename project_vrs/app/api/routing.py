@@ -5,4 +5,5 @@ from . import consumers
 
 websocket_urlpatterns = [
     re_path(r'^ws/notifications/?$', consumers.NotificationConsumer.as_asgi()),
+    re_path(r'^ws/availability/?$', consumers.AvailabilityConsumer.as_asgi()),
 ]
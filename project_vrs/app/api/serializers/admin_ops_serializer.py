@@ -1,3 +1,6 @@
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
 from ..constants import (
     PENDING_PAYMENT,
@@ -19,6 +22,9 @@ ALL_STATUSES = (
     CANCELLED,
 )
 
+# keeps a day-bucketed series a few thousand points at most
+MAX_SERIES_DAYS = 366 * 5
+
 
 class AdminUserKPISerializer(serializers.Serializer):
     total = serializers.IntegerField()
@@ -37,10 +43,42 @@ class AdminReservationKPISerializer(serializers.Serializer):
 
 
 class AdminKPISerializer(serializers.Serializer):
+    computed_at = serializers.DateTimeField()
     users = AdminUserKPISerializer()
     reservations = AdminReservationKPISerializer()
 
 
+class KPISeriesQuerySerializer(serializers.Serializer):
+    """
+    Query params of the KPI time series. Dates are booking days, inclusive;
+    the default range is the last 30 days.
+    """
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    bucket = serializers.ChoiceField(choices=["day", "week", "month"], default="day")
+    location_id = serializers.IntegerField(required=False)
+    vehicle_type_id = serializers.IntegerField(required=False)
+    status = serializers.CharField(required=False)  # matched case-insensitively
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.localdate()
+        start = attrs.get("start") or end - timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError("start must be on or before end.")
+        if (end - start).days > MAX_SERIES_DAYS:
+            raise serializers.ValidationError(f"Range is limited to {MAX_SERIES_DAYS} days.")
+        return {**attrs, "start": start, "end": end}
+
+
+class KPISeriesPointSerializer(serializers.Serializer):
+    period = serializers.DateField()
+    bookings = serializers.IntegerField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    cancellations = serializers.IntegerField()
+
+
 class ReservationTransitionInputSerializer(serializers.Serializer):
     """
     Request body for the admin transition endpoint.
@@ -62,3 +100,25 @@ class ReservationTransitionOptionsSerializer(serializers.Serializer):
         child=serializers.ChoiceField(choices=ALL_STATUSES)
     )
     is_final = serializers.BooleanField()
+
+
+class TaskStatsSerializer(serializers.Serializer):
+    task = serializers.CharField()
+    succeeded = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    retried = serializers.IntegerField()
+    avg_runtime_ms = serializers.FloatField(allow_null=True)
+    p50_runtime_ms = serializers.IntegerField(allow_null=True)
+    p95_runtime_ms = serializers.IntegerField(allow_null=True)
+    runtime_histogram_ms = serializers.DictField(child=serializers.IntegerField())
+
+
+class QueueStatsSerializer(serializers.Serializer):
+    queue = serializers.CharField()
+    depth = serializers.IntegerField()
+    oldest_age_seconds = serializers.FloatField(allow_null=True)
+
+
+class DedupStatsSerializer(serializers.Serializer):
+    scope = serializers.CharField()
+    suppressed = serializers.IntegerField()
@@ -1,4 +1,11 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
@@ -27,3 +34,38 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         data['username'] = self.user.username
 
         return data
+
+
+class CurrentClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token whose ``role``/``username`` claims are re-read from the user
+    row when it is presented, so the access token (and the rotated refresh
+    token) it yields carry the current role, not the one at login.
+    """
+
+    def __init__(self, token=None, verify=True):
+        super().__init__(token, verify)
+        if token is None:
+            return
+        from ..models import User
+
+        user = (
+            User.objects.select_related("role_id")
+            .filter(pk=self.payload.get(api_settings.USER_ID_CLAIM))
+            .first()
+        )
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        self["role"] = user.role_id.role_name
+        self["username"] = user.username
+
+
+class CurrentClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh that issues tokens with the user's current claims.
+
+    :param TokenRefreshSerializer: Base class for refreshing JWT tokens.
+    :type TokenRefreshSerializer: class
+    """
+
+    token_class = CurrentClaimsRefreshToken
@@ -28,3 +28,17 @@ class NotificationSerializer(serializers.ModelSerializer):
         # Ensure type always has a value
         rep["type"] = rep["type"] or "info"
         return rep
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    """
+    Body of POST /api/notifications/mark_read/.
+    Marks every unread notification with id <= up_to_id (all if omitted).
+    """
+
+    up_to_id = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+
+
+class NotificationUnreadCountSerializer(serializers.Serializer):
+    unread = serializers.IntegerField()
+    marked = serializers.IntegerField(required=False)
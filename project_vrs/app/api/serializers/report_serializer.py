@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+# longest period one report may cover
+MAX_REPORT_DAYS = 366
+
+
+class UtilizationQuerySerializer(serializers.Serializer):
+    """
+    Query params of the utilization report; the default period is the last 30 days.
+    """
+
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    location_id = serializers.IntegerField(required=False)
+    refresh = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.now().replace(minute=0, second=0, microsecond=0)
+        start = attrs.get("start") or end - timedelta(days=30)
+        if start >= end:
+            raise serializers.ValidationError("start must be before end.")
+        if end - start > timedelta(days=MAX_REPORT_DAYS):
+            raise serializers.ValidationError(f"Period is limited to {MAX_REPORT_DAYS} days.")
+        return {**attrs, "start": start, "end": end}
+
+
+class UnitUtilizationSerializer(serializers.Serializer):
+    physical_vehicle_id = serializers.IntegerField()
+    car_plate_number = serializers.CharField()
+    vehicle_id = serializers.IntegerField()
+    location_id = serializers.IntegerField()
+    booked_hours = serializers.FloatField()
+    utilization = serializers.FloatField()
+    bookings = serializers.IntegerField()
+    idle_gaps = serializers.IntegerField()
+    longest_idle_hours = serializers.FloatField()
+
+
+class VehicleUtilizationSerializer(serializers.Serializer):
+    vehicle_id = serializers.IntegerField()
+    units = serializers.IntegerField()
+    booked_hours = serializers.FloatField()
+    utilization = serializers.FloatField()
+    bookings = serializers.IntegerField()
+
+
+class LocationUtilizationSerializer(serializers.Serializer):
+    location_id = serializers.IntegerField()
+    units = serializers.IntegerField()
+    booked_hours = serializers.FloatField()
+    utilization = serializers.FloatField()
+    bookings = serializers.IntegerField()
+
+
+class UtilizationReportSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    hours = serializers.FloatField()
+    generated_at = serializers.DateTimeField()
+    units = UnitUtilizationSerializer(many=True)
+    vehicles = VehicleUtilizationSerializer(many=True)
+    locations = LocationUtilizationSerializer(many=True)
+
+
+class ReservationExportQuerySerializer(serializers.Serializer):
+    """
+    Query params of the reservation export. ``file_format`` rather than
+    ``format``, which DRF reserves for content negotiation.
+    """
+
+    file_format = serializers.ChoiceField(choices=["csv", "jsonl"], default="csv")
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    date_field = serializers.ChoiceField(
+        choices=["created_at", "start_date"], default="created_at"
+    )
+    status = serializers.CharField(
+        required=False, help_text="Comma-separated status names, case-insensitive."
+    )
+
+    def validate(self, attrs):
+        if attrs.get("date_from") and attrs.get("date_to") and attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError("date_from must be on or before date_to.")
+        attrs["statuses"] = [
+            s.strip() for s in (attrs.pop("status", "") or "").split(",") if s.strip()
+        ]
+        return attrs
@@ -19,6 +19,7 @@ from ..models import (
     ReservationStatus,
     Reservation,
 )
+from .sparse import SparseFieldsetMixin
 
 
 class CancelReservationSerializer(serializers.Serializer):
@@ -45,6 +46,7 @@ class VehicleTypeSerializer(serializers.ModelSerializer):
         Shows the id and vehicle type.
         """
 
+        ref_name = "VehicleTypeReservations"
         model = VehicleType
         fields = ["id", "vehicle_type"]
 
@@ -62,6 +64,7 @@ class EngineTypeSerializer(serializers.ModelSerializer):
         Shows the id and engine type.
         """
 
+        ref_name = "EngineTypeReservations"
         model = EngineType
         fields = ["id", "engine_type"]
 
@@ -79,11 +82,12 @@ class BrandSerializer(serializers.ModelSerializer):
         Shows the id and brand name.
         """
 
+        ref_name = "BrandReservations"
         model = Brand
         fields = ["id", "brand_name"]
 
 
-class ModelSerializer(serializers.ModelSerializer):
+class ModelSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     The model of the vehicle - Corolla, Mustang, X5 etc.
 
@@ -100,11 +104,12 @@ class ModelSerializer(serializers.ModelSerializer):
         chains the model to brand using nested serializers.
         """
 
+        ref_name = "ModelReservations"
         model = Model
         fields = ["id", "brand", "model_name"]
 
 
-class VehicleSerializer(serializers.ModelSerializer):
+class VehicleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Combines all attributes that a vehicle has.
 
@@ -151,7 +156,7 @@ class LocationSerializer(serializers.ModelSerializer):
         fields = ["id", "location_name", "address"]
 
 
-class PhysicalVehicleSerializer(serializers.ModelSerializer):
+class PhysicalVehicleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Shows details of a physical vehicle.
 
@@ -168,10 +173,33 @@ class PhysicalVehicleSerializer(serializers.ModelSerializer):
         Uses nested serializers to show vehicle and location details.
         """
 
+        ref_name = "PhysicalVehicleReservations"
         model = PhysicalVehicle
         fields = ["id", "car_plate_number", "vehicle", "location"]
 
 
+class PhysicalVehicleReservationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Serializer for PhysicalVehicleReservation.
+
+    :param serializers: The Django REST framework serializers module.
+    :type serializers: module
+    """
+
+    physical_vehicle = PhysicalVehicleSerializer()
+
+    class Meta:
+        """
+        Only the id and physical vehicle are shown since
+        no vehicle reservation specific details are needed
+        (that information is in the parent reservation).
+        """
+
+        ref_name = "PhysicalVehicleReservationLine"
+        model = PhysicalVehicleReservation
+        fields = ["id", "physical_vehicle"]
+
+
 class ReservationStatusSerializer(serializers.ModelSerializer):
     """
     Shows the status of a reservation.
@@ -185,11 +213,12 @@ class ReservationStatusSerializer(serializers.ModelSerializer):
         The status of the reservation.
         """
 
+        ref_name = "ReservationStatusReservations"
         model = ReservationStatus
         fields = ["id", "status"]
 
 
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for reservations.
 
@@ -203,7 +232,20 @@ class ReservationSerializer(serializers.ModelSerializer):
     pickup_location = LocationSerializer()
     dropoff_location = LocationSerializer()
     user = serializers.StringRelatedField()
-    vehicles = serializers.SerializerMethodField()
+    # served from the physicalvehiclereservation_set prefetch (optimize_queryset)
+    vehicles = PhysicalVehicleReservationSerializer(
+        source="physicalvehiclereservation_set", many=True, read_only=True
+    )
+
+    # without ?expand=vehicles: the ids of the booked physical vehicles
+    collapsed_fields = {
+        "vehicles": serializers.SlugRelatedField(
+            source="physicalvehiclereservation_set",
+            slug_field="physical_vehicle_id",
+            many=True,
+            read_only=True,
+        )
+    }
 
     class Meta:
         """
@@ -226,41 +268,6 @@ class ReservationSerializer(serializers.ModelSerializer):
             "vehicles",
         ]
 
-    def get_vehicles(self, obj):
-        """
-        This method fetches the vehicles related to a reservation.
-
-        :param obj: _the reservation object_
-        :type obj: Reservation
-        :return: _vehicles related to the reservation_
-        :rtype: _list of PhysicalVehicleReservationSerializer_
-        """
-
-        # Get all PhysicalVehicleReservation entries for this reservation
-        pvr = PhysicalVehicleReservation.objects.filter(reservation=obj)
-        return PhysicalVehicleReservationSerializer(pvr, many=True).data
-
-
-class PhysicalVehicleReservationSerializer(serializers.ModelSerializer):
-    """
-    Serializer for PhysicalVehicleReservation.
-
-    :param serializers: The Django REST framework serializers module.
-    :type serializers: module
-    """
-
-    physical_vehicle = PhysicalVehicleSerializer()
-
-    class Meta:
-        """
-        Only the id and physical vehicle are shown since
-        no vehicle reservation specific details are needed
-        (that information is in the parent reservation).
-        """
-
-        model = PhysicalVehicleReservation
-        fields = ["id", "physical_vehicle"]
-
 
 HOLD_MINUTES = int(getattr(settings, "RESERVATION_HOLD_MINUTES", 15))
 
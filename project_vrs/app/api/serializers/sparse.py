@@ -0,0 +1,175 @@
+# api/serializers/sparse.py
+import copy
+
+from django.db.models import Prefetch
+from drf_yasg import openapi
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+SPARSE_QUERY_PARAMETERS = [
+    openapi.Parameter(
+        "fields",
+        openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        description="Comma-separated fields to return; dots reach into nested "
+        "objects, e.g. id,status,vehicles.physical_vehicle.car_plate_number.",
+    ),
+    openapi.Parameter(
+        "expand",
+        openapi.IN_QUERY,
+        type=openapi.TYPE_STRING,
+        description="Nested objects to return in full, e.g. status,vehicles. "
+        "When given, every other nested object is returned as its id(s).",
+    ),
+]
+
+
+def parse_paths(value):
+    """
+    ``"id,vehicles.physical_vehicle"`` -> ``{"id": {}, "vehicles": {"physical_vehicle": {}}}``.
+
+    :param value: the raw query parameter, or None when absent
+    :return: the path tree, or None when the parameter is absent
+    """
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for part in path.split("."):
+            part = part.strip()
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin for ``?fields=`` and ``?expand=`` on read requests.
+
+    - ``fields`` keeps only the listed fields (dotted paths prune nested
+      serializers too); write-only fields are never dropped.
+    - ``expand`` lists the nested serializers to render in full; every other
+      nested serializer is replaced by its primary key(s), or by the field in
+      ``collapsed_fields``. Without ``expand`` everything nested is rendered
+      as before. ``expand=vehicles`` renders vehicles whole,
+      ``expand=vehicles.physical_vehicle`` expands only that branch.
+
+    The parameters are read from the request by the root serializer and
+    handed down to nested ones. Use optimize_queryset() with the same
+    serializer so only the relations actually rendered are joined/prefetched.
+    """
+
+    # name -> read-only field used when the nested serializer is not expanded
+    collapsed_fields = {}
+
+    def _sparse_spec(self):
+        spec = getattr(self, "_sparse", None)
+        if spec is not None:
+            return spec
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        request = self.context.get("request")
+        if parent is not None or request is None or request.method not in SAFE_METHODS:
+            return None, None
+        params = request.query_params
+        return parse_paths(params.get("fields")), parse_paths(params.get("expand"))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._sparse_spec()
+        if only:
+            fields = {
+                name: field
+                for name, field in fields.items()
+                if name in only or field.write_only
+            }
+        for name, field in list(fields.items()):
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if not isinstance(nested, serializers.BaseSerializer):
+                continue
+            if expand is not None and name not in expand:
+                fields[name] = self._collapse(name, field)
+            elif isinstance(nested, SparseFieldsetMixin):
+                nested._sparse = (
+                    (only or {}).get(name) or None,
+                    (expand or {}).get(name) or None,
+                )
+        return fields
+
+    def _collapse(self, name, field):
+        if name in self.collapsed_fields:
+            return copy.deepcopy(self.collapsed_fields[name])
+        return serializers.PrimaryKeyRelatedField(
+            source=field.source if field.source != name else None,
+            many=isinstance(field, serializers.ListSerializer),
+            read_only=True,
+        )
+
+
+def optimize_queryset(queryset, serializer):
+    """
+    Add the select_related / prefetch_related lookups ``serializer`` reads,
+    and only those: forward FK/one-to-one hops of every field source are
+    joined, to-many sources are prefetched (with the nested serializer's own
+    lookups applied to the prefetch queryset).
+
+    :param queryset: the base queryset of ``serializer``'s model
+    :param serializer: a (sparse) serializer instance, bound to the request context
+    :return: the queryset with the lookups added
+    """
+    select, prefetch = _related_lookups(serializer, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def _relation(model, attr):
+    for field in model._meta.get_fields():
+        if not field.is_relation:
+            continue
+        accessor = field.name if field.concrete else field.get_accessor_name()
+        if accessor == attr:
+            return field
+    return None
+
+
+def _related_lookups(serializer, model):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    select, prefetch = set(), {}
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        attrs = list(field.source_attrs)
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            attrs = attrs[:-1]  # the pk is read from the FK column
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        path, current = [], model
+        for attr in attrs:
+            rel = _relation(current, attr)
+            if rel is None:
+                break
+            if rel.one_to_many or rel.many_to_many:
+                inner = rel.related_model._default_manager.all()
+                if attr == attrs[-1] and isinstance(nested, serializers.ModelSerializer):
+                    inner = optimize_queryset(inner, nested)
+                lookup = "__".join([*path, attr])
+                prefetch.setdefault(lookup, Prefetch(lookup, queryset=inner))
+                break
+            path.append(attr)
+            current = rel.related_model
+        else:
+            if path and isinstance(nested, serializers.ModelSerializer):
+                base = "__".join(path)
+                sub_select, sub_prefetch = _related_lookups(nested, current)
+                select.update(f"{base}__{s}" for s in sub_select)
+                for p in sub_prefetch:
+                    lookup = f"{base}__{p.prefetch_through}"
+                    prefetch.setdefault(lookup, Prefetch(lookup, queryset=p.queryset))
+        if path:
+            select.add("__".join(path))
+    return sorted(select), list(prefetch.values())
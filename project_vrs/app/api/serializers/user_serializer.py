@@ -37,3 +37,34 @@ class AdminUserProfilesSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = "__all__"
+        extra_kwargs = {"password": {"write_only": True}}
+
+
+class AdminUserListSerializer(serializers.ModelSerializer):
+    """
+    Flat row for the admin user list: no password, groups or permissions,
+    role name from the joined role (select_related("role_id")).
+
+    :param serializers: The Django REST framework serializers module.
+    :type serializers: module
+    """
+
+    role_name = serializers.CharField(source="role_id.role_name", read_only=True)
+
+    class Meta:
+        model = User
+        fields = [
+            "id",
+            "username",
+            "email",
+            "first_name",
+            "last_name",
+            "phone_number",
+            "role_id",
+            "role_name",
+            "is_active",
+            "is_blocked",
+            "created_at",
+            "last_login",
+        ]
+        read_only_fields = fields
@@ -1,8 +1,11 @@
 from rest_framework import serializers
 from ..models import EngineType, Model, Vehicle, VehicleType, Brand, PhysicalVehicle, Location
+from ..utils.fleet_import import normalize_plate
+from .fields import PrefetchedPrimaryKeyRelatedField
+from .sparse import SparseFieldsetMixin
 
 
-class VehicleSerializer(serializers.ModelSerializer):
+class VehicleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # READABLE names (read-only)
     vehicle_type_name = serializers.SlugRelatedField(
         source="vehicle_type", slug_field="vehicle_type", read_only=True
@@ -15,13 +18,13 @@ class VehicleSerializer(serializers.ModelSerializer):
     )
 
     # WRITABLE IDs (write-only) – keep only if you create/update via this serializer
-    vehicle_type_id = serializers.PrimaryKeyRelatedField(
+    vehicle_type_id = PrefetchedPrimaryKeyRelatedField(
         source="vehicle_type", queryset=VehicleType.objects.all(), write_only=True
     )
-    engine_type_id = serializers.PrimaryKeyRelatedField(
+    engine_type_id = PrefetchedPrimaryKeyRelatedField(
         source="engine_type", queryset=EngineType.objects.all(), write_only=True
     )
-    model_id = serializers.PrimaryKeyRelatedField(
+    model_id = PrefetchedPrimaryKeyRelatedField(
         source="model", queryset=Model.objects.all(), write_only=True
     )
 
@@ -185,7 +188,7 @@ class ModelSerializer(serializers.ModelSerializer):
     )
 
     # WRITE-ONLY field accepting the brand by its ID to set 'brand' FK
-    brand_id = serializers.PrimaryKeyRelatedField(
+    brand_id = PrefetchedPrimaryKeyRelatedField(
         source="brand",
         queryset=Brand.objects.all(),
         write_only=True,
@@ -236,7 +239,7 @@ PhysicalVehicle serializer.
 """
 
 
-class PhysicalVehicleSerializer(serializers.ModelSerializer):
+class PhysicalVehicleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # READ: show the model name from related Vehicle -> Model
     vehicle_model_name = serializers.SlugRelatedField(
         source="vehicle.model",
@@ -250,16 +253,22 @@ class PhysicalVehicleSerializer(serializers.ModelSerializer):
     )
 
     # WRITE: accept the owning Vehicle by id
-    vehicle_id = serializers.PrimaryKeyRelatedField(
+    vehicle_id = PrefetchedPrimaryKeyRelatedField(
         source="vehicle", queryset=Vehicle.objects.all(), write_only=True
     )
 
+    # WRITE: the location the unit is stationed at (required by the model)
+    location_id = PrefetchedPrimaryKeyRelatedField(
+        source="location", queryset=Location.objects.all(), write_only=True
+    )
+
     class Meta:
         model = PhysicalVehicle
         fields = [
             "id",
             "car_plate_number",
             "vehicle_id",
+            "location_id",
             "vehicle_model_name",
             "vehicle_brand_name",
         ]
@@ -276,7 +285,7 @@ class PhysicalVehicleSerializer(serializers.ModelSerializer):
         - Trim spaces, uppercase.
         - Ensure non-empty.
         """
-        cleaned = value.strip().upper()
+        cleaned = normalize_plate(value)
         if not cleaned:
             raise serializers.ValidationError("Car plate cannot be empty.")
         return cleaned
@@ -295,3 +304,20 @@ class LocationSerializer(serializers.ModelSerializer):
 
         model = Location
         fields = ['location_name', 'address']
+
+
+class FleetImportRowErrorSerializer(serializers.Serializer):
+    row = serializers.IntegerField(allow_null=True)
+    errors = serializers.DictField(child=serializers.ListField(child=serializers.CharField()))
+
+
+class FleetImportReportSerializer(serializers.Serializer):
+    """
+    Result of a bulk fleet import (see api/utils/fleet_import.py).
+    """
+
+    total = serializers.IntegerField()
+    valid = serializers.IntegerField()
+    created = serializers.IntegerField()
+    dry_run = serializers.BooleanField()
+    errors = FleetImportRowErrorSerializer(many=True)
@@ -1,43 +1,212 @@
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.db import transaction
 
-from .models import Reservation
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import (
+    Model,
+    PhysicalVehicleReservation,
+    Reservation,
+    ReservationStatus,
+    User,
+    Vehicle,
+)
+from .outbox.dedup import claim_many, transition_key
+from .outbox.events import enqueue_pushes, enqueue_task, enqueue_tasks
+from .utils.broadcast import broadcast_per_user
+from .utils.availability import reservation_availability_pushes
+from .utils.field_tracker import tracked_fields_changed
+from .utils.revocation import (
+    refresh_revoked_users,
+    revoke_deleted_user,
+    revoke_issued_tokens,
+)
 from .email_sender.tasks import (
     send_reservation_created_email,
     send_reservation_status_changed_email,
 )
+from .reporting.tasks import recompute_kpi_rollup_days
 
 
-@receiver(pre_save, sender=Reservation)
-def _remember_old_status(sender, instance: Reservation, **kwargs):
+@receiver(post_save, sender=Reservation)
+def _enqueue_created_notification(sender, instance: Reservation, created: bool, **kwargs):
     """
-    Store the old status PK on the instance before saving (for change comparison)
+    Queue the 'created' email in the outbox, in the same transaction as the save
     """
-    if not instance.pk:
-        instance._old_status_id = None
+    if not created:
         return
-    try:
-        old = sender.objects.only("status").get(pk=instance.pk)
-        instance._old_status_id = old.status_id
-    except sender.DoesNotExist:
-        instance._old_status_id = None
+    enqueue_task(send_reservation_created_email, instance.id)
 
 
-@receiver(post_save, sender=Reservation)
-def _enqueue_notifications(sender, instance: Reservation, created: bool, **kwargs):
+@receiver(tracked_fields_changed, sender=Reservation)
+def _notify_status_transition(
+    sender, pk, changes: dict, instance=None, batch=None, **kwargs
+):
+    """
+    The single producer of status-change notifications. Fired by
+    Reservation.save() and Reservation.objects.update(); each transition
+    (reservation, from, to, version) yields one email and one push, and a
+    repeat of the same transition is suppressed and counted (see
+    transition_key() for what counts as the same). A batch update is handled
+    as a whole on its first event, with a constant number of queries.
+    """
+    if "status_id" not in changes:
+        return
+    if batch is None:
+        old_status_id, new_status_id = changes["status_id"]
+        transitions = [
+            (pk, old_status_id, new_status_id, instance.user_id, instance.version)
+        ]
+    elif batch.first("status_notify"):
+        rows = batch.rows("user_id", "version")
+        transitions = [
+            (rpk, *row_changes["status_id"], rows[rpk]["user_id"], rows[rpk]["version"])
+            for rpk, row_changes in batch.changes.items()
+            if "status_id" in row_changes and rpk in rows
+        ]
+    else:
+        return
+    _notify_transitions(transitions)
+
+
+def _notify_transitions(transitions):
     """
-    After save, enqueue tasks AFTER the transaction commits
+    :param transitions: ``(reservation_id, from_status_id, to_status_id, user_id, version)``
     """
+    keyed = {transition_key(t[0], t[1], t[2], t[4]): t for t in transitions}
+    emails = claim_many(keyed, "status_email")
+    pushes = claim_many(keyed, "status_push")
 
-    def on_commit():
-        if created:
-            send_reservation_created_email.delay(instance.id)
-            return
-        old_status_id = getattr(instance, "_old_status_id", None)
-        if old_status_id != instance.status_id:
-            send_reservation_status_changed_email.delay(
-                instance.id, old_status_id, instance.status_id
+    enqueue_tasks(
+        send_reservation_status_changed_email,
+        [keyed[key][:3] for key in keyed if key in emails],
+    )
+    if not pushes:
+        return
+    status_ids = {sid for t in transitions for sid in t[1:3]}
+    labels = dict(
+        ReservationStatus.objects.filter(id__in=status_ids).values_list("id", "status")
+    )
+    messages = []
+    for key in keyed:
+        if key not in pushes:
+            continue
+        pk, old_status_id, new_status_id, user_id, version = keyed[key]
+        new_label = (labels.get(new_status_id) or "").lower()
+        messages.append(
+            (
+                user_id,
+                {
+                    "action": "cancelled" if new_label == "cancelled" else "status_changed",
+                    "reservation_id": pk,
+                    "from_status": labels.get(old_status_id),
+                    "to_status": labels.get(new_status_id),
+                    "version": version,
+                    "message": f"Reservation #{pk} {new_label.replace('_', ' ')}",
+                },
             )
+        )
+    broadcast_per_user(messages, roles=["managers"])
+
+
+@receiver(post_delete, sender=Reservation)
+def _enqueue_rollup_rebuild(sender, instance: Reservation, **kwargs):
+    """
+    The KPI rollups only see changed rows (updated_at watermark); a deleted
+    reservation must have its booking day rebuilt explicitly. Queued in the
+    outbox, so only once the delete is committed; a relay batch rebuilds each
+    day once however many reservations of it went.
+    """
+    day = timezone.localdate(instance.created_at)
+    enqueue_task(recompute_kpi_rollup_days, [day.isoformat()])
+
+
+@receiver(post_save, sender=PhysicalVehicleReservation)
+def _enqueue_unit_booked(sender, instance: PhysicalVehicleReservation, created: bool, **kwargs):
+    """
+    A unit was attached to a reservation: tell live availability subscribers of
+    that location and window (uses the already loaded unit/reservation).
+    """
+    if not created:
+        return
+    unit, res = instance.physical_vehicle, instance.reservation
+    enqueue_pushes(
+        reservation_availability_pushes(
+            [(unit.location_id, unit.vehicle_id, res.start_date, res.end_date)]
+        )
+    )
+
 
-    transaction.on_commit(on_commit)
+@receiver(tracked_fields_changed, sender=Reservation)
+def _enqueue_availability_change(sender, pk, changes: dict, batch=None, **kwargs):
+    """
+    A status change can block or release the reservation's units; one query
+    (per save, or per batch update) finds their locations, subscribers recount
+    and get deltas only if any.
+    """
+    if "status_id" not in changes:
+        return
+    if batch is None:
+        reservation_ids = [pk]
+    elif batch.first("availability"):
+        reservation_ids = [
+            rpk for rpk, row_changes in batch.changes.items() if "status_id" in row_changes
+        ]
+    else:
+        return
+    rows = PhysicalVehicleReservation.objects.filter(
+        reservation_id__in=reservation_ids
+    ).values_list(
+        "physical_vehicle__location_id",
+        "physical_vehicle__vehicle_id",
+        "reservation__start_date",
+        "reservation__end_date",
+    )
+    enqueue_pushes(reservation_availability_pushes(rows))
+
+
+@receiver(tracked_fields_changed, sender=User)
+def _refresh_revoked_users(sender, pk, changes: dict, **kwargs):
+    """
+    A user was blocked/unblocked or (de)activated: rebuild the set of users whose
+    tokens are refused by the claim-based auth, once the change is committed.
+    A role change refuses the tokens issued so far, which carry the old role.
+    """
+    if "role_id_id" in changes:
+        transaction.on_commit(lambda: revoke_issued_tokens(pk))
+    else:
+        transaction.on_commit(refresh_revoked_users)
+
+
+@receiver(post_delete, sender=User)
+def _revoke_deleted_user(sender, instance: User, **kwargs):
+    """
+    A deleted user's access tokens would otherwise stay valid until they
+    expire; put the id in the revoked set once the delete is committed.
+    """
+    user_id = instance.pk
+    transaction.on_commit(lambda: revoke_deleted_user(user_id))
+
+
+@receiver(tracked_fields_changed, sender=Model)
+def _sync_vehicle_brand_from_model(sender, pk, changes: dict, **kwargs):
+    """
+    A model moved to another brand: its vehicles' denormalized brand follows.
+    """
+    if "brand_id" in changes:
+        Vehicle.objects.filter(model_id=pk).update(brand_id=changes["brand_id"][1])
+
+
+@receiver(tracked_fields_changed, sender=Vehicle)
+def _sync_vehicle_brand(sender, pk, changes: dict, instance=None, **kwargs):
+    """
+    Vehicle.objects.update(model=...) bypasses Vehicle.save(), which keeps the
+    brand in line; copy it from the new model here.
+    """
+    if instance is not None or "model_id" not in changes:
+        return
+    Vehicle.objects.filter(pk=pk).update(
+        brand_id=Subquery(Model.objects.filter(pk=OuterRef("model_id")).values("brand_id")[:1])
+    )
@@ -1,3 +1,688 @@
-from django.test import TestCase
+import datetime
+import threading
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from celery import current_app
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .consumers import AvailabilityConsumer
+from .email_sender.tasks import send_reservation_status_changed_email
+from .management.commands.explain_vehicle_filters import (
+    COMBINATIONS,
+    disable_seqscan,
+    plan_indexes,
+)
+from .models import (
+    Brand,
+    EngineType,
+    Location,
+    Model,
+    Notification,
+    OutboxEvent,
+    PhysicalVehicle,
+    PhysicalVehicleReservation,
+    Reservation,
+    ReservationDailyRollup,
+    ReservationStatus,
+    Role,
+    User,
+    Vehicle,
+    VehicleType,
+)
+from .outbox.events import enqueue_push, enqueue_task
+from .outbox.tasks import MAX_ATTEMPTS, relay_batch
+from .reporting import tasks as reporting_tasks
+from .reporting.rollups import update_rollups
+from .serializers.login_serializer import CustomTokenObtainPairSerializer
+from .utils import replay, revocation
+from .utils.field_tracker import tracked_fields_changed
+
+# The shared cache, channel layer and replay buffer are Redis in production;
+# the behaviour under test doesn't depend on it, so the tests run in-process
+TEST_SERVICES = override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    WS_REPLAY_REDIS_URL="",
+)
+
+
+def make_user(username, role_name="user", **extra):
+    return User.objects.create_user(
+        username,
+        f"{username}@example.com",
+        "pass-1234",
+        date_of_birth="1990-01-01",
+        role_id=Role.objects.get(role_name=role_name),
+        **extra,
+    )
+
+
+def make_reservation(user, status_name="active", **extra):
+    location = Location.objects.first()
+    start = timezone.now() + datetime.timedelta(days=1)
+    return Reservation.objects.create(
+        user=user,
+        status=ReservationStatus.objects.get(status=status_name),
+        total_price="100.00",
+        start_date=start,
+        end_date=start + datetime.timedelta(days=2),
+        pickup_location=location,
+        dropoff_location=location,
+        **extra,
+    )
+
+
+def make_model(model_name, brand):
+    return Model.objects.create(model_name=model_name, brand=brand)
+
+
+def make_vehicle(model):
+    return Vehicle.objects.create(
+        amount_seats=4,
+        price_per_day="50.00",
+        vehicle_type=VehicleType.objects.first(),
+        engine_type=EngineType.objects.first(),
+        model=model,
+        brand=model.brand,
+    )
+
+
+@TEST_SERVICES
+class TokenRevocationTests(TestCase):
+    """Claim-based auth refuses tokens through the revoked-user map."""
+
+    def setUp(self):
+        cache.clear()
+        revocation._local["expires"] = 0.0
+        self.client = APIClient()
+
+    def issue(self, user, minutes_ago=0):
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
+        access = refresh.access_token
+        if minutes_ago:
+            issued = timezone.now() - datetime.timedelta(minutes=minutes_ago)
+            access.set_iat(at_time=issued)
+        return str(access), str(refresh)
+
+    def get(self, url, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return self.client.get(url)
+
+    def test_blocked_user_is_refused_until_unblocked(self):
+        user = make_user("blocked")
+        access, _ = self.issue(user)
+        self.assertEqual(self.get("/api/user_profile/", access).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_blocked = True
+            user.save()
+        self.assertEqual(self.get("/api/user_profile/", access).status_code, 401)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=user.pk).update(is_blocked=False)
+        self.assertEqual(self.get("/api/user_profile/", access).status_code, 200)
+
+    def test_deleted_user_is_refused_even_without_the_shared_map(self):
+        user = make_user("deleted")
+        access, _ = self.issue(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.delete()
+        self.assertEqual(self.get("/api/user_profile/", access).status_code, 401)
+
+        # Shared map lost: the missing row still yields 401, not a 500
+        cache.clear()
+        revocation._local["expires"] = 0.0
+        revocation._local["cutoffs"] = {}
+        self.assertEqual(self.get("/api/user_profile/", access).status_code, 401)
+
+    def test_role_change_revokes_tokens_with_the_old_role(self):
+        admin = make_user("demoted", role_name="admin")
+        access, refresh = self.issue(admin, minutes_ago=1)
+        self.assertEqual(self.get("/api/user_management/", access).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            admin.role_id = Role.objects.get(role_name="user")
+            admin.save()
+        self.assertEqual(self.get("/api/user_management/", access).status_code, 401)
+
+        # A refresh re-reads the role: the new token is accepted, as a plain user
+        response = self.client.post(
+            "/api/auth/refresh/", {"refresh": refresh}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        new_access = response.json()["access"]
+        self.assertEqual(self.get("/api/user_management/", new_access).status_code, 403)
+        self.assertEqual(self.get("/api/user_profile/", new_access).status_code, 200)
+
+    def test_cutoff_refuses_only_tokens_issued_before_it(self):
+        user = make_user("cutoff")
+        now = timezone.now().timestamp()
+        self.assertFalse(revocation.is_revoked(user.id, now - 60))
+
+        revocation.revoke_issued_tokens(user.id)
+        self.assertTrue(revocation.is_revoked(user.id, now - 60))
+        self.assertTrue(revocation.is_revoked(user.id, None))  # no "iat"
+        self.assertFalse(revocation.is_revoked(user.id, now + 60))
+        self.assertFalse(revocation.is_revoked(make_user("other").id, now - 60))
+
+        # Another process rebuilds the map from the shared cache
+        revocation._local["expires"] = 0.0
+        revocation._local["cutoffs"] = {}
+        self.assertTrue(revocation.is_revoked(user.id, now - 60))
+
+    def test_refresh_for_deleted_user_is_refused(self):
+        user = make_user("gone")
+        _, refresh = self.issue(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.delete()
+        response = self.client.post(
+            "/api/auth/refresh/", {"refresh": refresh}, format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+@TEST_SERVICES
+class AvailabilityFilterValidationTests(TestCase):
+    """Bad search filters are a client error, never an exception."""
+
+    window = {"start": "2030-01-01T10:00:00Z", "end": "2030-01-02T10:00:00Z"}
+
+    def test_rest_list_rejects_non_numeric_price(self):
+        response = APIClient().get(
+            "/api/public/vehicles/available/", {**self.window, "price_min": "abc"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("price_min", response.json()["detail"])
+
+    async def test_subscribe_with_bad_filter_keeps_the_socket(self):
+        communicator = WebsocketCommunicator(
+            AvailabilityConsumer.as_asgi(), "/ws/availability/"
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        for bad in ({"price_min": "abc"}, {"price_max": "NaN"}, {"seats_min": "x"}):
+            await communicator.send_json_to(
+                {"action": "subscribe", "id": "s1", **self.window, **bad}
+            )
+            reply = await communicator.receive_json_from()
+            self.assertEqual(reply["action"], "error")
+            self.assertEqual(reply["id"], "s1")
+        await communicator.send_json_to({"action": "unsubscribe", "id": "s1"})
+        self.assertTrue(await communicator.receive_nothing())
+        await communicator.disconnect()
+
+
+@TEST_SERVICES
+class StatusNotificationTests(TestCase):
+    """One email and one push per status transition, batched for update()."""
+
+    def setUp(self):
+        self.user = make_user("notified")
+        self.cancelled = ReservationStatus.objects.get(status="cancelled")
+
+    def status_emails(self):
+        return OutboxEvent.objects.filter(
+            kind=OutboxEvent.KIND_TASK, topic=send_reservation_status_changed_email.name
+        )
+
+    def test_batch_update_costs_the_same_queries_for_any_batch_size(self):
+        reservations = [make_reservation(self.user) for _ in range(10)]
+        counts = []
+        for chunk in (reservations[:2], reservations[2:]):
+            with CaptureQueriesContext(connection) as queries:
+                Reservation.objects.filter(pk__in=[r.pk for r in chunk]).update(
+                    status=self.cancelled
+                )
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+        self.assertEqual(self.status_emails().count(), 10)
+        self.assertEqual(
+            Notification.objects.filter(recipient=self.user, type="cancelled").count(), 10
+        )
+        versions = Reservation.objects.filter(
+            pk__in=[r.pk for r in reservations]
+        ).values_list("version", flat=True)
+        self.assertEqual(set(versions), {1})
+
+    def test_stale_save_racing_a_batch_update_notifies_once(self):
+        reservation = make_reservation(self.user)
+        stale = Reservation.objects.get(pk=reservation.pk)
+        Reservation.objects.filter(pk=reservation.pk).update(status=self.cancelled)
+
+        stale.status = self.cancelled
+        stale.save()
+        self.assertEqual(self.status_emails().count(), 1)
+        self.assertEqual(
+            Notification.objects.filter(recipient=self.user, type="cancelled").count(), 1
+        )
+
+    def test_a_later_transition_is_notified_again(self):
+        reservation = make_reservation(self.user)
+        active = reservation.status
+        for status in (self.cancelled, active, self.cancelled):
+            reservation.status = status
+            reservation.save()
+        self.assertEqual(self.status_emails().count(), 3)
+
+
+@TEST_SERVICES
+class RollupDeletionTests(TestCase):
+    """Deleted reservations leave the KPI rollups through a queued rebuild."""
+
+    def setUp(self):
+        self.user = make_user("rollup")
+
+    def bookings(self):
+        return sum(ReservationDailyRollup.objects.values_list("bookings", flat=True))
+
+    def run_queued_rebuilds(self):
+        events = OutboxEvent.objects.filter(
+            kind=OutboxEvent.KIND_TASK,
+            topic=reporting_tasks.recompute_kpi_rollup_days.name,
+            published_at__isnull=True,
+        )
+        # what the relay sends for a batch of these events
+        reporting_tasks.recompute_kpi_rollup_days_batch(
+            [{"task": ev.topic, "args": ev.payload["args"], "kwargs": {}} for ev in events]
+        )
+        return len(events)
+
+    def test_deleting_reservations_rebuilds_their_days(self):
+        kept, *deleted = [make_reservation(self.user) for _ in range(3)]
+        update_rollups(now=timezone.now() + datetime.timedelta(hours=1), full=True)
+        total = self.bookings()
+        self.assertGreaterEqual(total, 3)
+
+        Reservation.objects.filter(pk__in=[r.pk for r in deleted]).delete()
+        self.assertEqual(self.bookings(), total)  # the watermark can't see it
+        self.assertEqual(self.run_queued_rebuilds(), 2)
+        self.assertEqual(self.bookings(), total - 2)
+        self.assertTrue(Reservation.objects.filter(pk=kept.pk).exists())
+
+    def test_a_single_day_task_rebuilds_that_day(self):
+        reservation = make_reservation(self.user)
+        update_rollups(now=timezone.now() + datetime.timedelta(hours=1), full=True)
+        day = timezone.localdate(reservation.created_at)
+        before = sum(
+            ReservationDailyRollup.objects.filter(day=day).values_list("bookings", flat=True)
+        )
+        reservation.delete()
+        reporting_tasks.recompute_kpi_rollup_days([day.isoformat()])
+        after = sum(
+            ReservationDailyRollup.objects.filter(day=day).values_list("bookings", flat=True)
+        )
+        self.assertEqual(after, before - 1)
+
+
+class CatalogIndexTests(TestCase):
+    """Every catalog filter combination is served by its index."""
+
+    def test_each_filter_combination_uses_its_index(self):
+        if connection.vendor == "postgresql":
+            disable_seqscan()  # test tables are too small for the planner
+        for filterset, queryset, query, expected in COMBINATIONS:
+            with self.subTest(model=queryset.model.__name__, query=query):
+                indexes, plan = plan_indexes(filterset, queryset, query)
+                self.assertTrue(indexes, f"no index used:\n{plan}")
+                if expected:
+                    self.assertIn(expected, indexes, plan)
+
+
+@TEST_SERVICES
+class TrackedFieldsTests(TestCase):
+    """tracked_fields_changed fires once per real change, for save() and update()."""
+
+    def setUp(self):
+        self.old_brand = Brand.objects.create(brand_name="Old")
+        self.new_brand = Brand.objects.create(brand_name="New")
+        self.events = []
+        tracked_fields_changed.connect(self.record, sender=Model)
+        self.addCleanup(tracked_fields_changed.disconnect, self.record, sender=Model)
+
+    def record(self, sender, pk, changes, instance=None, batch=None, **kwargs):
+        self.events.append((pk, changes, instance, batch))
+
+    def test_save_sends_the_changed_fields_once(self):
+        model = make_model("Tracked", self.old_brand)
+        self.assertEqual(self.events, [])  # a create is not a change
+
+        model = Model.objects.get(pk=model.pk)
+        model.brand = self.new_brand
+        model.save()
+        model.save()
+        self.assertEqual(len(self.events), 1)
+        pk, changes, instance, batch = self.events[0]
+        self.assertEqual(changes, {"brand_id": (self.old_brand.pk, self.new_brand.pk)})
+        self.assertIs(instance, model)
+        self.assertIsNone(batch)
+
+    def test_save_with_other_update_fields_keeps_the_change_pending(self):
+        model = make_model("Pending", self.old_brand)
+        model.brand = self.new_brand
+        model.model_name = "Renamed"
+        model.save(update_fields=["model_name"])
+        self.assertEqual(self.events, [])
+
+        model.save(update_fields=["brand"])
+        self.assertEqual(
+            [changes for _, changes, _, _ in self.events],
+            [{"brand_id": (self.old_brand.pk, self.new_brand.pk)}],
+        )
+
+    def test_update_sends_one_event_per_changed_row(self):
+        moved = [make_model(f"Moved {i}", self.old_brand) for i in range(3)]
+        kept = make_model("Kept", self.new_brand)
+        vehicle = make_vehicle(moved[0])
+
+        rows = Model.objects.filter(pk__in=[m.pk for m in (*moved, kept)]).update(
+            brand=self.new_brand
+        )
+        self.assertEqual(rows, 4)
+        self.assertEqual({pk for pk, _, _, _ in self.events}, {m.pk for m in moved})
+        for _, changes, instance, batch in self.events:
+            self.assertEqual(
+                changes, {"brand_id": (self.old_brand.pk, self.new_brand.pk)}
+            )
+            self.assertIsNone(instance)
+            self.assertIs(batch, self.events[0][3])
+        self.assertEqual(set(self.events[0][3].changes), {m.pk for m in moved})
+        # the denormalized brand followed through the signal
+        vehicle.refresh_from_db()
+        self.assertEqual(vehicle.brand_id, self.new_brand.pk)
+
+    def test_update_without_tracked_fields_sends_nothing(self):
+        model = make_model("Untracked", self.old_brand)
+        Model.objects.filter(pk=model.pk).update(model_name="Still untracked")
+        Model.objects.filter(pk=model.pk).update(brand=self.old_brand)
+        self.assertEqual(self.events, [])
+
+    def test_refresh_from_db_takes_the_stored_values_as_baseline(self):
+        model = make_model("Refreshed", self.old_brand)
+        Model.objects.filter(pk=model.pk).update(brand=self.new_brand)
+        self.assertEqual(len(self.events), 1)
+
+        model.refresh_from_db()
+        model.save()
+        self.assertEqual(len(self.events), 1)  # not re-sent as a change
+
+
+@TEST_SERVICES
+class OutboxRelayTests(TestCase):
+    """The relay publishes every event at least once, with a stable dedup id."""
+
+    task_name = "api.tests.outbox_probe"
+
+    def setUp(self):
+        replay._buffer = None
+        OutboxEvent.objects.all().delete()
+
+    def relay(self, **kwargs):
+        with mock.patch.object(current_app, "send_task", **kwargs) as send_task:
+            taken = relay_batch()
+        return taken, send_task
+
+    def test_task_event_is_published_with_its_dedup_id(self):
+        event = enqueue_task(self.task_name, 1, flag=True)
+        taken, send_task = self.relay()
+        self.assertEqual(taken, 1)
+        send_task.assert_called_once_with(
+            self.task_name, args=[1], kwargs={"flag": True}, task_id=str(event.dedup_id)
+        )
+        event.refresh_from_db()
+        self.assertIsNotNone(event.published_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertEqual(self.relay()[0], 0)  # published events are not taken again
+
+    def test_failed_publish_is_retried_with_the_same_task_id(self):
+        event = enqueue_task(self.task_name)
+        other = enqueue_task(self.task_name)
+
+        def broker_down_for_first(name, task_id, **kwargs):
+            if task_id == str(event.dedup_id):
+                raise ConnectionError("broker down")
+
+        self.relay(side_effect=broker_down_for_first)
+        event.refresh_from_db()
+        other.refresh_from_db()
+        self.assertIsNone(event.published_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertIn("broker down", event.last_error)
+        self.assertIsNotNone(other.published_at)  # one failure doesn't hold the batch
+
+        taken, send_task = self.relay()
+        self.assertEqual(taken, 1)
+        self.assertEqual(send_task.call_args.kwargs["task_id"], str(event.dedup_id))
+        event.refresh_from_db()
+        self.assertIsNotNone(event.published_at)
+        self.assertEqual(event.attempts, 2)
+
+    def test_events_past_max_attempts_are_left_alone(self):
+        event = enqueue_task(self.task_name)
+        OutboxEvent.objects.filter(pk=event.pk).update(attempts=MAX_ATTEMPTS)
+        taken, send_task = self.relay()
+        self.assertEqual(taken, 0)
+        send_task.assert_not_called()
+
+    def test_queryset_limits_the_events_taken(self):
+        enqueue_task(self.task_name)
+        event = enqueue_task(self.task_name)
+        with mock.patch.object(current_app, "send_task"):
+            taken = relay_batch(queryset=OutboxEvent.objects.filter(pk=event.pk))
+        self.assertEqual(taken, 1)
+        self.assertEqual(
+            list(
+                OutboxEvent.objects.filter(published_at__isnull=False).values_list(
+                    "pk", flat=True
+                )
+            ),
+            [event.pk],
+        )
+
+    def test_push_reaches_its_group_with_event_id_and_seq(self):
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        async_to_sync(layer.group_add)("outbox_probe", channel)
+        event = enqueue_push(["outbox_probe"], {"text": "hello"})
+
+        self.assertEqual(relay_batch(), 1)
+        received = async_to_sync(layer.receive)(channel)
+        self.assertEqual(received["type"], "notify")
+        self.assertEqual(received["message"]["text"], "hello")
+        self.assertEqual(received["message"]["event_id"], str(event.dedup_id))
+        self.assertIn("seq", received["message"])
+
+
+@skipUnless(connection.vendor == "postgresql", "SKIP LOCKED needs PostgreSQL")
+@TEST_SERVICES
+class OutboxRelayLockingTests(TransactionTestCase):
+    """A relay skips the rows another relay holds instead of waiting for them."""
+
+    def test_rows_locked_elsewhere_are_skipped(self):
+        OutboxEvent.objects.all().delete()
+        held = enqueue_task(OutboxRelayTests.task_name)
+        free = enqueue_task(OutboxRelayTests.task_name)
+        locked, release = threading.Event(), threading.Event()
+
+        def other_relay():
+            try:
+                with transaction.atomic():
+                    list(OutboxEvent.objects.select_for_update().filter(pk=held.pk))
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=other_relay)
+        thread.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            with mock.patch.object(current_app, "send_task"):
+                self.assertEqual(relay_batch(), 1)
+        finally:
+            release.set()
+            thread.join()
+        published = OutboxEvent.objects.filter(published_at__isnull=False)
+        self.assertEqual(list(published.values_list("pk", flat=True)), [free.pk])
+
+
+@TEST_SERVICES
+class BulkEndpointTests(TestCase):
+    """``/<resource>/bulk/`` writes all items or none and reports each one."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(make_user("bulk-admin", role_name="admin"))
+        self.brand = Brand.objects.create(brand_name="Bulk")
+        self.other_brand = Brand.objects.create(brand_name="Other bulk")
+
+    def statuses(self, response):
+        return [result["status"] for result in response.json()["results"]]
+
+    def test_create_with_one_invalid_item_writes_nothing(self):
+        response = self.client.post(
+            "/api/brands/bulk/", [{"brand_name": "Fine"}, {"brand_name": "  "}], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.statuses(response), ["valid", "error"])
+        self.assertIn("brand_name", response.json()["results"][1]["errors"])
+        self.assertEqual(response.json()["written"], 0)
+        self.assertFalse(Brand.objects.filter(brand_name="Fine").exists())
+
+        response = self.client.post(
+            "/api/brands/bulk/", [{"brand_name": "Fine"}, {"brand_name": "Good"}], format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.statuses(response), ["created", "created"])
+        ids = [result["id"] for result in response.json()["results"]]
+        self.assertEqual(
+            list(Brand.objects.filter(pk__in=ids).order_by("pk").values_list("brand_name", flat=True)),
+            ["Fine", "Good"],
+        )
+
+    def test_items_colliding_within_the_batch_are_rejected(self):
+        response = self.client.post(
+            "/api/models/bulk/",
+            [
+                {"model_name": "Twin", "brand_id": self.brand.pk},
+                {"model_name": " Twin ", "brand_id": self.brand.pk},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.statuses(response), ["valid", "error"])
+        self.assertEqual(
+            response.json()["results"][1]["errors"], {"model_name": ["Duplicate of item 0."]}
+        )
+        self.assertFalse(Model.objects.filter(model_name="Twin").exists())
+
+    def test_update_reports_unknown_and_repeated_ids(self):
+        model = make_model("Patched", self.brand)
+        response = self.client.patch(
+            "/api/models/bulk/",
+            [
+                {"id": model.pk, "model_name": "First"},
+                {"id": model.pk, "model_name": "Second"},
+                {"id": 10**9, "model_name": "Missing"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.statuses(response), ["valid", "error", "error"])
+        model.refresh_from_db()
+        self.assertEqual(model.model_name, "Patched")
+
+    def test_update_sends_tracked_changes(self):
+        model = make_model("Moving", self.brand)
+        vehicle = make_vehicle(model)
+        response = self.client.patch(
+            "/api/models/bulk/", [{"id": model.pk, "brand_id": self.other_brand.pk}], format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.statuses(response), ["updated"])
+        vehicle.refresh_from_db()
+        self.assertEqual(vehicle.brand_id, self.other_brand.pk)
+
+    def test_delete_refuses_the_batch_if_one_row_is_still_referenced(self):
+        model = make_model("Deleted", self.brand)
+        free, referenced = make_vehicle(model), make_vehicle(model)
+        PhysicalVehicle.objects.create(
+            car_plate_number="BULK 1", vehicle=referenced, location=Location.objects.first()
+        )
+        response = self.client.delete(
+            "/api/vehicles/bulk/", {"ids": [free.pk, referenced.pk, 10**9]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.statuses(response), ["valid", "error", "not_found"])
+        self.assertEqual(Vehicle.objects.filter(pk__in=[free.pk, referenced.pk]).count(), 2)
+
+        response = self.client.delete(
+            "/api/vehicles/bulk/", {"ids": [free.pk, 10**9]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.statuses(response), ["deleted", "not_found"])
+        self.assertEqual(response.json()["written"], 1)
+        self.assertFalse(Vehicle.objects.filter(pk=free.pk).exists())
+
+
+@TEST_SERVICES
+class SparseFieldsTests(TestCase):
+    """``?fields=`` and ``?expand=`` shape the reservation list."""
+
+    def setUp(self):
+        user = make_user("sparse")
+        self.reservation = make_reservation(user)
+        self.vehicle = PhysicalVehicle.objects.first()
+        PhysicalVehicleReservation.objects.create(
+            reservation=self.reservation, physical_vehicle=self.vehicle
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def first(self, **params):
+        response = self.client.get("/api/user_reservations/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"][0]
+
+    def test_without_parameters_everything_is_nested(self):
+        item = self.first()
+        self.assertEqual(item["status"], {"id": self.reservation.status_id, "status": "active"})
+        self.assertEqual(
+            item["vehicles"][0]["physical_vehicle"]["car_plate_number"],
+            self.vehicle.car_plate_number,
+        )
+        self.assertIn("model", item["vehicles"][0]["physical_vehicle"]["vehicle"])
+
+    def test_fields_keeps_only_the_listed_fields(self):
+        item = self.first(fields="id,status")
+        self.assertEqual(set(item), {"id", "status"})
+        self.assertEqual(item["status"]["status"], "active")
+
+    def test_expand_collapses_everything_else_to_ids(self):
+        item = self.first(expand="status")
+        self.assertEqual(item["status"]["status"], "active")
+        self.assertEqual(item["pickup_location"], self.reservation.pickup_location_id)
+        self.assertEqual(item["vehicles"], [self.vehicle.pk])
+
+    def test_dotted_paths_prune_nested_objects(self):
+        item = self.first(
+            fields="id,vehicles.physical_vehicle.car_plate_number",
+            expand="vehicles.physical_vehicle",
+        )
+        self.assertEqual(
+            item,
+            {
+                "id": self.reservation.pk,
+                "vehicles": [
+                    {"physical_vehicle": {"car_plate_number": self.vehicle.car_plate_number}}
+                ],
+            },
+        )
@@ -23,7 +23,15 @@ from .views.public_vehicle_view import (
 from .views.user_view import UserProfileViewSet, AdminUserProfilesViewSet
 from .views.reservation_view import ReservationViewSet
 from .views.notification_view import NotificationViewSet
-from .views.admin_ops_view import AdminKPIView, AdminReservationTransitionView
+from .views.report_view import ReservationExportView, UtilizationReportView
+from .views.admin_ops_view import (
+    AdminKPIView,
+    AdminKPISeriesView,
+    AdminQueuesView,
+    AdminTaskStatsView,
+    AdminDedupStatsView,
+    AdminReservationTransitionView,
+)
 
 
 router = DefaultRouter()
@@ -79,12 +87,26 @@ urlpatterns = [
         "public/vehicles/<int:pk>/", public_vehicle_detail, name="public-vehicle-detail"
     ),
     path("ops/kpis/", AdminKPIView.as_view(), name="ops-kpis"),
+    path("ops/kpis/series/", AdminKPISeriesView.as_view(), name="ops-kpis-series"),
+    path("ops/queues/", AdminQueuesView.as_view(), name="ops-queues"),
+    path("ops/tasks/", AdminTaskStatsView.as_view(), name="ops-tasks"),
+    path("ops/dedup/", AdminDedupStatsView.as_view(), name="ops-dedup"),
+    path(
+        "reports/utilization/",
+        UtilizationReportView.as_view(),
+        name="reports-utilization",
+    ),
     # path(
     #     "payments/mock/<int:reservation_id>/",
     #     MockPaymentView.as_view(),
     #     name="payments-mock",
     # ),
     path("mock_payments/validate/", MockCardValidationView.as_view(), name="mock_payment_validate"),
+    path(
+        "ops/reservations/export/",
+        ReservationExportView.as_view(),
+        name="ops-reservations-export",
+    ),
     path(
         "ops/reservations/<int:pk>/transition/",
         AdminReservationTransitionView.as_view(),
@@ -0,0 +1,244 @@
+# api/utils/availability.py
+"""
+Availability counts shared by the public availability list and the live
+availability WebSocket subscriptions (api/consumers.py).
+
+Live updates are routed through channel-layer groups named
+``avail_<location_id>_<YYYYMMDD>`` (and ``avail_any_<YYYYMMDD>`` for searches
+without a location): a subscription joins the groups of its location and the
+days its window covers, and a reservation event is pushed only to the groups of
+the locations and days it touches.
+"""
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.models import PhysicalVehicle, PhysicalVehicleReservation
+
+# Reservation statuses that take a unit out of the pool (public availability)
+BLOCKING_STATUSES = ["active", "pending"]
+# Longest search window a live subscription may cover (one group per day)
+MAX_SUBSCRIPTION_DAYS = int(getattr(settings, "AVAILABILITY_MAX_SUBSCRIPTION_DAYS", 62))
+ANY_LOCATION = "any"
+
+FILTER_PARAMS = (
+    "brand_id",
+    "model_id",
+    "vehicle_type_id",
+    "engine_type_id",
+    "vehicle_type",
+    "engine_type",
+    "price_min",
+    "price_max",
+    "seats_min",
+    "seats_max",
+)
+
+
+def parse_range(start_str, end_str):
+    """
+    Parse an ISO8601 [start, end) window; naive values use the current timezone.
+
+    :raises ValueError: On missing/invalid values or start >= end.
+    """
+    start = parse_datetime(start_str or "")
+    end = parse_datetime(end_str or "")
+    if not start or not end:
+        raise ValueError(
+            "start and end must be ISO8601 datetimes (e.g. 2025-09-20T10:00:00Z)."
+        )
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start, timezone.get_current_timezone())
+    if timezone.is_naive(end):
+        end = timezone.make_aware(end, timezone.get_current_timezone())
+    if start >= end:
+        raise ValueError("start must be before end")
+    return start, end
+
+
+def available_units(start, end, location_id=None):
+    """
+    Physical units without a blocking reservation overlapping [start, end).
+    """
+    overlapping = PhysicalVehicleReservation.objects.filter(
+        physical_vehicle_id=OuterRef("pk"),
+        reservation__start_date__lt=end,
+        reservation__end_date__gt=start,
+        reservation__status__status__in=BLOCKING_STATUSES,
+    )
+    qs = PhysicalVehicle.objects.all()
+    if location_id:
+        qs = qs.filter(location_id=location_id)
+    return qs.annotate(is_blocked=Exists(overlapping)).filter(is_blocked=False)
+
+
+def _decimal(params, name) -> Decimal:
+    # The ORM would raise ValidationError, which callers don't expect
+    try:
+        value = Decimal(str(params[name]))
+    except InvalidOperation:
+        value = None
+    if value is None or not value.is_finite():
+        raise ValueError(f"{name} must be a decimal number.")
+    return value
+
+
+def apply_vehicle_filters(qs, params):
+    """
+    Apply the public search filters (brand_id, model_id, vehicle_type_id, ...) to a
+    PhysicalVehicle queryset. The id filters use the FK columns (and the
+    denormalized Vehicle.brand); vehicle_type / engine_type match names.
+
+    :raises ValueError: If seats_min / seats_max are not integers or
+        price_min / price_max are not decimal numbers.
+    """
+    if params.get("brand_id"):
+        qs = qs.filter(vehicle__brand_id=params["brand_id"])
+    if params.get("model_id"):
+        qs = qs.filter(vehicle__model_id=params["model_id"])
+    if params.get("vehicle_type_id"):
+        qs = qs.filter(vehicle__vehicle_type_id=params["vehicle_type_id"])
+    if params.get("engine_type_id"):
+        qs = qs.filter(vehicle__engine_type_id=params["engine_type_id"])
+    if params.get("vehicle_type"):
+        qs = qs.filter(vehicle__vehicle_type__vehicle_type__icontains=params["vehicle_type"])
+    if params.get("engine_type"):
+        qs = qs.filter(vehicle__engine_type__engine_type__icontains=params["engine_type"])
+    if params.get("price_min"):
+        qs = qs.filter(vehicle__price_per_day__gte=_decimal(params, "price_min"))
+    if params.get("price_max"):
+        qs = qs.filter(vehicle__price_per_day__lte=_decimal(params, "price_max"))
+    if params.get("seats_min"):
+        try:
+            qs = qs.filter(vehicle__amount_seats__gte=int(params["seats_min"]))
+        except ValueError:
+            raise ValueError("seats_min must be an integer.")
+    if params.get("seats_max"):
+        try:
+            qs = qs.filter(vehicle__amount_seats__lte=int(params["seats_max"]))
+        except ValueError:
+            raise ValueError("seats_max must be an integer.")
+    return qs
+
+
+def day_buckets(start, end) -> list[str]:
+    """
+    Local calendar days (YYYYMMDD) touched by the window [start, end).
+    """
+    first = timezone.localtime(start).date()
+    last = timezone.localtime(end - timedelta(microseconds=1)).date()
+    return [
+        (first + timedelta(days=i)).strftime("%Y%m%d")
+        for i in range((last - first).days + 1)
+    ]
+
+
+def availability_groups(location_id, start, end) -> list[str]:
+    loc = location_id or ANY_LOCATION
+    return [f"avail_{loc}_{day}" for day in day_buckets(start, end)]
+
+
+class Subscription:
+    """
+    A live availability search registered by a WebSocket client: a window,
+    an optional location and the public list filters.
+    """
+
+    def __init__(self, sub_id, start, end, location_id=None, filters=None):
+        self.id = str(sub_id)
+        self.start, self.end = start, end
+        self.location_id = int(location_id) if location_id else None
+        self.filters = filters or {}
+        self.counts: dict[int, int] = {}
+
+    @classmethod
+    def from_message(cls, data: dict) -> "Subscription":
+        """
+        Build from a ``{"action": "subscribe", "id", "start", "end",
+        "location_id"?, <filters>?}`` message.
+
+        :raises ValueError: On an invalid window or filter.
+        """
+        if not data.get("id"):
+            raise ValueError("id is required.")
+        start, end = parse_range(data.get("start"), data.get("end"))
+        if len(day_buckets(start, end)) > MAX_SUBSCRIPTION_DAYS:
+            raise ValueError(f"Window must cover at most {MAX_SUBSCRIPTION_DAYS} days.")
+        try:
+            location_id = int(data["location_id"]) if data.get("location_id") else None
+        except (TypeError, ValueError):
+            raise ValueError("location_id must be an integer.")
+        filters = {k: str(data[k]) for k in FILTER_PARAMS if data.get(k) not in (None, "")}
+        sub = cls(data["id"], start, end, location_id, filters)
+        apply_vehicle_filters(PhysicalVehicle.objects.none(), filters)  # validate early
+        return sub
+
+    @property
+    def groups(self) -> list[str]:
+        return availability_groups(self.location_id, self.start, self.end)
+
+    def matches(self, event: dict) -> bool:
+        """
+        Whether a reservation event (location_id, start, end) can change this
+        search's counts. Vehicle filters are not checked here: a recount that
+        changes nothing sends nothing.
+        """
+        if self.location_id and event.get("location_id") != self.location_id:
+            return False
+        start = parse_datetime(event.get("start") or "")
+        end = parse_datetime(event.get("end") or "")
+        if not start or not end:
+            return True
+        return start < self.end and end > self.start
+
+    def recount(self) -> dict[int, int]:
+        """
+        Recompute {vehicle_id: available_count} (one query) and return only the
+        entries that changed since the last count (0 = none left).
+        """
+        qs = apply_vehicle_filters(
+            available_units(self.start, self.end, self.location_id), self.filters
+        )
+        counts = dict(
+            qs.values("vehicle_id")
+            .annotate(available_count=Count("id"))
+            .values_list("vehicle_id", "available_count")
+        )
+        changed = {
+            vid: counts.get(vid, 0)
+            for vid in counts.keys() | self.counts.keys()
+            if counts.get(vid, 0) != self.counts.get(vid, 0)
+        }
+        self.counts = counts
+        return changed
+
+
+def reservation_availability_pushes(rows) -> list[tuple]:
+    """
+    Outbox pushes announcing that units were booked/released, from rows of
+    ``(location_id, vehicle_id, start, end)``. One push per location and window,
+    to that location's day groups and the location-less ones.
+
+    :return: ``(groups, message, "availability_changed")`` tuples for enqueue_pushes().
+    :rtype: list[tuple]
+    """
+    windows = {}
+    for location_id, vehicle_id, start, end in rows:
+        windows.setdefault((location_id, start, end), set()).add(vehicle_id)
+
+    pushes = []
+    for (location_id, start, end), vehicle_ids in windows.items():
+        groups = availability_groups(location_id, start, end)
+        groups += availability_groups(None, start, end)
+        message = {
+            "location_id": location_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "vehicle_ids": sorted(vehicle_ids),
+        }
+        pushes.append((groups, message, "availability_changed"))
+    return pushes
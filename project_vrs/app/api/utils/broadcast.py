@@ -1,44 +1,160 @@
 # api/utils/broadcast.py
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
+from collections import Counter
+
 from django.db import transaction
+
 from api.models import Notification  # absolute import (no relative confusion)
+from api.outbox.events import enqueue_push, enqueue_pushes
+from api.utils.unread import increment_unread
+
+
+def thin_message(message: dict) -> dict:
+    """
+    Reduce a message to scalars and ids: nested objects become ``<key>_id``
+    and lists of objects become ``<key>_ids``. Clients refetch details if needed.
+
+    Example: {"action": "created", "reservation": {"id": 7, ...}}
+          -> {"action": "created", "reservation_id": 7}
+
+    :param message: The full message.
+    :type message: dict
+    :return: The thin message.
+    :rtype: dict
+    """
+    thin = {}
+    for key, value in message.items():
+        if isinstance(value, dict):
+            if "id" in value:
+                thin[f"{key}_id"] = value["id"]
+        elif isinstance(value, (list, tuple)):
+            ids = [item["id"] for item in value if isinstance(item, dict) and "id" in item]
+            if ids:
+                thin[f"{key}_ids"] = ids
+        else:
+            thin[key] = value
+    return thin
 
-def broadcast_notification(message: dict, *, user_id: int | None = None, roles: list[str] | None = None):
+
+@transaction.atomic
+def broadcast_notifications(
+    message: dict,
+    *,
+    user_ids=(),
+    roles=(),
+    thin: bool = False,
+):
     """
-    Persist a DB notification for the given user_id and push WS messages.
-    Runs AFTER the surrounding DB transaction commits, so readers immediately see the row.
+    Fan a message out to many users and role groups.
+
+    One ``bulk_create`` persists a Notification per recipient (and bumps their
+    unread counters), and the outbox events carry the message for every target
+    group. All of it is written atomically, in the caller's transaction if any;
+    the outbox relay pushes the messages after commit, with all group sends
+    issued concurrently.
 
     :param message: The notification message to send.
     :type message: dict
-    :param user_id: The ID of the user to notify (optional).
-    :type user_id: int | None
-    :param roles: List of role names to notify (optional).
-    :type roles: list[str] | None
-    :return: None
-    :rtype: None
+    :param user_ids: IDs of the users to notify (persisted + pushed to user_<id>).
+    :type user_ids: Iterable[int]
+    :param roles: Role group names to push to (not persisted), e.g. ["managers"].
+    :type roles: Iterable[str]
+    :param thin: Send only scalars and ids instead of nested payloads.
+    :type thin: bool
+    :return: The created notifications.
+    :rtype: list[Notification]
     """
+    user_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+    roles = list(dict.fromkeys(roles))
+    if thin:
+        message = thin_message(message)
+
+    text = message.get("message") or message.get("action") or ""
+    kind = message.get("action") or "info"
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(recipient_id=uid, message=text, type=kind, is_read=False)
+            for uid in user_ids
+        ]
+    )
 
-    def _do():
-        ch = get_channel_layer()
+    # Per-user messages go out immediately, each carrying the user's new unread
+    # count; role groups (many browsers) are coalesced per window by the
+    # consumer (NotificationConsumer.notify_coalesced)
+    if user_ids:
+        unread = increment_unread({uid: 1 for uid in user_ids})
+        enqueue_pushes(
+            ([f"user_{uid}"], {**message, "unread": unread.get(uid, 0)})
+            for uid in user_ids
+        )
+    if roles:
+        enqueue_push(roles, message, handler="notify_coalesced")
+    return notifications
 
-        if user_id:
-            # Works for FK recipient or int recipient_id
-            Notification.objects.create(
-                recipient_id=user_id,
+
+@transaction.atomic
+def broadcast_per_user(messages, *, roles=()):
+    """
+    Send many different messages, each to its own user and to the ``roles``
+    groups, with a constant number of queries: one ``bulk_create`` of the
+    Notifications, one unread counter update per distinct count and one
+    outbox INSERT for all the pushes.
+
+    :param messages: ``(user_id, message)`` pairs.
+    :type messages: Iterable[tuple[int, dict]]
+    :param roles: Role group names every message is pushed to, e.g. ["managers"].
+    :type roles: Iterable[str]
+    :return: The created notifications.
+    :rtype: list[Notification]
+    """
+    messages = list(messages)
+    roles = list(dict.fromkeys(roles))
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(
+                recipient_id=uid,
                 message=message.get("message") or message.get("action") or "",
                 type=message.get("action") or "info",
                 is_read=False,
             )
-            async_to_sync(ch.group_send)(
-                f"user_{user_id}", {"type": "notify", "message": message}
-            )
+            for uid, message in messages
+            if uid
+        ]
+    )
 
+    per_user = Counter(uid for uid, _ in messages if uid)
+    unread = increment_unread(dict(per_user))
+    pushes = []
+    for uid, message in messages:
+        if uid:
+            # a user with several messages sees the count grow message by message
+            per_user[uid] -= 1
+            count = unread.get(uid, 0) - per_user[uid]
+            pushes.append(([f"user_{uid}"], {**message, "unread": count}))
         if roles:
-            for role in roles:
-                async_to_sync(ch.group_send)(
-                    role, {"type": "notify", "message": message}
-                )
+            pushes.append((roles, message, "notify_coalesced"))
+    enqueue_pushes(pushes)
+    return notifications
 
-    # Defer both DB write and WS push until the outer transaction commits
-    transaction.on_commit(_do)
+
+def broadcast_notification(message: dict, *, user_id: int | None = None, roles: list[str] | None = None, thin: bool = False):
+    """
+    Persist a DB notification for the given user_id and queue WS messages.
+    Single-recipient shortcut for broadcast_notifications().
+
+    :param message: The notification message to send.
+    :type message: dict
+    :param user_id: The ID of the user to notify (optional).
+    :type user_id: int | None
+    :param roles: List of role names to notify (optional).
+    :type roles: list[str] | None
+    :param thin: Send only scalars and ids instead of nested payloads.
+    :type thin: bool
+    :return: None
+    :rtype: None
+    """
+    broadcast_notifications(
+        message,
+        user_ids=[user_id] if user_id else (),
+        roles=roles or (),
+        thin=thin,
+    )
@@ -0,0 +1,201 @@
+# api/utils/field_tracker.py
+from django.db import models
+from django.dispatch import Signal
+
+# Sent after a tracked model was written and at least one tracked field changed.
+# Receivers get: sender (model class), pk, changes {attname: (old, new)},
+# instance (None for update()) and batch (a TrackedBatch for update(), else None)
+tracked_fields_changed = Signal()
+
+
+class TrackedBatch:
+    """
+    The rows changed by one ``TrackedQuerySet.update()`` call. Every event of
+    the batch carries it, so a receiver can handle all rows on the first event
+    (``if batch.first("my_receiver")``) with a few queries instead of per row.
+    """
+
+    def __init__(self, model, changes: dict):
+        self.model = model
+        # {pk: {attname: (old, new)}}
+        self.changes = changes
+        self._handled = set()
+        self._rows = {}
+
+    def first(self, name: str) -> bool:
+        """
+        True the first time ``name`` asks, False for the rest of the batch.
+        """
+        if name in self._handled:
+            return False
+        self._handled.add(name)
+        return True
+
+    def rows(self, *fields) -> dict:
+        """
+        ``{pk: {field: value}}`` of the changed rows as written, one SELECT per
+        distinct ``fields`` for the whole batch.
+        """
+        if fields not in self._rows:
+            self._rows[fields] = {
+                row.pop("pk"): row
+                for row in self.model._base_manager.filter(
+                    pk__in=list(self.changes)
+                ).values("pk", *fields)
+            }
+        return self._rows[fields]
+
+
+class TrackedQuerySet(models.QuerySet):
+    """
+    QuerySet that keeps `tracked_fields_changed` firing for batch updates.
+
+    ``QuerySet.update()`` bypasses ``save()`` and therefore the model signals.
+    When an update touches a tracked field we read the affected rows' current
+    values once (a single SELECT for the whole batch), run the UPDATE and then
+    emit one change event per row whose value actually changed; all events of
+    the call share one ``TrackedBatch``.
+    """
+
+    def update(self, **kwargs):
+        tracked = self._tracked_attnames(kwargs)
+        if not tracked:
+            return super().update(**kwargs)
+
+        before = {
+            row[0]: dict(zip(tracked, row[1:]))
+            for row in self.values_list("pk", *tracked)
+        }
+        rows = super().update(**kwargs)
+        if not before:
+            return rows
+
+        new_values = {
+            name: value
+            for name, value in self._normalize_update_kwargs(kwargs).items()
+            if name in tracked
+        }
+        changed = {}
+        for pk, old_values in before.items():
+            changes = {
+                name: (old, new_values[name])
+                for name, old in old_values.items()
+                if old != new_values[name]
+            }
+            if changes:
+                changed[pk] = changes
+        batch = TrackedBatch(self.model, changed)
+        for pk, changes in changed.items():
+            tracked_fields_changed.send(
+                sender=self.model, pk=pk, changes=changes, instance=None, batch=batch
+            )
+        return rows
+
+    def _tracked_attnames(self, kwargs):
+        tracked = getattr(self.model, "TRACKED_FIELDS", ())
+        return [
+            name for name in self._normalize_update_kwargs(kwargs) if name in tracked
+        ]
+
+    def _normalize_update_kwargs(self, kwargs):
+        """
+        Map update() kwargs to attnames: ``status=<obj>`` -> ``status_id=<pk>``.
+        Expressions (F(), Case(), ...) are skipped; their result is unknown here.
+        """
+        normalized = {}
+        for name, value in kwargs.items():
+            field = self.model._meta.get_field(name)
+            if hasattr(value, "resolve_expression"):
+                continue
+            if field.is_relation and isinstance(value, models.Model):
+                value = value.pk
+            normalized[field.attname] = value
+        return normalized
+
+
+class TrackedFieldsMixin(models.Model):
+    """
+    Model mixin that remembers the values of ``TRACKED_FIELDS`` (attnames,
+    e.g. ``"status_id"``) as they were loaded from the database, so a save can
+    tell what changed without re-reading the row.
+
+    After every save that changed a tracked field, ``tracked_fields_changed``
+    is sent and the snapshot is refreshed.
+    """
+
+    TRACKED_FIELDS: tuple[str, ...] = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # The reloaded values are what the database holds: the new baseline,
+        # or a change made elsewhere (queryset.update()) would be re-sent on save
+        if fields is not None:
+            attnames = {f.name: f.attname for f in self._meta.concrete_fields}
+            fields = {attnames.get(name, name) for name in fields}
+        self._snapshot_tracked_fields(fields)
+
+    def _snapshot_tracked_fields(self, names=None):
+        # Deferred fields are not in __dict__; they are simply not tracked.
+        names = self.TRACKED_FIELDS if names is None else names
+        loaded = getattr(self, "_loaded_values", None) or {}
+        loaded.update(
+            {
+                name: self.__dict__[name]
+                for name in names
+                if name in self.TRACKED_FIELDS and name in self.__dict__
+            }
+        )
+        self._loaded_values = loaded
+
+    def tracked_changes(self, update_fields=None) -> dict:
+        """
+        Return ``{attname: (old, new)}`` for tracked fields that differ from the
+        loaded snapshot. A fresh (never saved) instance has ``None`` as old value.
+        """
+        loaded = getattr(self, "_loaded_values", None)
+        changes = {}
+        for name in self.TRACKED_FIELDS:
+            if update_fields is not None and name not in update_fields:
+                continue
+            if name not in self.__dict__:
+                continue
+            if loaded is not None and name not in loaded:
+                # The field was deferred at load time, we can't tell.
+                continue
+            old = loaded[name] if loaded is not None else None
+            new = self.__dict__[name]
+            if old != new:
+                changes[name] = (old, new)
+        return changes
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            # update_fields may use field names ("status"); compare by attname
+            update_fields = {
+                self._meta.get_field(name).attname for name in update_fields
+            }
+        changes = {} if adding else self.tracked_changes(update_fields)
+
+        super().save(*args, **kwargs)
+
+        if changes:
+            tracked_fields_changed.send(
+                sender=self.__class__,
+                pk=self.pk,
+                changes=changes,
+                instance=self,
+                batch=None,
+            )
+        # Only what was actually written becomes the new baseline
+        self._snapshot_tracked_fields(update_fields)
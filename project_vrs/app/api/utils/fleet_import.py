@@ -0,0 +1,169 @@
+# api/utils/fleet_import.py
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from api.models import Location, PhysicalVehicle, Vehicle
+
+CHUNK_SIZE = int(getattr(settings, "FLEET_IMPORT_CHUNK_SIZE", 500))
+# id lists in one IN (...) lookup
+LOOKUP_CHUNK = 1000
+PLATE_MAX_LENGTH = PhysicalVehicle._meta.get_field("car_plate_number").max_length
+FIELDS = ("car_plate_number", "vehicle_id", "location_id")
+
+
+class FleetImportError(ValueError):
+    """
+    The uploaded file itself can't be read (not a per-row problem).
+    """
+
+
+def normalize_plate(value) -> str:
+    """
+    Trim spaces and uppercase; the same rule as PhysicalVehicleSerializer.
+    """
+    return str(value or "").strip().upper()
+
+
+def parse_rows(content, file_format: str) -> list[dict]:
+    """
+    Read rows from CSV (header: car_plate_number,vehicle_id,location_id) or
+    JSON (a list of objects, or {"vehicles": [...]}).
+
+    :param content: File content.
+    :type content: str | bytes
+    :param file_format: "csv" or "json".
+    :type file_format: str
+    :raises FleetImportError: If the content can't be parsed.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8-sig")
+    if file_format == "csv":
+        reader = csv.DictReader(io.StringIO(content))
+        missing = set(FIELDS) - set(reader.fieldnames or ())
+        if missing:
+            raise FleetImportError(f"CSV header is missing: {', '.join(sorted(missing))}")
+        return list(reader)
+    if file_format == "json":
+        try:
+            data = json.loads(content)
+        except ValueError as e:
+            raise FleetImportError(f"Invalid JSON: {e}") from e
+        if isinstance(data, dict):
+            data = data.get("vehicles")
+        if not isinstance(data, list) or not all(isinstance(r, dict) for r in data):
+            raise FleetImportError("Expected a list of objects or {\"vehicles\": [...]}")
+        return data
+    raise FleetImportError(f"Unsupported format '{file_format}'")
+
+
+def _existing(queryset, field: str, values) -> set:
+    values = list(values)
+    found = set()
+    for i in range(0, len(values), LOOKUP_CHUNK):
+        found.update(
+            queryset.filter(**{f"{field}__in": values[i : i + LOOKUP_CHUNK]}).values_list(
+                field, flat=True
+            )
+        )
+    return found
+
+
+def _to_id(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def validate_rows(rows) -> tuple[list[PhysicalVehicle], list[dict]]:
+    """
+    Validate all rows in one set-based pass: a single lookup (per 1000 values)
+    each for taken plates, vehicle ids and location ids.
+
+    :return: (unsaved PhysicalVehicle objects, [{"row": n, "errors": {field: [msg]}}])
+        Rows are numbered from 1 in file order (the CSV header is not counted).
+    :rtype: tuple[list[PhysicalVehicle], list[dict]]
+    """
+    parsed = [
+        (
+            normalize_plate(row.get("car_plate_number")),
+            _to_id(row.get("vehicle_id")),
+            _to_id(row.get("location_id")),
+        )
+        for row in rows
+    ]
+    taken = _existing(PhysicalVehicle.objects, "car_plate_number", {p for p, _, _ in parsed if p})
+    vehicles = _existing(Vehicle.objects, "id", {v for _, v, _ in parsed if v})
+    locations = _existing(Location.objects, "id", {loc for _, _, loc in parsed if loc})
+
+    objs, report, seen = [], [], {}
+    for n, (plate, vehicle_id, location_id) in enumerate(parsed, start=1):
+        errors = {}
+        if not plate:
+            errors["car_plate_number"] = ["Car plate cannot be empty."]
+        elif len(plate) > PLATE_MAX_LENGTH:
+            errors["car_plate_number"] = [f"At most {PLATE_MAX_LENGTH} characters."]
+        elif plate in taken:
+            errors["car_plate_number"] = ["A vehicle with this plate already exists."]
+        elif plate in seen:
+            errors["car_plate_number"] = [f"Duplicate of row {seen[plate]}."]
+        if vehicle_id is None:
+            errors["vehicle_id"] = ["A valid integer is required."]
+        elif vehicle_id not in vehicles:
+            errors["vehicle_id"] = [f"Vehicle {vehicle_id} does not exist."]
+        if location_id is None:
+            errors["location_id"] = ["A valid integer is required."]
+        elif location_id not in locations:
+            errors["location_id"] = [f"Location {location_id} does not exist."]
+
+        seen.setdefault(plate, n)
+        if errors:
+            report.append({"row": n, "errors": errors})
+        else:
+            objs.append(
+                PhysicalVehicle(
+                    car_plate_number=plate, vehicle_id=vehicle_id, location_id=location_id
+                )
+            )
+    return objs, report
+
+
+def import_fleet(rows, dry_run: bool = False, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Validate and insert physical vehicles. All or nothing: if any row is
+    invalid nothing is written and the report lists every bad row.
+
+    :param rows: Row dicts with car_plate_number, vehicle_id, location_id.
+    :type rows: list[dict]
+    :param dry_run: Validate only.
+    :type dry_run: bool
+    :param chunk_size: Rows per INSERT.
+    :type chunk_size: int
+    :return: {"total", "valid", "created", "dry_run", "errors": [...]}
+    :rtype: dict
+    """
+    objs, errors = validate_rows(rows)
+    report = {
+        "total": len(rows),
+        "valid": len(objs),
+        "created": 0,
+        "dry_run": dry_run,
+        "errors": errors,
+    }
+    if errors or dry_run or not objs:
+        return report
+    try:
+        with transaction.atomic():
+            PhysicalVehicle.objects.bulk_create(objs, batch_size=chunk_size)
+    except IntegrityError:
+        # a plate was taken between validation and insert
+        report["errors"] = [
+            {"row": None, "errors": {"car_plate_number": ["Plates changed during import, retry."]}}
+        ]
+        return report
+    report["created"] = len(objs)
+    return report
@@ -0,0 +1,62 @@
+# api/utils/queues.py
+import json
+import time
+
+from django.conf import settings
+
+from backend.celery import PRIORITY_SEP, PRIORITY_STEPS, QUEUES
+
+
+def _oldest_sent_at(raw) -> float | None:
+    """``sent_at`` header (see backend/celery.py) of a raw Redis broker message."""
+    try:
+        return float(json.loads(raw)["headers"]["sent_at"])
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+def _priority_lists(queue: str) -> list[str]:
+    """Redis lists behind a queue, one per priority step (backend/celery.py)."""
+    return [queue if step == 0 else f"{queue}{PRIORITY_SEP}{step}" for step in PRIORITY_STEPS]
+
+
+def queue_stats(client=None) -> list[dict]:
+    """
+    Depth and age of the oldest waiting message for each Celery queue, read
+    straight from the Redis broker (LLEN + LINDEX -1 per priority list of each
+    queue, one round trip). Kombu pushes on the left and workers pop on the
+    right, so index -1 is the oldest message of a list.
+
+    :return: [{"queue": "critical", "depth": 3, "oldest_age_seconds": 1.2}, ...]
+    :rtype: list[dict]
+    """
+    if client is None:
+        import redis
+
+        client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+
+    pipe = client.pipeline(transaction=False)
+    for name in QUEUES:
+        for key in _priority_lists(name):
+            pipe.llen(key)
+            pipe.lindex(key, -1)
+    raw = iter(pipe.execute())
+
+    now = time.time()
+    stats = []
+    for name in QUEUES:
+        depth, sent_ats = 0, []
+        for _ in PRIORITY_STEPS:
+            length, oldest = next(raw), next(raw)
+            depth += length
+            if oldest:
+                sent_ats.append(_oldest_sent_at(oldest))
+        sent_at = min((t for t in sent_ats if t is not None), default=None)
+        stats.append(
+            {
+                "queue": name,
+                "depth": depth,
+                "oldest_age_seconds": round(now - sent_at, 3) if sent_at else None,
+            }
+        )
+    return stats
@@ -0,0 +1,147 @@
+# api/utils/replay.py
+"""
+Missed-message replay for WebSocket clients.
+
+Every pushed message gets a global, monotonically increasing ``seq`` and is kept
+in a bounded ring buffer per channel-layer group. A reconnecting client passes
+``?since=<last seq it saw>`` and receives only the gap.
+
+Backed by Redis (one INCRBY per relay batch, one sorted set per group) when
+``WS_REPLAY_REDIS_URL`` is set, otherwise by an in-process stand-in that is
+only shared within a single process (dev / tests).
+"""
+import json
+import threading
+from collections import deque
+from itertools import count
+
+from django.conf import settings
+
+SEQ_KEY = "ws:replay:seq"
+GROUP_KEY = "ws:replay:group:{}"
+BUFFER_SIZE = int(getattr(settings, "WS_REPLAY_BUFFER_SIZE", 200))
+BUFFER_TTL = int(getattr(settings, "WS_REPLAY_TTL", 60 * 60 * 24))  # seconds
+
+
+class LocalReplayBuffer:
+    """In-process stand-in: a counter and a deque per group."""
+
+    def __init__(self, size: int = BUFFER_SIZE):
+        self.size = size
+        self._seq = count(1)
+        self._groups: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def next_seqs(self, n: int) -> list[int]:
+        with self._lock:
+            return [next(self._seq) for _ in range(n)]
+
+    def record(self, entries) -> None:
+        """
+        :param entries: Iterable of (group, seq, message).
+        """
+        with self._lock:
+            for group, seq, message in entries:
+                self._groups.setdefault(group, deque(maxlen=self.size)).append(
+                    (seq, message)
+                )
+
+    async def afetch(self, groups, since: int) -> tuple[list[dict], bool]:
+        buffers = []
+        with self._lock:
+            for group in groups:
+                buf = self._groups.get(group, ())
+                oldest = buf[0][0] if buf else None
+                buffers.append((list(buf), len(buf), oldest))
+        return _merge(buffers, since, self.size)
+
+
+class RedisReplayBuffer:
+    """Redis backend: INCRBY for seq blocks, a capped sorted set per group."""
+
+    def __init__(self, url: str, size: int = BUFFER_SIZE, ttl: int = BUFFER_TTL):
+        self.url, self.size, self.ttl = url, size, ttl
+        self._sync = None
+        self._async = None
+
+    @property
+    def client(self):
+        if self._sync is None:
+            import redis
+
+            self._sync = redis.Redis.from_url(self.url)
+        return self._sync
+
+    @property
+    def aclient(self):
+        if self._async is None:
+            import redis.asyncio
+
+            self._async = redis.asyncio.Redis.from_url(self.url)
+        return self._async
+
+    def next_seqs(self, n: int) -> list[int]:
+        last = self.client.incrby(SEQ_KEY, n)
+        return list(range(last - n + 1, last + 1))
+
+    def record(self, entries) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        touched = set()
+        for group, seq, message in entries:
+            key = GROUP_KEY.format(group)
+            pipe.zadd(key, {json.dumps([seq, message], default=str): seq})
+            touched.add(key)
+        for key in touched:
+            # keep the newest BUFFER_SIZE entries
+            pipe.zremrangebyrank(key, 0, -self.size - 1)
+            pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    async def afetch(self, groups, since: int) -> tuple[list[dict], bool]:
+        pipe = self.aclient.pipeline(transaction=False)
+        for group in groups:
+            key = GROUP_KEY.format(group)
+            pipe.zcard(key)
+            pipe.zrange(key, 0, 0, withscores=True)
+            pipe.zrangebyscore(key, f"({since}", "+inf")
+        raw = await pipe.execute()
+
+        buffers = []
+        for i in range(0, len(raw), 3):
+            size, oldest, newer = raw[i : i + 3]
+            entries = [tuple(json.loads(item)) for item in newer]
+            buffers.append((entries, size, int(oldest[0][1]) if oldest else None))
+        return _merge(buffers, since, self.size)
+
+
+def _merge(buffers, since: int, capacity: int) -> tuple[list[dict], bool]:
+    """
+    Merge per-group buffers into one list ordered by seq, keeping only
+    seq > since (a message pushed to several groups appears once).
+
+    :param buffers: One (entries, size, oldest_seq) per group, entries being
+        (seq, message) pairs.
+    :return: (messages, complete). complete is False when a full buffer's oldest
+        entry is newer than since + 1: older messages were evicted and the
+        client should fall back to a full refetch.
+    """
+    complete = True
+    by_seq = {}
+    for entries, size, oldest in buffers:
+        if size >= capacity and oldest is not None and oldest > since + 1:
+            complete = False
+        for seq, message in entries:
+            if seq > since:
+                by_seq[seq] = message
+    return [by_seq[seq] for seq in sorted(by_seq)], complete
+
+
+_buffer = None
+
+
+def get_replay_buffer():
+    global _buffer
+    if _buffer is None:
+        url = getattr(settings, "WS_REPLAY_REDIS_URL", "")
+        _buffer = RedisReplayBuffer(url) if url else LocalReplayBuffer()
+    return _buffer
@@ -0,0 +1,149 @@
+# api/utils/revocation.py
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Shared (Redis) map {user id: cutoff}; tokens issued ("iat") before the cutoff
+# are no longer accepted. Blocked, inactive and deleted users have no cutoff
+# (math.inf): none of their tokens is accepted.
+REVOKED_USERS_KEY = "auth:revoked_user_ids"
+# Users whose tokens were revoked by an event the DB no longer shows (deleted
+# row, role change), {id: (cutoff, unix time the entry can be dropped)}
+TOKEN_CUTOFFS_KEY = "auth:token_cutoffs"
+# How long a process trusts its local copy of the map before re-reading it
+LOCAL_TTL = float(getattr(settings, "AUTH_REVOCATION_CACHE_TTL", 30))
+
+_local = {"cutoffs": {}, "expires": 0.0}
+
+
+def _token_lifetime() -> float:
+    from rest_framework_simplejwt.settings import api_settings
+
+    return api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+
+
+def _recent_cutoffs() -> dict:
+    now = time.time()
+    entries = cache.get(TOKEN_CUTOFFS_KEY) or {}
+    return {uid: cutoff for uid, (cutoff, until) in entries.items() if until > now}
+
+
+def _load_from_db() -> dict:
+    from django.db.models import Q
+    from api.models import User
+
+    cutoffs = _recent_cutoffs()
+    cutoffs.update(
+        (uid, math.inf)
+        for uid in User.objects.filter(Q(is_blocked=True) | Q(is_active=False)).values_list(
+            "id", flat=True
+        )
+    )
+    return cutoffs
+
+
+def _store(cutoffs) -> None:
+    # With event cutoffs in the map, rebuild it once the tokens they cover expired
+    cache.set(
+        REVOKED_USERS_KEY, cutoffs, _token_lifetime() if _recent_cutoffs() else None
+    )
+
+
+def _remember(cutoffs) -> dict:
+    _local["cutoffs"] = cutoffs
+    _local["expires"] = time.monotonic() + LOCAL_TTL
+    return cutoffs
+
+
+def revoked_user_ids() -> dict:
+    """
+    Return the revoked users' cutoffs, from the local copy while it is fresh,
+    then from the shared cache, rebuilding it from the DB if it is missing.
+    """
+    if time.monotonic() < _local["expires"]:
+        return _local["cutoffs"]
+    cutoffs = cache.get(REVOKED_USERS_KEY)
+    if not isinstance(cutoffs, dict):
+        cutoffs = _load_from_db()
+        _store(cutoffs)
+    return _remember(cutoffs)
+
+
+async def arevoked_user_ids() -> dict:
+    """
+    Async variant of revoked_user_ids(). Only touches the shared cache once per
+    LOCAL_TTL per process (and the DB only if the shared map was lost).
+    """
+    if time.monotonic() < _local["expires"]:
+        return _local["cutoffs"]
+    cutoffs = await cache.aget(REVOKED_USERS_KEY)
+    if not isinstance(cutoffs, dict):
+        from asgiref.sync import sync_to_async
+        from channels.db import database_sync_to_async
+
+        cutoffs = await database_sync_to_async(_load_from_db)()
+        await sync_to_async(_store)(cutoffs)
+    return _remember(cutoffs)
+
+
+def _refused(cutoffs, user_id, issued_at) -> bool:
+    cutoff = cutoffs.get(int(user_id))
+    if cutoff is None:
+        return False
+    # A token without "iat" can't prove it is newer than the cutoff
+    return issued_at is None or issued_at < cutoff
+
+
+def is_revoked(user_id, issued_at=None) -> bool:
+    """
+    :param user_id: the token's user id
+    :param issued_at: the token's "iat" claim (unix time)
+    """
+    return _refused(revoked_user_ids(), user_id, issued_at)
+
+
+async def ais_revoked(user_id, issued_at=None) -> bool:
+    return _refused(await arevoked_user_ids(), user_id, issued_at)
+
+
+def refresh_revoked_users() -> None:
+    """
+    Rebuild the shared revoked map from the DB. Called after a user is
+    blocked/unblocked or (de)activated; rare, and rebuilding avoids lost updates
+    between concurrent writers. Other processes see it within LOCAL_TTL.
+    """
+    cutoffs = _load_from_db()
+    _store(cutoffs)
+    _remember(cutoffs)
+
+
+def _add_cutoff(user_id, cutoff) -> None:
+    now = time.time()
+    entries = {
+        uid: entry
+        for uid, entry in (cache.get(TOKEN_CUTOFFS_KEY) or {}).items()
+        if entry[1] > now
+    }
+    entries[int(user_id)] = (cutoff, now + _token_lifetime())
+    cache.set(TOKEN_CUTOFFS_KEY, entries, _token_lifetime())
+    refresh_revoked_users()
+
+
+def revoke_deleted_user(user_id) -> None:
+    """
+    Keep refusing a deleted user's tokens until the last one expires, then
+    rebuild the shared map. Called once the delete is committed.
+    """
+    _add_cutoff(user_id, math.inf)
+
+
+def revoke_issued_tokens(user_id) -> None:
+    """
+    Refuse the access tokens issued to ``user_id`` so far, e.g. after a role
+    change: their ``role`` claim is stale. Tokens refreshed from now on carry
+    the current role and are accepted. Called once the change is committed.
+    ("iat" has a one-second resolution: tokens issued in that same second pass.)
+    """
+    _add_cutoff(user_id, int(time.time()))
@@ -0,0 +1,165 @@
+# api/utils/task_stats.py
+"""
+Rolling per-task statistics for Celery workers, replacing the
+django_celery_results rows for fire-and-forget tasks (ignore_result=True).
+
+Each worker process counts successes, failures, retries and a runtime
+histogram in memory, and every FLUSH_INTERVAL seconds adds its deltas to a
+per-minute Redis hash (HINCRBY, one pipeline). Pool processes don't share
+memory with the worker's control process, so a shared hash is what lets the
+ops endpoint see all of them. Buckets expire after the retention window.
+"""
+import threading
+import time
+from collections import defaultdict
+from logging import getLogger
+
+from celery.signals import task_postrun, task_prerun, worker_process_shutdown
+from django.conf import settings
+
+logger = getLogger(__name__)
+
+KEY = "celery:taskstats:{}"  # per minute (epoch minute)
+FLUSH_INTERVAL = float(getattr(settings, "TASK_STATS_FLUSH_INTERVAL", 5))  # seconds
+WINDOW_MINUTES = int(getattr(settings, "TASK_STATS_WINDOW_MINUTES", 60))
+# runtime histogram upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class TaskStatsCollector:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(int)  # (minute, "task|metric") -> delta
+        self._started = {}  # task_id -> perf_counter at prerun
+        self._timer = None
+        self._client = None
+
+    # --- recording (called from Celery signals) -------------------------
+    def started(self, task_id):
+        self._started[task_id] = time.perf_counter()
+
+    def finished(self, task_id, task_name, state):
+        started = self._started.pop(task_id, None)
+        metrics = {}
+        if state == "SUCCESS":
+            metrics["succeeded"] = 1
+        elif state == "FAILURE":
+            metrics["failed"] = 1
+        elif state == "RETRY":
+            metrics["retried"] = 1
+        if started is not None:
+            runtime_ms = (time.perf_counter() - started) * 1000
+            metrics["runtime_ms_sum"] = int(runtime_ms)
+            metrics["runtime_count"] = 1
+            metrics[f"le_{_bucket(runtime_ms)}"] = 1
+        self._add(task_name, metrics)
+
+    def _add(self, task_name, metrics: dict):
+        minute = int(time.time() // 60)
+        with self._lock:
+            for metric, n in metrics.items():
+                self._pending[(minute, f"{task_name}|{metric}")] += n
+            if self._timer is None:
+                self._timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    # --- shared storage -------------------------------------------------
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(settings.REDIS_CACHE_URL)
+        return self._client
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._timer = None
+        if not pending:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            minutes = set()
+            for (minute, field), n in pending.items():
+                pipe.hincrby(KEY.format(minute), field, n)
+                minutes.add(minute)
+            for minute in minutes:
+                pipe.expire(KEY.format(minute), (WINDOW_MINUTES + 1) * 60)
+            pipe.execute()
+        except Exception:
+            # observability must never break task execution; drop this interval
+            logger.warning("Task stats flush failed", exc_info=True)
+
+    def read(self, minutes: int = 15) -> list[dict]:
+        """
+        Aggregate the last ``minutes`` minute buckets into one row per task:
+        counts, average runtime, p50/p95 estimated from the histogram, and the
+        histogram itself.
+        """
+        minutes = max(1, min(minutes, WINDOW_MINUTES))
+        now = int(time.time() // 60)
+        pipe = self.client.pipeline(transaction=False)
+        for minute in range(now - minutes + 1, now + 1):
+            pipe.hgetall(KEY.format(minute))
+        totals = defaultdict(lambda: defaultdict(int))
+        for bucket in pipe.execute():
+            for field, n in bucket.items():
+                task, metric = field.decode().split("|", 1)
+                totals[task][metric] += int(n)
+        return [_summary(task, metrics) for task, metrics in sorted(totals.items())]
+
+
+def _bucket(runtime_ms: float) -> str:
+    for bound in BUCKETS_MS:
+        if runtime_ms <= bound:
+            return str(bound)
+    return "inf"
+
+
+def _percentile(histogram: list[tuple[str, int]], total: int, pct: float):
+    """Upper bound (ms) of the histogram bucket holding the pct-th run."""
+    if not total:
+        return None
+    rank, seen = pct / 100 * total, 0
+    for bound, n in histogram:
+        seen += n
+        if seen >= rank:
+            return None if bound == "inf" else int(bound)
+    return None
+
+
+def _summary(task: str, metrics: dict) -> dict:
+    histogram = [(str(b), metrics.get(f"le_{b}", 0)) for b in BUCKETS_MS]
+    histogram.append(("inf", metrics.get("le_inf", 0)))
+    runs = metrics.get("runtime_count", 0)
+    return {
+        "task": task,
+        "succeeded": metrics.get("succeeded", 0),
+        "failed": metrics.get("failed", 0),
+        "retried": metrics.get("retried", 0),
+        "avg_runtime_ms": round(metrics.get("runtime_ms_sum", 0) / runs, 1) if runs else None,
+        "p50_runtime_ms": _percentile(histogram, runs, 50),
+        "p95_runtime_ms": _percentile(histogram, runs, 95),
+        "runtime_histogram_ms": dict(histogram),
+    }
+
+
+collector = TaskStatsCollector()
+
+
+@task_prerun.connect
+def _on_prerun(task_id=None, **kwargs):
+    collector.started(task_id)
+
+
+@task_postrun.connect
+def _on_postrun(task_id=None, task=None, state=None, **kwargs):
+    # state is SUCCESS, FAILURE or RETRY
+    collector.finished(task_id, task.name if task else "unknown", state)
+
+
+@worker_process_shutdown.connect
+def _flush_on_shutdown(**kwargs):
+    collector.flush()
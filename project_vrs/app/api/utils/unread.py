@@ -0,0 +1,77 @@
+# api/utils/unread.py
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from api.models import Notification, NotificationCounter
+from api.outbox.events import enqueue_push
+
+
+def increment_unread(counts: dict[int, int]) -> dict[int, int]:
+    """
+    Add ``counts[user_id]`` to each user's unread counter (creating missing
+    counters) and return the new values. One UPDATE per distinct increment.
+
+    :param counts: {user_id: number of new unread notifications}
+    :type counts: dict[int, int]
+    :return: {user_id: unread}
+    :rtype: dict[int, int]
+    """
+    if not counts:
+        return {}
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(user_id=uid) for uid in counts], ignore_conflicts=True
+    )
+    by_increment = defaultdict(list)
+    for uid, n in counts.items():
+        by_increment[n].append(uid)
+    for n, uids in by_increment.items():
+        NotificationCounter.objects.filter(user_id__in=uids).update(
+            unread=F("unread") + n
+        )
+    return dict(
+        NotificationCounter.objects.filter(user_id__in=counts).values_list(
+            "user_id", "unread"
+        )
+    )
+
+
+def unread_count(user_id: int) -> int:
+    """
+    O(1) unread count: a primary-key lookup on the counter row.
+    """
+    return (
+        NotificationCounter.objects.filter(user_id=user_id)
+        .values_list("unread", flat=True)
+        .first()
+        or 0
+    )
+
+
+@transaction.atomic
+def mark_notifications_read(user_id: int, up_to_id: int | None = None) -> tuple[int, int]:
+    """
+    Mark the user's unread notifications with id <= up_to_id (all if None) as
+    read in a single UPDATE, decrement the counter by the same amount and queue
+    the new count for the user's WS connection.
+
+    :return: (number of notifications marked, unread count after the update)
+    :rtype: tuple[int, int]
+    """
+    qs = Notification.objects.filter(recipient_id=user_id, is_read=False)
+    if up_to_id is not None:
+        qs = qs.filter(id__lte=up_to_id)
+    marked = qs.update(is_read=True)
+
+    if marked:
+        NotificationCounter.objects.filter(user_id=user_id).update(
+            unread=Greatest(F("unread") - marked, 0)
+        )
+    unread = unread_count(user_id)
+    if marked:
+        enqueue_push(
+            [f"user_{user_id}"], {"action": "unread_count", "unread": unread}
+        )
+    return marked, unread
@@ -4,9 +4,9 @@ from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Sum, Q
 from django.contrib.auth import get_user_model
 
 from api.models import Reservation, ReservationStatus
@@ -15,10 +15,19 @@ from api.serializers.admin_ops_serializer import (
     ReservationTransitionInputSerializer,
     ReservationTransitionOptionsSerializer,
     AdminKPISerializer,
+    QueueStatsSerializer,
+    TaskStatsSerializer,
+    DedupStatsSerializer,
+    KPISeriesQuerySerializer,
+    KPISeriesPointSerializer,
 )
 from api.custom_permissions.mixed_role_permissions import RoleRequired
+from api.outbox.dedup import suppressed_counts
+from api.reporting.kpis import get_kpis
+from api.reporting.rollups import time_series
+from api.utils.queues import queue_stats
+from api.utils.task_stats import collector as task_stats
 from api.constants import (
-    ACTIVE_STATUSES,
     OPS_ALLOWED_ACTIONS,
     ACTIVE,
     CONFIRMED,
@@ -34,6 +43,89 @@ HOLD_MINUTES = int(getattr(settings, "RESERVATION_HOLD_MINUTES", 15))
 User = get_user_model()
 
 
+class AdminQueuesView(APIView):
+    """
+    Returns depth and oldest-message age for each Celery queue.
+    """
+
+    def get_permissions(self):
+        return [IsAuthenticated(), RoleRequired("admin")]
+
+    @swagger_auto_schema(
+        responses={200: QueueStatsSerializer(many=True)},
+        operation_summary="Admin: Celery queue depth",
+        operation_description="Messages waiting per queue and age of the oldest one (seconds).",
+    )
+    def get(self, request):
+        try:
+            stats = queue_stats()
+        except Exception as e:
+            return Response(
+                {"detail": f"Broker unavailable: {e}"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response(QueueStatsSerializer(stats, many=True).data)
+
+
+class AdminTaskStatsView(APIView):
+    """
+    Returns rolling per-task counts and runtimes collected from the workers.
+    """
+
+    def get_permissions(self):
+        return [IsAuthenticated(), RoleRequired("admin")]
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "minutes",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="Window in minutes (default 15).",
+            )
+        ],
+        responses={200: TaskStatsSerializer(many=True)},
+        operation_summary="Admin: Celery task stats",
+        operation_description="Succeeded/failed/retried counts and runtime histogram per task name.",
+    )
+    def get(self, request):
+        try:
+            minutes = int(request.query_params.get("minutes", 15))
+        except ValueError:
+            return Response({"detail": "minutes must be an integer."}, status=400)
+        try:
+            stats = task_stats.read(minutes)
+        except Exception as e:
+            return Response(
+                {"detail": f"Stats store unavailable: {e}"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response(TaskStatsSerializer(stats, many=True).data)
+
+
+class AdminDedupStatsView(APIView):
+    """
+    Returns how many duplicate status notifications were suppressed, per channel.
+    """
+
+    def get_permissions(self):
+        return [IsAuthenticated(), RoleRequired("admin")]
+
+    @swagger_auto_schema(
+        responses={200: DedupStatsSerializer(many=True)},
+        operation_summary="Admin: suppressed duplicate notifications",
+        operation_description="Duplicate status-change emails/pushes dropped by the dedup layer.",
+    )
+    def get(self, request):
+        counts = suppressed_counts()
+        return Response(
+            DedupStatsSerializer(
+                [{"scope": scope, "suppressed": n} for scope, n in counts.items()],
+                many=True,
+            ).data
+        )
+
+
 class AdminKPIView(APIView):
     """
     Returns aggregated KPIs for users and reservations.
@@ -43,73 +135,51 @@ class AdminKPIView(APIView):
         return [IsAuthenticated(), RoleRequired("admin")]
 
     @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "fresh",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description="Recompute now instead of returning the cached snapshot.",
+            )
+        ],
         responses={200: AdminKPISerializer},
         operation_summary="Admin: global KPIs",
-        operation_description="Counts for users and reservations, plus 30-day revenue.",
+        operation_description=(
+            "Counts for users and reservations, plus 30-day revenue. Served from a "
+            "snapshot refreshed every KPI_REFRESH_INTERVAL seconds; computed_at "
+            "tells its age."
+        ),
     )
     def get(self, request):
-        now = timezone.now()
-        start_7d = now - timedelta(days=7)
-        start_30d = now - timedelta(days=30)
-
-        # Users KPIs
-        users_total = User.objects.count()
-        users_active = User.objects.filter(is_active=True).count()
-        users_blocked = (
-            getattr(User, "is_blocked", None)
-            and User.objects.filter(is_blocked=True).count()
-            or 0
-        )
-        users_new_7d = (
-            User.objects.filter(created_at__gte=start_7d).count()
-            if hasattr(User, "created_at")
-            else 0
-        )
-        users_new_30d = (
-            User.objects.filter(created_at__gte=start_30d).count()
-            if hasattr(User, "created_at")
-            else 0
-        )
+        fresh = request.query_params.get("fresh", "").lower() in ("1", "true", "yes")
+        return Response(AdminKPISerializer(get_kpis(fresh=fresh)).data)
 
-        # Reservations KPIs
-        res_total = Reservation.objects.count()
-        res_active = Reservation.objects.filter(
-            status__status__in=ACTIVE_STATUSES
-        ).count()
-        res_final = Reservation.objects.filter(
-            status__status__in=FINAL_STATUSES
-        ).count()
-
-        by_status_qs = Reservation.objects.values("status__status").annotate(
-            c=Count("id")
-        )
-        status_counts = {row["status__status"]: row["c"] for row in by_status_qs}
-
-        # consider revenue as total_price for new reservations in last 30d
-        rev_30 = (
-            Reservation.objects.filter(created_at__gte=start_30d)
-            .aggregate(total=Sum("total_price"))
-            .get("total")
-            or 0
-        )
 
-        payload = {
-            "users": {
-                "total": users_total,
-                "active": users_active,
-                "blocked": users_blocked,
-                "new_7d": users_new_7d,
-                "new_30d": users_new_30d,
-            },
-            "reservations": {
-                "total": res_total,
-                "active": res_active,
-                "final": res_final,
-                "by_status": status_counts,
-                "revenue_last_30d": str(rev_30),
-            },
-        }
-        return Response(AdminKPISerializer(payload).data)
+class AdminKPISeriesView(APIView):
+    """
+    Returns bookings, units, revenue and cancellations per day/week/month,
+    answered from the daily rollup tables.
+    """
+
+    def get_permissions(self):
+        return [IsAuthenticated(), RoleRequired("admin")]
+
+    @swagger_auto_schema(
+        query_serializer=KPISeriesQuerySerializer,
+        responses={200: KPISeriesPointSerializer(many=True)},
+        operation_summary="Admin: KPI time series",
+        operation_description=(
+            "Per-period totals by booking date, optionally for one location, "
+            "vehicle type or status. Rollups lag live data by up to "
+            "ROLLUP_INTERVAL + ROLLUP_LAG_SECONDS."
+        ),
+    )
+    def get(self, request):
+        params = KPISeriesQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        points = time_series(**params.validated_data)
+        return Response(KPISeriesPointSerializer(points, many=True).data)
 
 
 def _status_id_ci(name: str) -> int:
@@ -203,17 +273,11 @@ class AdminReservationTransitionView(APIView):
         elif target in (COMPLETED, CANCELLED):
             res.hold_expires_at = None
 
-        # 5) Persist status
+        # 5) Persist status (the status-change email and push are queued in the
+        #    outbox by the Reservation signal, once per transition, inside this
+        #    transaction)
         res.status_id = _status_id_ci(target)
         res.save(update_fields=["status", "hold_expires_at"])
 
-        # 6) Fire-and-forget email
-        try:
-            from api.email_sender.tasks import send_reservation_status_changed_email
-
-            send_reservation_status_changed_email.delay(res.id, current, target)
-        except Exception:
-            pass
-
-        # 7) Response
+        # 6) Response
         return Response(ReservationSerializer(res).data, status=status.HTTP_200_OK)
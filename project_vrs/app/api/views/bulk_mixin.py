@@ -0,0 +1,292 @@
+# api/views/bulk_mixin.py
+from logging import getLogger
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import ProtectedError, RestrictedError, UniqueConstraint
+from django.db.models.deletion import Collector
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from ..serializers.fields import PrefetchedPrimaryKeyRelatedField, as_pk
+from ..utils.field_tracker import TrackedFieldsMixin, tracked_fields_changed
+
+logger = getLogger(__name__)
+
+BULK_MAX_ITEMS = int(getattr(settings, "BULK_MAX_ITEMS", 500))
+
+
+class BulkModelMixin:
+    """
+    Adds ``/<prefix>/bulk/`` to a ModelViewSet:
+
+    - POST   [{...}, ...]                 create (bulk_create)
+    - PATCH  [{"id": 1, ...}, ...]        partial update (bulk_update)
+    - DELETE {"ids": [1, 2, ...]}         delete
+
+    Items are validated with the viewset's serializer; FKs declared as
+    PrefetchedPrimaryKeyRelatedField are resolved from one IN query per
+    relation. All or nothing: if any item is invalid nothing is written and
+    the response (400) carries the status of every item. Writes run in one
+    transaction; tracked_fields_changed is still sent for tracked models,
+    so signal-driven denormalization keeps working.
+    """
+
+    bulk_max_items = BULK_MAX_ITEMS
+    # uniqueness enforced by the serializer only, e.g. [("brand", "model_name")];
+    # the model's unique fields and constraints are checked anyway
+    bulk_unique_fields = ()
+
+    def prepare_bulk(self, objs, fields):
+        """
+        Hook: adjust instances before they are written, return the (possibly
+        extended) set of fields to update (None on create).
+        """
+        return fields
+
+    @swagger_auto_schema(
+        methods=["post", "patch", "delete"],
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+            description='List of objects (PATCH: each with "id"); DELETE: {"ids": [...]}.',
+        ),
+        responses={200: "Per-item status", 400: "Per-item status, nothing written"},
+        operation_summary="Bulk create / update / delete",
+    )
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        if request.method == "DELETE":
+            return self._bulk_delete(request.data)
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Expected a non-empty list of objects."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {"detail": f"At most {self.bulk_max_items} items per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if request.method == "POST":
+            return self._bulk_create(items)
+        return self._bulk_update(items)
+
+    # helpers
+
+    def _bulk_context(self, items) -> dict:
+        """
+        Serializer context with {field: {pk: obj}} for every prefetchable FK
+        field, one IN query each.
+        """
+        serializer = self.get_serializer_class()()
+        related = {}
+        for name, field in serializer.fields.items():
+            if field.read_only or not isinstance(field, PrefetchedPrimaryKeyRelatedField):
+                continue
+            ids = {
+                pk
+                for item in items
+                if isinstance(item, dict) and (pk := as_pk(item.get(name))) is not None
+            }
+            related[name] = field.get_queryset().in_bulk(ids) if ids else {}
+        return {**self.get_serializer_context(), "related_objects": related}
+
+    def _validate(self, items, instances=None):
+        context = self._bulk_context(items)
+        serializer_class = self.get_serializer_class()
+        results, serializers_ = [], []
+        for index, item in enumerate(items):
+            instance = instances[index] if instances is not None else None
+            if instances is not None and instance is None:
+                results.append({"index": index, "status": "error", "errors": {"id": ["Not found."]}})
+                serializers_.append(None)
+                continue
+            serializer = serializer_class(
+                instance, data=item, partial=instance is not None, context=context
+            )
+            if serializer.is_valid():
+                results.append({"index": index, "status": "valid"})
+            else:
+                results.append({"index": index, "status": "error", "errors": serializer.errors})
+            serializers_.append(serializer)
+        self._check_batch_unique(results, serializers_)
+        return results, serializers_
+
+    def _unique_keys(self):
+        model = self.get_queryset().model
+        keys = [
+            (field.name,)
+            for field in model._meta.concrete_fields
+            if field.unique and not field.primary_key
+        ]
+        keys += [tuple(fields) for fields in model._meta.unique_together]
+        keys += [
+            tuple(c.fields)
+            for c in model._meta.constraints
+            if isinstance(c, UniqueConstraint) and c.fields and c.condition is None
+        ]
+        keys += [tuple(fields) for fields in self.bulk_unique_fields]
+        return list(dict.fromkeys(keys))
+
+    def _check_batch_unique(self, results, serializers_):
+        """
+        Items that are valid one by one can still collide with each other
+        (e.g. plates "zz 1" and "ZZ 1" both normalize to "ZZ 1"): compare the
+        normalized values of every unique key across the batch and mark the
+        later items, so nothing reaches the database to fail there.
+        """
+        for key in self._unique_keys():
+            seen = {}
+            for result, serializer in zip(results, serializers_):
+                if result["status"] == "error":
+                    continue
+                data, instance = serializer.validated_data, serializer.instance
+                values = tuple(
+                    getattr(v, "pk", v)
+                    for v in (
+                        data[name] if name in data else getattr(instance, name, None)
+                        for name in key
+                    )
+                )
+                if None in values:
+                    continue
+                if values in seen:
+                    result.update(
+                        status="error",
+                        errors={key[-1]: [f"Duplicate of item {seen[values]}."]},
+                    )
+                else:
+                    seen[values] = result["index"]
+
+    @staticmethod
+    def _rejected(results):
+        return Response({"results": results, "written": 0}, status=status.HTTP_400_BAD_REQUEST)
+
+    @staticmethod
+    def _conflict(error):
+        # a race with another writer; the driver's message stays in the log
+        logger.warning("Bulk write rejected by the database: %s", error)
+        return Response(
+            {"detail": "Conflicts with data written meanwhile, nothing written. Retry."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    def _bulk_create(self, items):
+        results, serializers_ = self._validate(items)
+        if any(r["status"] == "error" for r in results):
+            return self._rejected(results)
+
+        model = self.get_queryset().model
+        objs = [model(**serializer.validated_data) for serializer in serializers_]
+        self.prepare_bulk(objs, None)
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(objs)
+        except IntegrityError as e:
+            return self._conflict(e)
+        for result, obj in zip(results, objs):
+            result.update(status="created", id=obj.pk)
+        return Response({"results": results, "written": len(objs)}, status=status.HTTP_201_CREATED)
+
+    def _bulk_update(self, items):
+        ids = [as_pk(item.get("id")) if isinstance(item, dict) else None for item in items]
+        found = self.get_queryset().in_bulk([pk for pk in ids if pk is not None])
+        seen, instances = set(), []
+        for pk in ids:
+            # a repeated id would be written twice from stale values
+            instances.append(found.get(pk) if pk not in seen else None)
+            seen.add(pk)
+
+        results, serializers_ = self._validate(items, instances)
+        if any(r["status"] == "error" for r in results):
+            return self._rejected(results)
+
+        fields = set()
+        for serializer in serializers_:
+            for attr, value in serializer.validated_data.items():
+                setattr(serializer.instance, attr, value)
+            fields.update(serializer.validated_data)
+        if not fields:
+            for result, pk in zip(results, ids):
+                result.update(status="unchanged", id=pk)
+            return Response({"results": results, "written": 0})
+
+        objs = [serializer.instance for serializer in serializers_]
+        fields = self.prepare_bulk(objs, fields)
+        model = self.get_queryset().model
+        tracked = issubclass(model, TrackedFieldsMixin)
+        changes = [obj.tracked_changes() if tracked else {} for obj in objs]
+        try:
+            with transaction.atomic():
+                model.objects.bulk_update(objs, sorted(fields))
+                for obj, change in zip(objs, changes):
+                    if change:
+                        tracked_fields_changed.send(
+                            sender=model, pk=obj.pk, changes=change, instance=obj
+                        )
+        except IntegrityError as e:
+            return self._conflict(e)
+        for obj in objs:
+            if tracked:
+                obj._snapshot_tracked_fields()
+        for result, obj in zip(results, objs):
+            result.update(status="updated", id=obj.pk)
+        return Response({"results": results, "written": len(objs)})
+
+    def _bulk_delete(self, data):
+        ids = data.get("ids") if isinstance(data, dict) else data
+        if not isinstance(ids, list) or not ids:
+            return Response(
+                {"detail": 'Expected {"ids": [...]}.'}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > self.bulk_max_items:
+            return Response(
+                {"detail": f"At most {self.bulk_max_items} items per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        pks = [as_pk(pk) for pk in ids]
+        queryset = self.get_queryset()
+        existing = set(
+            queryset.filter(pk__in=[pk for pk in pks if pk is not None]).values_list("pk", flat=True)
+        )
+        try:
+            with transaction.atomic():
+                queryset.model.objects.filter(pk__in=existing).delete()
+        except (ProtectedError, RestrictedError):
+            blocked = self._blocked_ids(queryset, existing)
+            results = []
+            for i, pk in enumerate(pks):
+                if pk not in existing:
+                    results.append({"index": i, "id": pk, "status": "not_found"})
+                elif pk in blocked:
+                    results.append(
+                        {"index": i, "id": pk, "status": "error", "errors": {"id": ["Still referenced."]}}
+                    )
+                else:
+                    results.append({"index": i, "id": pk, "status": "valid"})
+            return self._rejected(results)
+
+        results = [
+            {"index": i, "id": pk, "status": "deleted" if pk in existing else "not_found"}
+            for i, pk in enumerate(pks)
+        ]
+        return Response({"results": results, "written": len(existing)})
+
+    @staticmethod
+    def _blocked_ids(queryset, ids) -> set:
+        """
+        The ids whose own deletion is refused, directly or further down a
+        cascade (one deletion collector per id; only run when a delete failed).
+        """
+        blocked = set()
+        for obj in queryset.model._default_manager.filter(pk__in=ids):
+            try:
+                Collector(using=queryset.db).collect([obj])
+            except (ProtectedError, RestrictedError):
+                blocked.add(obj.pk)
+        return blocked
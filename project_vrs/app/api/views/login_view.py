@@ -1,5 +1,12 @@
-from rest_framework_simplejwt.views import TokenObtainPairView
-from ..serializers.login_serializer import CustomTokenObtainPairSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from ..serializers.login_serializer import (
+    CurrentClaimsTokenRefreshSerializer,
+    CustomTokenObtainPairSerializer,
+)
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+
+
+class CurrentClaimsTokenRefreshView(TokenRefreshView):
+    serializer_class = CurrentClaimsTokenRefreshSerializer
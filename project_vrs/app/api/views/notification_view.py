@@ -1,7 +1,15 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
 from ..models import Notification
-from ..serializers.notification_serializer import NotificationSerializer
+from ..serializers.notification_serializer import (
+    NotificationSerializer,
+    NotificationMarkReadSerializer,
+    NotificationUnreadCountSerializer,
+)
 from ..custom_permissions.mixed_role_permissions import RoleRequired
+from ..utils.unread import unread_count, mark_notifications_read
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -19,4 +27,38 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         return [RoleRequired("manager", "admin")]
 
     def get_queryset(self):
-        return Notification.objects.filter(recipient=self.request.user).order_by("-created_at")
+        return Notification.objects.filter(recipient_id=self.request.user.id).order_by("-created_at")
+
+    @swagger_auto_schema(
+        responses={200: NotificationUnreadCountSerializer},
+        operation_summary="Unread notifications count",
+    )
+    @action(detail=False, methods=["get"], url_path="unread_count")
+    def unread_count(self, request):
+        """
+        GET /api/notifications/unread_count/ -> {"unread": n}
+        Reads the denormalized counter (one PK lookup), no scan of notifications.
+        """
+        data = {"unread": unread_count(request.user.id)}
+        return Response(NotificationUnreadCountSerializer(data).data)
+
+    @swagger_auto_schema(
+        request_body=NotificationMarkReadSerializer,
+        responses={200: NotificationUnreadCountSerializer},
+        operation_summary="Mark notifications read up to an id",
+        operation_description='Body example: {"up_to_id": 42} (omit to mark all).',
+    )
+    @action(detail=False, methods=["post"], url_path="mark_read")
+    def mark_read(self, request):
+        """
+        POST /api/notifications/mark_read/ {"up_to_id": X}
+        Marks all of the user's unread notifications with id <= X in one UPDATE.
+        """
+        ser = NotificationMarkReadSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+
+        marked, unread = mark_notifications_read(
+            request.user.id, ser.validated_data.get("up_to_id")
+        )
+        data = {"unread": unread, "marked": marked}
+        return Response(NotificationUnreadCountSerializer(data).data, status=status.HTTP_200_OK)
@@ -1,6 +1,4 @@
 from django.db.models import Count, Exists, OuterRef
-from django.utils.dateparse import parse_datetime
-from django.utils import timezone
 from rest_framework import viewsets, permissions
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -9,6 +7,7 @@ from rest_framework.filters import OrderingFilter, SearchFilter
 from django.shortcuts import get_object_or_404
 
 from ..models import PhysicalVehicle, PhysicalVehicleReservation, Location, Brand, Model, VehicleType, EngineType, Vehicle
+from ..utils.availability import apply_vehicle_filters, available_units, parse_range
 from ..serializers.public_vehicle_serializer import (
     PublicVehicleAvailabilitySerializer,
     LocationSerializer,
@@ -24,20 +23,8 @@ class PublicVehicleAvailabilityViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
 
     def _parse_range(self, start_str, end_str):
-        start = parse_datetime(start_str or "")
-        end = parse_datetime(end_str or "")
-        if not start or not end:
-            raise ValueError(
-                "start and end must be ISO8601 datetimes (e.g. 2025-09-20T10:00:00Z)."
-            )
-        if timezone.is_naive(start):
-            start = timezone.make_aware(start, timezone.get_current_timezone())
-        if timezone.is_naive(end):
-            end = timezone.make_aware(end, timezone.get_current_timezone())
-        if start >= end:
-            raise ValueError("start must be before end")
-        return start, end
-    
+        return parse_range(start_str, end_str)
+
     def retrieve(self, request, pk=None):
         """
         Detail endpoint for a conceptual Vehicle (pk = Vehicle.id).
@@ -47,7 +34,7 @@ class PublicVehicleAvailabilityViewSet(viewsets.ViewSet):
         # Make sure the vehicle exists
         vehicle = get_object_or_404(
             Vehicle.objects.select_related(
-                "model__brand", "vehicle_type", "engine_type"
+                "model", "brand", "vehicle_type", "engine_type"
             ),
             pk=pk,
         )
@@ -99,7 +86,7 @@ class PublicVehicleAvailabilityViewSet(viewsets.ViewSet):
 
         data = {
             "vehicle_id": vehicle.id,
-            "brand": vehicle.model.brand.brand_name,
+            "brand": vehicle.brand.brand_name,
             "model": vehicle.model.model_name,
             "vehicle_type": vehicle.vehicle_type.vehicle_type,
             "engine_type": vehicle.engine_type.engine_type,
@@ -143,78 +130,20 @@ class PublicVehicleAvailabilityViewSet(viewsets.ViewSet):
             except ValueError as e:
                 return Response({"detail": str(e)}, status=400)
 
-        BLOCKING = ["active","pending"]
-
         # --- build base queryset in 3 scenarios ---
-        if location_id and start and end:
+        if start and end:
             # A) Availability in a specific location (current behavior)
-            overlapping = PhysicalVehicleReservation.objects.filter(
-                physical_vehicle_id=OuterRef("pk"),
-                reservation__start_date__lt=end,
-                reservation__end_date__gt=start,
-                reservation__status__status__in=BLOCKING,
-            )
-            qs = (
-                PhysicalVehicle.objects.filter(location_id=location_id)
-                .annotate(is_blocked=Exists(overlapping))
-                .filter(is_blocked=False)
-            )
-
-        elif (not location_id) and start and end:
             # B) Availability across ALL locations (free units globally)
-            overlapping = PhysicalVehicleReservation.objects.filter(
-                physical_vehicle_id=OuterRef("pk"),
-                reservation__start_date__lt=end,
-                reservation__end_date__gt=start,
-                reservation__status__status__in=BLOCKING,
-            )
-            qs = (
-                PhysicalVehicle.objects.all()
-                .annotate(is_blocked=Exists(overlapping))
-                .filter(is_blocked=False)
-            )
-
+            qs = available_units(start, end, location_id)
         else:
             # C) No dates → just inventory counts (no availability filtering)
             qs = PhysicalVehicle.objects.all()
 
-        brand_id = request.query_params.get("brand_id")
-        model_id = request.query_params.get("model_id")
-        vehicle_type = request.query_params.get("vehicle_type")
-        engine_type = request.query_params.get("engine_type")
-        price_min = request.query_params.get("price_min")
-        price_max = request.query_params.get("price_max")
-        seats_min = request.query_params.get("seats_min")
-        seats_max = request.query_params.get("seats_max")
-
-        if brand_id:
-            qs = qs.filter(vehicle__brand_id=brand_id)
-        if model_id:
-            qs = qs.filter(vehicle__model_id=model_id)
-        if vehicle_type:
-            qs = qs.filter(vehicle__vehicle_type__vehicle_type__icontains=vehicle_type)
-        if engine_type:
-            qs = qs.filter(vehicle__engine_type__engine_type__icontains=engine_type)
-        if price_min:
-            qs = qs.filter(vehicle__price_per_day__gte=price_min)
-        if price_max:
-            qs = qs.filter(vehicle__price_per_day__lte=price_max)
-        if seats_min:
-            try:
-                seats_min_val = int(seats_min)
-                qs = qs.filter(vehicle__amount_seats__gte=seats_min_val)
-            except ValueError:
-                return Response({"detail": "seats_min must be an integer."}, status=400)
-
-        if seats_max:
-            try:
-                seats_max_val = int(seats_max)
-                qs = qs.filter(vehicle__amount_seats__lte=seats_max_val)
-            except ValueError:
-                return Response({"detail": "seats_max must be an integer."}, status=400)
+        try:
+            qs = apply_vehicle_filters(qs, request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
 
-        
-        
         # ------------------------------
         # Aggregate to conceptual vehicles
         # In all branches we keep the same payload shape with "available_count"
@@ -224,7 +153,7 @@ class PublicVehicleAvailabilityViewSet(viewsets.ViewSet):
         qs = (
             qs.values(
                 "vehicle_id",
-                "vehicle__model__brand__brand_name",
+                "vehicle__brand__brand_name",
                 "vehicle__model__model_name",
                 "vehicle__vehicle_type__vehicle_type",
                 "vehicle__engine_type__engine_type",
@@ -232,7 +161,7 @@ class PublicVehicleAvailabilityViewSet(viewsets.ViewSet):
                 "vehicle__price_per_day",
             )
             .annotate(available_count=Count("id"))
-            .order_by("vehicle__model__brand__brand_name", "vehicle__model__model_name")
+            .order_by("vehicle__brand__brand_name", "vehicle__model__model_name")
         )
         random_count = request.query_params.get("random")
         if random_count:
@@ -245,7 +174,7 @@ class PublicVehicleAvailabilityViewSet(viewsets.ViewSet):
         data = [
             {
                 "vehicle_id": row["vehicle_id"],
-                "brand": row["vehicle__model__brand__brand_name"],
+                "brand": row["vehicle__brand__brand_name"],
                 "model": row["vehicle__model__model_name"],
                 "vehicle_type": row["vehicle__vehicle_type__vehicle_type"],
                 "engine_type": row["vehicle__engine_type__engine_type"],
@@ -0,0 +1,90 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+
+from api.custom_permissions.mixed_role_permissions import RoleRequired
+from api.reporting import export
+from api.reporting.utilization import request_report
+from api.serializers.report_serializer import (
+    ReservationExportQuerySerializer,
+    UtilizationQuerySerializer,
+    UtilizationReportSerializer,
+)
+
+
+class UtilizationReportView(APIView):
+    """
+    Fleet utilization per unit, vehicle and location, built in the background.
+    """
+
+    def get_permissions(self):
+        return [IsAuthenticated(), RoleRequired("manager", "admin")]
+
+    @swagger_auto_schema(
+        query_serializer=UtilizationQuerySerializer,
+        responses={200: UtilizationReportSerializer, 202: "Report is being built"},
+        operation_summary="Fleet utilization report",
+        operation_description=(
+            "Share of hours booked, idle gaps and bookings per physical vehicle, "
+            "vehicle and location. The first request queues the build and "
+            "answers 202; poll until 200. Results are cached for "
+            "REPORT_CACHE_TTL seconds, refresh=true rebuilds."
+        ),
+    )
+    def get(self, request):
+        query = UtilizationQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = query.validated_data
+        params = {
+            "start": data["start"].isoformat(),
+            "end": data["end"].isoformat(),
+            "location_id": data.get("location_id"),
+        }
+        report = request_report(params, refresh=data["refresh"])
+        if report is None:
+            return Response({"status": "pending", **params}, status=status.HTTP_202_ACCEPTED)
+        return Response(UtilizationReportSerializer(report).data)
+
+
+class ReservationExportView(APIView):
+    """
+    Streams reservations with their line items as CSV or JSON lines.
+    """
+
+    CONTENT_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+    def get_permissions(self):
+        return [IsAuthenticated(), RoleRequired("admin")]
+
+    @swagger_auto_schema(
+        query_serializer=ReservationExportQuerySerializer,
+        responses={200: "CSV or JSON-lines file"},
+        operation_summary="Admin: export reservations",
+        operation_description=(
+            "One flat row per line item, read through a server-side cursor and "
+            "streamed, so memory stays flat whatever the row count."
+        ),
+    )
+    def get(self, request):
+        query = ReservationExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        file_format = params.pop("file_format")
+
+        queryset = export.export_queryset(**params)
+        lines = (export.csv_lines if file_format == "csv" else export.jsonl_lines)(queryset)
+        # Under ASGI (daphne) only an async iterator is streamed
+        asgi = hasattr(request._request, "scope")
+        response = StreamingHttpResponse(
+            export.abatched(lines) if asgi else export.batched(lines),
+            content_type=self.CONTENT_TYPES[file_format],
+        )
+        stamp = timezone.localtime().strftime("%Y%m%d-%H%M")
+        response["Content-Disposition"] = (
+            f'attachment; filename="reservations-{stamp}.{file_format}"'
+        )
+        return response
@@ -7,7 +7,8 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Prefetch
+from django.utils.decorators import method_decorator
+from drf_yasg.utils import swagger_auto_schema
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
@@ -25,6 +26,7 @@ from ..serializers.reservation_serializer import (
     CancelReservationSerializer,
     ReservationCreateSerializer,
 )
+from ..serializers.sparse import SPARSE_QUERY_PARAMETERS, optimize_queryset
 from ..utils.broadcast import broadcast_notification
 
 
@@ -56,6 +58,11 @@ ACTIVE_STATUSES = {"pending", "confirmed", "active"}
 #             async_to_sync(channel_layer.group_send)(
 #                 role, {"type": "notify", "message": message}
 #             )
+sparse_schema = swagger_auto_schema(manual_parameters=SPARSE_QUERY_PARAMETERS)
+
+
+@method_decorator(name="list", decorator=sparse_schema)
+@method_decorator(name="retrieve", decorator=sparse_schema)
 class ReservationViewSet(viewsets.ModelViewSet):
     """
     User-facing reservations API.
@@ -74,27 +81,13 @@ class ReservationViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Always scope to the authenticated user's reservations.
+        Joins and prefetches follow the rendered fields (?fields=/?expand=).
         """
         user = self.request.user
 
-        base = (
-            Reservation.objects.select_related(
-                "status", "pickup_location", "dropoff_location", "user"
-            )
-            .prefetch_related(
-                Prefetch(
-                    "physicalvehiclereservation_set",
-                    queryset=PhysicalVehicleReservation.objects.select_related(
-                        "physical_vehicle",
-                        "physical_vehicle__vehicle",
-                        "physical_vehicle__vehicle__model",
-                        "physical_vehicle__vehicle__model__brand",
-                        "physical_vehicle__location",
-                    ),
-                )
-            )
-            .filter(user_id=user.id)
-            .order_by("-created_at")
+        base = optimize_queryset(
+            Reservation.objects.filter(user_id=user.id).order_by("-created_at"),
+            ReservationSerializer(context=self.get_serializer_context()),
         )
 
         status_filter = (self.request.query_params.get("status") or "").lower()
@@ -196,7 +189,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
         # create reservation
         res = Reservation.objects.create(
-            user=request.user,
+            user_id=request.user.id,
             start_date=start,
             end_date=end,
             status=pending,
@@ -217,13 +210,15 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
         read_ser = ReservationSerializer(res, context={"request": request})
 
-        # Broadcast notification to user and managers
+        # Broadcast notification to user and managers (thin: ids only, clients refetch)
         payload = {
             "action": "created",
             "reservation": read_ser.data,
             "message": f"Reservation #{res.id} created",
         }
-        broadcast_notification(payload, user_id=request.user.id, roles=["managers"])
+        broadcast_notification(
+            payload, user_id=request.user.id, roles=["managers"], thin=True
+        )
 
         return Response(read_ser.data, status=status.HTTP_201_CREATED)
 
@@ -268,6 +263,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
     # Cancel (PATCH)
 
+    @transaction.atomic
     def partial_update(self, request, *args, **kwargs):
         """
         Only allow a user to cancel their own reservation,
@@ -295,20 +291,8 @@ class ReservationViewSet(viewsets.ModelViewSet):
         reservation.status = cancel_status
         reservation.save(update_fields=["status"])
 
-        payload = {
-            "action": "cancelled",
-            "reservation": ReservationSerializer(reservation, context={"request": request}).data,
-            "message": f"Reservation #{reservation.id} cancelled",
-        }
+        # The email and the push for this transition are produced once by the
+        # status signal (api/signals.py), whoever made the change
+        data = ReservationSerializer(reservation, context={"request": request}).data
 
-        # fire only after the DB row is committed so GET sees it
-        transaction.on_commit(lambda: broadcast_notification(
-            payload,
-            user_id=request.user.id,      # persist for the creator
-            roles=["managers"]            # live fanout to managers (persist for them is optional)
-        ))
-
-        return Response(
-            ReservationSerializer(reservation, context={"request": request}).data,
-            status=status.HTTP_200_OK,
-        )
+        return Response(data, status=status.HTTP_200_OK)
@@ -2,9 +2,17 @@ from ..serializers.role_serializer import *
 from ..models import *
 from rest_framework.renderers import JSONRenderer, BrowsableAPIRenderer
 from rest_framework import viewsets, generics
+from rest_framework.filters import SearchFilter
+from rest_framework.pagination import CursorPagination
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import IsAuthenticated
 from ..custom_permissions.admin_permission import IsAdmin
-from ..serializers.user_serializer import UserProfileSerializer, AdminUserProfilesSerializer
+from ..serializers.user_serializer import (
+    UserProfileSerializer,
+    AdminUserProfilesSerializer,
+    AdminUserListSerializer,
+)
+from ..authentication import get_db_user
 
 class UserProfileViewSet(generics.RetrieveUpdateAPIView):
     """
@@ -17,11 +25,48 @@ class UserProfileViewSet(generics.RetrieveUpdateAPIView):
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated]
     def get_object(self):
-        return self.request.user
+        # request.user is a claims-only principal; the profile needs the real row
+        return get_db_user(self.request.user)
+
+class AdminUserCursorPagination(CursorPagination):
+    """
+    Keyset pagination (WHERE id < last seen), no COUNT and no OFFSET scan.
+    """
+
+    ordering = "-id"
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
 
 class AdminUserProfilesViewSet(viewsets.ModelViewSet):
-    """Admins can manage all users (full fields)."""
+    """
+    Admins can manage all users (full fields).
+    The list is a lean one-query page: ?search= (username/email),
+    ?role_id__role_name=, ?is_blocked=, ?is_active=, cursor pagination.
+    """
 
-    queryset = User.objects.all()
     serializer_class = AdminUserProfilesSerializer
-    permission_classes = [IsAdmin]
\ No newline at end of file
+    permission_classes = [IsAdmin]
+    pagination_class = AdminUserCursorPagination
+
+    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filterset_fields = {
+        "role_id": ["exact"],
+        "role_id__role_name": ["exact", "iexact"],
+        "is_blocked": ["exact"],
+        "is_active": ["exact"],
+    }
+    search_fields = ["username", "email"]
+
+    def get_queryset(self):
+        qs = User.objects.select_related("role_id")
+        if self.action != "list":
+            # the full serializer renders the M2Ms; one query each, not per user
+            qs = qs.prefetch_related("groups", "user_permissions")
+        return qs
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return AdminUserListSerializer
+        return AdminUserProfilesSerializer
\ No newline at end of file
@@ -1,5 +1,13 @@
-from rest_framework import viewsets, permissions
+import json
+
+from django.utils.decorators import method_decorator
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.response import Response
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
 from ..models import Vehicle, Brand, EngineType, VehicleType, Model, PhysicalVehicle, Location
 from ..serializers.vehicle_serializer import (
     VehicleSerializer,
@@ -8,42 +16,98 @@ from ..serializers.vehicle_serializer import (
     VehicleTypeSerializer,
     ModelSerializer,
     PhysicalVehicleSerializer,
-    LocationSerializer
+    LocationSerializer,
+    FleetImportReportSerializer,
 )
+from ..serializers.sparse import SPARSE_QUERY_PARAMETERS, optimize_queryset
 from ..custom_permissions.mixed_role_permissions import RoleRequired
+from .bulk_mixin import BulkModelMixin
+from django_filters import rest_framework as filters
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import IsAuthenticated
+from ..utils.fleet_import import FleetImportError, import_fleet, parse_rows
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    """
+    ?field__in=1,2,3
+    """
+
+
+class VehicleFilter(filters.FilterSet):
+    """
+    Id filters hit the FK columns directly (vehicle_brand_type_price_idx and
+    friends, see Vehicle.Meta). The name filters are kept for existing
+    clients; the brand one reads the denormalized Vehicle.brand (one join
+    instead of two through Model).
+    """
+
+    brand_id = filters.NumberFilter(field_name="brand_id")
+    brand_id__in = NumberInFilter(field_name="brand_id", lookup_expr="in")
+    model_id = filters.NumberFilter(field_name="model_id")
+    vehicle_type_id = filters.NumberFilter(field_name="vehicle_type_id")
+    vehicle_type_id__in = NumberInFilter(field_name="vehicle_type_id", lookup_expr="in")
+    engine_type_id = filters.NumberFilter(field_name="engine_type_id")
+    engine_type_id__in = NumberInFilter(field_name="engine_type_id", lookup_expr="in")
+    model__brand__brand_name = filters.CharFilter(field_name="brand__brand_name")
+
+    class Meta:
+        model = Vehicle
+        fields = {
+            "vehicle_type__vehicle_type": ["exact", "in"],
+            "engine_type__engine_type": ["exact", "in"],
+            "model__model_name": ["exact", "icontains"],
+            "price_per_day": ["gte", "lte"],
+            "amount_seats": ["gte", "lte"],
+        }
+
+
+class PhysicalVehicleFilter(filters.FilterSet):
+    """
+    Brand filters go through the denormalized Vehicle.brand; the legacy
+    parameter names still work.
+    """
+
+    vehicle_id = filters.NumberFilter(field_name="vehicle_id")
+    location_id = filters.NumberFilter(field_name="location_id")
+    brand_id = filters.NumberFilter(field_name="vehicle__brand_id")
+    vehicle__model__brand__brand_name = filters.CharFilter(field_name="vehicle__brand__brand_name")
+    vehicle__model__brand__brand_name__icontains = filters.CharFilter(
+        field_name="vehicle__brand__brand_name", lookup_expr="icontains"
+    )
+
+    class Meta:
+        model = PhysicalVehicle
+        fields = {
+            "car_plate_number": ["exact", "icontains"],
+            "vehicle__model__model_name": ["exact", "icontains"],  # filter by model name
+        }
+
+
+sparse_schema = swagger_auto_schema(manual_parameters=SPARSE_QUERY_PARAMETERS)
 
 
 # VvehicleView
-class VehicleViewSet(viewsets.ModelViewSet):
+@method_decorator(name="list", decorator=sparse_schema)
+@method_decorator(name="retrieve", decorator=sparse_schema)
+class VehicleViewSet(BulkModelMixin, viewsets.ModelViewSet):
     serializer_class = VehicleSerializer
 
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = {
-        "vehicle_type__vehicle_type": ["exact", "in"],
-        "engine_type__engine_type": ["exact", "in"],
-        "model__brand__brand_name": ["exact"],
-        "model__model_name": ["exact", "icontains"],
-        "price_per_day": ["gte", "lte"],
-        "amount_seats": ["gte", "lte"],
-    }
-    search_fields = ["model__model_name", "model__brand__brand_name"]
+    filterset_class = VehicleFilter
+    search_fields = ["model__model_name", "brand__brand_name"]
     ordering_fields = ["price_per_day", "amount_seats", "id"]
     ordering = ["id"]
 
     def get_queryset(self):
         """
-        select_related prefetches FK targets in the same query:
-        - vehicle_type, engine_type, model, model.brand
+        select_related joins the FK targets the response reads (vehicle_type,
+        engine_type, model; fewer with ?fields=) in the same query.
         This avoids extra SQL per row.
         """
-        return (
-            Vehicle.objects.select_related(
-                "vehicle_type", "engine_type", "model", "model__brand"
-            )
-            .all()
-            .order_by("id")
+        return optimize_queryset(
+            Vehicle.objects.all().order_by("id"),
+            self.get_serializer_class()(context=self.get_serializer_context()),
         )
 
     def get_permissions(self):
@@ -54,9 +118,16 @@ class VehicleViewSet(viewsets.ModelViewSet):
             return [RoleRequired("user", "manager", "admin")]
         return [RoleRequired("manager", "admin")]
 
+    def prepare_bulk(self, objs, fields):
+        # bulk writes skip Vehicle.save(); keep the denormalized brand in line
+        changed = [obj.sync_brand() for obj in objs]
+        if fields is not None and any(changed):
+            fields = {*fields, "brand"}
+        return fields
+
 
 # BrandView
-class BrandViewSet(viewsets.ModelViewSet):
+class BrandViewSet(BulkModelMixin, viewsets.ModelViewSet):
 
     queryset = Brand.objects.all().order_by("id")
     serializer_class = BrandSerializer
@@ -82,7 +153,7 @@ class BrandViewSet(viewsets.ModelViewSet):
 
 
 # EngineTypeView
-class EngineTypeViewSet(viewsets.ModelViewSet):
+class EngineTypeViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = EngineType.objects.all().order_by("id")
     serializer_class = EngineTypeSerializer
 
@@ -102,7 +173,7 @@ class EngineTypeViewSet(viewsets.ModelViewSet):
 
 
 # VehicleTypeView
-class VehicleTypeViewSet(viewsets.ModelViewSet):
+class VehicleTypeViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = VehicleType.objects.all().order_by("id")
     serializer_class = VehicleTypeSerializer
 
@@ -122,8 +193,10 @@ class VehicleTypeViewSet(viewsets.ModelViewSet):
 
 
 # ModelView
-class ModelViewSet(viewsets.ModelViewSet):
+class ModelViewSet(BulkModelMixin, viewsets.ModelViewSet):
     serializer_class = ModelSerializer
+    # checked by ModelSerializer.validate(), not by a DB constraint
+    bulk_unique_fields = [("brand", "model_name")]
 
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = {
@@ -161,33 +234,25 @@ Common use cases:
 """
 
 
-class PhysicalVehicleViewSet(viewsets.ModelViewSet):
+@method_decorator(name="list", decorator=sparse_schema)
+@method_decorator(name="retrieve", decorator=sparse_schema)
+class PhysicalVehicleViewSet(BulkModelMixin, viewsets.ModelViewSet):
     serializer_class = PhysicalVehicleSerializer
 
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = {
-        "car_plate_number": ["exact", "icontains"],
-        "vehicle__model__brand__brand_name": [
-            "exact",
-            "icontains",
-        ],  # filter by brand name
-        "vehicle__model__model_name": ["exact", "icontains"],  # filter by model name
-    }
+    filterset_class = PhysicalVehicleFilter
     search_fields = [
         "car_plate_number",
-        "vehicle__model__brand__brand_name",
+        "vehicle__brand__brand_name",
         "vehicle__model__model_name",
     ]
     ordering_fields = ["car_plate_number", "id"]
     ordering = ["id"]
 
     def get_queryset(self):
-        return (
-            PhysicalVehicle.objects.select_related(
-                "vehicle", "vehicle__model", "vehicle__model__brand"
-            )
-            .all()
-            .order_by("id")
+        return optimize_queryset(
+            PhysicalVehicle.objects.all().order_by("id"),
+            self.get_serializer_class()(context=self.get_serializer_context()),
         )
 
     def get_permissions(self):
@@ -199,3 +264,58 @@ class PhysicalVehicleViewSet(viewsets.ModelViewSet):
         else:
             permission_classes = [RoleRequired("manager", "admin")]
         return permission_classes
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "dry_run", openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+                description="Validate only, write nothing.",
+            ),
+        ],
+        # the view also takes JSON, so swagger can't render the multipart file field
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "car_plate_number": openapi.Schema(type=openapi.TYPE_STRING),
+                    "vehicle_id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    "location_id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                },
+            ),
+        ),
+        responses={200: FleetImportReportSerializer, 400: FleetImportReportSerializer},
+        operation_summary="Bulk import physical vehicles",
+        operation_description=(
+            "Upload a CSV (car_plate_number,vehicle_id,location_id) or JSON file "
+            "as multipart field `file`, or POST a JSON list of "
+            "{car_plate_number, vehicle_id, location_id}. All rows are validated "
+            "in one pass; nothing is written unless every row is valid."
+        ),
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser, JSONParser],
+    )
+    def bulk_import(self, request):
+        """
+        POST /api/physical-vehicles/import/?dry_run=1
+        """
+        upload = request.FILES.get("file")
+        try:
+            if upload is not None:
+                file_format = "json" if upload.name.lower().endswith(".json") else "csv"
+                rows = parse_rows(upload.read(), file_format)
+            else:
+                rows = parse_rows(json.dumps(request.data), "json")
+        except FleetImportError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get("dry_run", "").lower() in ("1", "true", "yes")
+        report = import_fleet(rows, dry_run=dry_run)
+        return Response(
+            FleetImportReportSerializer(report).data,
+            status=status.HTTP_400_BAD_REQUEST if report["errors"] else status.HTTP_200_OK,
+        )
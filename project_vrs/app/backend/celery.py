@@ -1,5 +1,8 @@
 import os
+import time
 from celery import Celery
+from celery.signals import before_task_publish
+from kombu import Queue
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -19,3 +22,72 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 app = Celery("backend")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+# Queues, most urgent first. Tasks pick theirs with @shared_task(queue=...);
+# each queue has its own worker pool (see docker-compose.yml)
+QUEUE_CRITICAL = "critical"  # outbox relay, hold expiry: small, latency-sensitive
+QUEUE_NOTIFICATIONS = "notifications"  # emails and other user-facing fan-out
+QUEUE_REPORTS = "reports"  # retention purges, reports, exports: slow, bulk
+QUEUES = (QUEUE_CRITICAL, QUEUE_NOTIFICATIONS, QUEUE_REPORTS)
+
+# Worker pool per queue. docker-compose.yml starts each worker with
+# `celery -A backend worker $(python -m backend.worker_args <queue>)`;
+# CELERY_<QUEUE>_CONCURRENCY / CELERY_<QUEUE>_PREFETCH override the numbers.
+QUEUE_WORKER_OPTS = {
+    # no prefetch: a relay pass never waits behind another one
+    QUEUE_CRITICAL: {"concurrency": 2, "prefetch_multiplier": 1},
+    # short I/O-bound sends
+    QUEUE_NOTIFICATIONS: {"concurrency": 4, "prefetch_multiplier": 4},
+    # long jobs: one at a time, handed out only to an idle process
+    QUEUE_REPORTS: {"concurrency": 1, "prefetch_multiplier": 1, "optimization": "fair"},
+}
+
+# Priorities within a queue, set per task with @shared_task(priority=...).
+# The broker is Redis: lower is served first, and each step is its own list
+# ("<queue>" for 0, "<queue>:<step>" otherwise, see api/utils/queues.py).
+PRIORITY_HIGH = 0  # the critical path: outbox relay, transactional emails
+PRIORITY_DEFAULT = 3
+PRIORITY_LOW = 6  # housekeeping that may wait: purges, rollups
+PRIORITY_STEPS = [0, 3, 6, 9]
+PRIORITY_SEP = ":"
+
+app.conf.task_queues = tuple(Queue(name) for name in QUEUES)
+app.conf.task_default_queue = QUEUE_NOTIFICATIONS
+# without it an unprioritized task would be published at 0, the top step
+app.conf.task_default_priority = PRIORITY_DEFAULT
+app.conf.broker_transport_options = {
+    "priority_steps": PRIORITY_STEPS,
+    "sep": PRIORITY_SEP,
+    "queue_order_strategy": "priority",
+}
+
+
+def worker_args(queue: str) -> list[str]:
+    """
+    Command-line options of the worker for ``queue`` (see QUEUE_WORKER_OPTS).
+    """
+    opts = QUEUE_WORKER_OPTS[queue]
+    env = f"CELERY_{queue.upper()}_"
+    args = [
+        "-Q",
+        queue,
+        "-n",
+        f"{queue}@%h",
+        "-c",
+        os.getenv(env + "CONCURRENCY", str(opts["concurrency"])),
+        "--prefetch-multiplier",
+        os.getenv(env + "PREFETCH", str(opts["prefetch_multiplier"])),
+    ]
+    if opts.get("optimization"):
+        args += ["-O", opts["optimization"]]
+    return args
+
+
+@before_task_publish.connect
+def _stamp_sent_at(headers=None, **kwargs):
+    """
+    Record when a task was published, to report the age of the oldest waiting
+    message per queue (api/utils/queues.py).
+    """
+    if headers is not None:
+        headers.setdefault("sent_at", time.time())
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 from datetime import timedelta
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 
@@ -72,7 +73,8 @@ REST_FRAMEWORK = {
         # 'rest_framework.authentication.TokenAuthentication',
         # 'rest_framework.authentication.SessionAuthentication',
         # "rest_framework.authentication.BasicAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT with a claims-only principal (no per-request user/role queries)
+        "api.authentication.ClaimsJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -151,6 +153,38 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Shared cache (revoked-user set for claim-based auth, ...)
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL") or (
+    f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/2"
+    if REDIS_PASSWORD
+    else f"redis://{REDIS_HOST}:{REDIS_PORT}/2"
+)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_CACHE_URL,
+    }
+}
+
+# WebSocket auth trusts the signed JWT claims; blocked/inactive users are
+# refused through a revoked-user set kept in the cache and re-read every TTL
+WS_REVOCATION_CHECK = os.getenv("WS_REVOCATION_CHECK", "True") == "True"
+AUTH_REVOCATION_CACHE_TTL = int(os.getenv("AUTH_REVOCATION_CACHE_TTL", 30))  # seconds
+
+# Role-group (managers/admins) WS notifications are coalesced into one frame per window
+NOTIFICATION_COALESCE_WINDOW_MS = int(os.getenv("NOTIFICATION_COALESCE_WINDOW_MS", 250))
+
+# Missed-message replay: pushed WS messages carry a global seq and the last
+# WS_REPLAY_BUFFER_SIZE per group are kept in Redis (empty URL = in-process only)
+WS_REPLAY_REDIS_URL = os.getenv("WS_REPLAY_REDIS_URL", REDIS_CACHE_URL)
+WS_REPLAY_BUFFER_SIZE = int(os.getenv("WS_REPLAY_BUFFER_SIZE", 200))
+WS_REPLAY_TTL = int(os.getenv("WS_REPLAY_TTL", 60 * 60 * 24))  # seconds
+
+# Live availability subscriptions (ws/availability/)
+AVAILABILITY_DEBOUNCE_MS = int(os.getenv("AVAILABILITY_DEBOUNCE_MS", 300))
+AVAILABILITY_MAX_SUBSCRIPTIONS = int(os.getenv("AVAILABILITY_MAX_SUBSCRIPTIONS", 10))
+AVAILABILITY_MAX_SUBSCRIPTION_DAYS = int(os.getenv("AVAILABILITY_MAX_SUBSCRIPTION_DAYS", 62))
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -228,6 +262,86 @@ CELERY_ENABLE_UTC = True
 CELERY_TASK_TRACK_STARTED = True
 CELERY_RESULT_EXTENDED = True
 CELERY_RESULT_EXPIRES = 60 * 60 * 24  # 24hours
+# Fire-and-forget tasks use ignore_result=True; their counts, failures and
+# runtimes go to rolling per-minute stats instead (api/utils/task_stats.py)
+TASK_STATS_FLUSH_INTERVAL = float(os.getenv("TASK_STATS_FLUSH_INTERVAL", 5))  # seconds
+TASK_STATS_WINDOW_MINUTES = int(os.getenv("TASK_STATS_WINDOW_MINUTES", 60))
+# Task modules outside api/tasks.py that workers must register
+CELERY_IMPORTS = (
+    "api.email_sender.tasks",
+    "api.outbox.tasks",
+    "api.retention.tasks",
+    "api.reporting.tasks",
+)
+
+# Transactional outbox relay (api/outbox/tasks.py)
+OUTBOX_RELAY_INTERVAL = float(os.getenv("OUTBOX_RELAY_INTERVAL", 2))  # seconds
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 200))
+OUTBOX_MAX_BATCHES_PER_RUN = int(os.getenv("OUTBOX_MAX_BATCHES_PER_RUN", 10))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 10))
+# Task events relayed together go out as one batch call: emails over one SMTP
+# connection, rollup days rebuilt once
+OUTBOX_TASK_BATCHES = {
+    "api.email_sender.tasks.send_reservation_created_email": "api.email_sender.tasks.send_email_batch",
+    "api.email_sender.tasks.send_reservation_status_changed_email": "api.email_sender.tasks.send_email_batch",
+    "api.reporting.tasks.recompute_kpi_rollup_days": "api.reporting.tasks.recompute_kpi_rollup_days_batch",
+}
+# ...and carry a flat template context built for the whole batch at relay time
+OUTBOX_TASK_ENRICHERS = {
+    "api.email_sender.tasks.send_reservation_created_email": "api.email_sender.rendering.attach_snapshots",
+    "api.email_sender.tasks.send_reservation_status_changed_email": "api.email_sender.rendering.attach_snapshots",
+}
+
+# Admin KPI snapshot (api/reporting/kpis.py), recomputed by celery beat
+KPI_REFRESH_INTERVAL = float(os.getenv("KPI_REFRESH_INTERVAL", 60))  # seconds
+# Daily KPI rollups (api/reporting/rollups.py): incremental run interval and
+# how long a changed reservation waits before it is picked up
+ROLLUP_INTERVAL = float(os.getenv("ROLLUP_INTERVAL", 300))  # seconds
+ROLLUP_LAG_SECONDS = float(os.getenv("ROLLUP_LAG_SECONDS", 60))
+# Booking days rebuilt per transaction by update_rollups()
+ROLLUP_BATCH_DAYS = int(os.getenv("ROLLUP_BATCH_DAYS", 31))
+# Background-built reports (api/reporting/utilization.py): how long a result
+# is served from the cache
+REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", 600))
+# Rows fetched per round trip by the streaming reservation export
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+# Rows per INSERT in the bulk fleet import (api/utils/fleet_import.py)
+FLEET_IMPORT_CHUNK_SIZE = int(os.getenv("FLEET_IMPORT_CHUNK_SIZE", 500))
+# Max items per request on the catalog `<resource>/bulk/` endpoints
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 500))
+
+CELERY_BEAT_SCHEDULE = {
+    "relay-outbox": {
+        "task": "api.outbox.tasks.relay_outbox",
+        "schedule": OUTBOX_RELAY_INTERVAL,
+        # a missed run is covered by the next one
+        "options": {"expires": OUTBOX_RELAY_INTERVAL * 5, "queue": "critical"},
+    },
+    "purge-expired-rows": {
+        "task": "api.retention.tasks.purge_expired_rows",
+        "schedule": crontab(hour=3, minute=30),
+        "options": {"queue": "reports"},
+    },
+    "refresh-admin-kpis": {
+        "task": "api.reporting.tasks.refresh_admin_kpis",
+        "schedule": KPI_REFRESH_INTERVAL,
+        "options": {"expires": KPI_REFRESH_INTERVAL, "queue": "reports"},
+    },
+    "update-kpi-rollups": {
+        "task": "api.reporting.tasks.update_kpi_rollups",
+        "schedule": ROLLUP_INTERVAL,
+        "options": {"expires": ROLLUP_INTERVAL, "queue": "reports"},
+    },
+}
+
+# Retention (days); older rows are purged nightly in small chunks
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", 90))
+LOGIN_EVENT_RETENTION_DAYS = int(os.getenv("LOGIN_EVENT_RETENTION_DAYS", 180))
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", 7))
+# A transition is never replayed after this long, so its claims can go
+DEDUP_RETENTION_DAYS = int(os.getenv("DEDUP_RETENTION_DAYS", 30))
+RETENTION_CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", 1000))
+RETENTION_MAX_SECONDS = float(os.getenv("RETENTION_MAX_SECONDS", 300))
 
 EMAIL_BACKEND = os.getenv(
     "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"
@@ -238,4 +352,7 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "True") == "True"
 EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 10))
+# Workers keep one SMTP connection open and reuse it (api/email_sender/connection.py)
+EMAIL_CONNECTION_MAX_IDLE = float(os.getenv("EMAIL_CONNECTION_MAX_IDLE", 30))  # seconds
+EMAIL_CONNECTION_MAX_MESSAGES = int(os.getenv("EMAIL_CONNECTION_MAX_MESSAGES", 100))
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "no-reply@localhost")
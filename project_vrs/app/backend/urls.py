@@ -31,11 +31,10 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, re_path, include
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
-from api.views.login_view import CustomTokenObtainPairView
+from api.views.login_view import CurrentClaimsTokenRefreshView, CustomTokenObtainPairView
 
 # Swagger schema setup
 schema_view = get_schema_view(
@@ -55,7 +54,11 @@ urlpatterns = [
     path(
         "api/auth/login/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"
     ),
-    path("api/auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path(
+        "api/auth/refresh/",
+        CurrentClaimsTokenRefreshView.as_view(),
+        name="token_refresh",
+    ),
     # Swagger / ReDoc
     re_path(
         r"^swagger(?P<format>\.json|\.yaml)$",
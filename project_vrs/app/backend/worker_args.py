@@ -0,0 +1,11 @@
+# backend/worker_args.py
+"""
+Print the worker command-line options of a queue, from QUEUE_WORKER_OPTS in
+backend/celery.py: ``python -m backend.worker_args critical``.
+"""
+import sys
+
+from backend.celery import worker_args
+
+if __name__ == "__main__":
+    print(" ".join(worker_args(sys.argv[1])))
@@ -9,6 +9,7 @@ export class NotificationsSocketService {
     private reconnectDelay = 1000;
     private readonly maxDelay = 10000;
     private shouldReconnect = true;
+    private lastSeq = 0; // highest message seq seen; sent as ?since= on reconnect
 
     private _events$ = new Subject<LiveEvent>();
     get events$(): Observable<LiveEvent> { return this._events$.asObservable(); }
@@ -24,7 +25,8 @@ export class NotificationsSocketService {
 
         const proto = location.protocol === 'https:' ? 'wss' : 'ws';
         const host = this.resolveHost();
-        const url = `${proto}://${host}/ws/notifications/?token=${encodeURIComponent(access)}`;
+        const since = this.lastSeq ? `&since=${this.lastSeq}` : '';
+        const url = `${proto}://${host}/ws/notifications/?token=${encodeURIComponent(access)}${since}`;
 
         try { this.socket?.close(); } catch { }
         try { this.socket = new WebSocket(url); }
@@ -32,7 +34,12 @@ export class NotificationsSocketService {
 
         this.socket.onopen = () => { this.reconnectDelay = 1000; };
         this.socket.onmessage = (evt) => {
-            try { this._events$.next(JSON.parse(evt.data)); } catch { /* ignore */ }
+            try {
+                const data = JSON.parse(evt.data);
+                if (typeof data?.seq === 'number') this.lastSeq = Math.max(this.lastSeq, data.seq);
+                // replay frame: { action: 'replay', messages, complete }; listeners reload on any event
+                this._events$.next(data);
+            } catch { /* ignore */ }
         };
         this.socket.onerror = () => { /* let close handle it */ };
         this.socket.onclose = () => { if (this.shouldReconnect) this.scheduleReconnect(); };